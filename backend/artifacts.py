@@ -0,0 +1,191 @@
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "artifacts")
+ARTIFACT_MAX_AGE_HOURS = float(os.getenv("ARTIFACT_MAX_AGE_HOURS", str(24 * 7)))
+ARTIFACT_MAX_TOTAL_MB = float(os.getenv("ARTIFACT_MAX_TOTAL_MB", "2048"))
+ARTIFACT_CLEANUP_INTERVAL_SECONDS = float(os.getenv("ARTIFACT_CLEANUP_INTERVAL_SECONDS", "600"))
+
+_RUN_ID = re.compile(r'^[0-9a-f-]{32,36}$')
+_ARTIFACT_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path next to ``path`` and move it into place only if the block succeeds.
+
+    Readers never see a half-written file, and concurrent writers of the same
+    artifact each rename a complete file.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    root, ext = os.path.splitext(path)
+    # Keep the extension so writers that infer the format from it still work
+    tmp_path = f"{root}.{uuid.uuid4().hex}.tmp{ext}"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class ArtifactStore:
+    """Per-run output directories under ``root`` with bounded retention.
+
+    Every run writes into ``root/<run id>/``, so concurrent runs never share a
+    file. A background thread deletes run directories older than ``max_age``
+    seconds and then the oldest ones until the total stays under ``max_bytes``.
+    """
+    def __init__(self, root=ARTIFACTS_DIR, max_age=ARTIFACT_MAX_AGE_HOURS * 3600,
+                 max_bytes=ARTIFACT_MAX_TOTAL_MB * 1024 * 1024, cleanup_interval=ARTIFACT_CLEANUP_INTERVAL_SECONDS):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.cleanup_interval = cleanup_interval
+        self._thread = None
+        self._stopping = threading.Event()
+        self.removed = 0
+
+    def run_dir(self, run_id, create=True):
+        if not _RUN_ID.match(run_id or ''):
+            raise FileNotFoundError(f"Unknown run '{run_id}'.")
+        path = os.path.join(self.root, run_id)
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def path(self, run_id, name):
+        """Path of artifact ``name`` of run ``run_id``; raises FileNotFoundError if it does not exist."""
+        if not _ARTIFACT_NAME.match(name or '') or '.tmp' in name:
+            raise FileNotFoundError(f"Unknown artifact '{name}'.")
+        path = os.path.join(self.run_dir(run_id, create=False), name)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Artifact '{name}' not found for run '{run_id}'.")
+        return path
+
+    def list(self, run_id):
+        directory = self.run_dir(run_id, create=False)
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Unknown run '{run_id}'.")
+        return [
+            {'name': entry.name, 'size': entry.stat().st_size}
+            for entry in sorted(os.scandir(directory), key=lambda e: e.name)
+            if entry.is_file() and '.tmp' not in entry.name
+        ]
+
+    def _run_dirs(self):
+        if not os.path.isdir(self.root):
+            return []
+        runs = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or not _RUN_ID.match(entry.name):
+                continue
+            size, modified = 0, entry.stat().st_mtime
+            for dirpath, _, filenames in os.walk(entry.path):
+                for filename in filenames:
+                    try:
+                        stat = os.stat(os.path.join(dirpath, filename))
+                    except FileNotFoundError:
+                        continue
+                    size += stat.st_size
+                    modified = max(modified, stat.st_mtime)
+            runs.append((modified, size, entry.path))
+        return sorted(runs)
+
+    def cleanup(self, now=None):
+        """Remove expired run directories, then the oldest until under the size budget."""
+        now = time.time() if now is None else now
+        runs = self._run_dirs()
+        total = sum(size for _, size, _ in runs)
+        removed = []
+        for modified, size, path in runs:
+            if now - modified <= self.max_age and total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed.append(os.path.basename(path))
+        self.removed += len(removed)
+        return removed
+
+    def _run(self):
+        while not self._stopping.wait(self.cleanup_interval):
+            try:
+                self.cleanup()
+            except Exception as e:
+                print(f"Error cleaning up artifacts: {e}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="artifact-cleanup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+
+artifact_store = ArtifactStore()
+
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def artifact_response(request: Request, path: str, media_type: str, filename: str):
+    """Serve ``path`` with an ETag, conditional GET (304) and single byte-range (206) support."""
+    stat = os.stat(path)
+    etag = _etag(stat)
+    headers = {'ETag': etag, 'Accept-Ranges': 'bytes', 'Cache-Control': 'private, max-age=0, must-revalidate'}
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if not range_header or (if_range and if_range != etag):
+        return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+    match = _RANGE.match(range_header.strip())
+    size = stat.st_size
+    if not match or match.groups() == ('', ''):
+        raise HTTPException(status_code=416, detail="Invalid range", headers={'Content-Range': f"bytes */{size}"})
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={'Content-Range': f"bytes */{size}"})
+
+    def stream():
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    headers.update({
+        'Content-Range': f"bytes {start}-{end}/{size}",
+        'Content-Length': str(end - start + 1),
+        'Content-Disposition': f'attachment; filename="{filename}"',
+    })
+    return StreamingResponse(stream(), status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,161 @@
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from .database import SessionLocal
+from .models import Log
+from .stats import increment_counters
+
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+AUDIT_MAX_QUEUE = int(os.getenv("AUDIT_MAX_QUEUE", "10000"))
+
+
+class AuditLogWriter:
+    """Queue audit ``Log`` rows in memory and insert them in batches on a background thread.
+
+    A batch is written when ``batch_size`` records are waiting or
+    ``flush_interval`` seconds have passed, using a single multi-row INSERT and
+    one commit. Queuing never blocks, since callers run on the event loop:
+    when the queue is full the event is dropped and counted in ``dropped``.
+    """
+    def __init__(self, session_factory=SessionLocal, batch_size=AUDIT_BATCH_SIZE,
+                 flush_interval=AUDIT_FLUSH_INTERVAL_SECONDS, max_queue=AUDIT_MAX_QUEUE):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Rows the background thread has taken off the queue but not written yet
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10.0):
+        """Stop the background thread after writing everything still queued."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def enqueue(self, record):
+        """Queue one row of ``logs`` column values; returns False if it had to be dropped."""
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self):
+        """Write everything queued so far, including a batch the thread is still collecting."""
+        # Holding the write lock also waits out a batch the thread is writing right now
+        with self._write_lock:
+            batch = self._take_pending()
+            if batch:
+                self._write(batch)
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return
+                self._write(batch)
+
+    def _take_pending(self):
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        return batch
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping.is_set():
+                    break
+                # Dequeue under the lock so flush() never misses a record in transit
+                with self._pending_lock:
+                    try:
+                        self._pending.append(self._queue.get(timeout=min(remaining, 0.1)))
+                    except queue.Empty:
+                        continue
+            with self._write_lock:
+                batch = self._take_pending()
+                if batch:
+                    self._write(batch)
+
+    def _write(self, batch):
+        """Insert one batch; callers hold ``_write_lock``."""
+        db = self.session_factory()
+        try:
+            db.execute(insert(Log), batch)
+            # Core inserts skip the ORM flush hooks, so bump the counter here in the same transaction
+            increment_counters(db.connection(), {"total_logs": len(batch)})
+            db.commit()
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            print(f"Error writing audit log batch: {e}")
+        finally:
+            db.close()
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+        }
+
+
+audit_writer = AuditLogWriter()
+
+
+def log_action(user_id: int, action: str, details: dict = None, project_id: int = None, request=None):
+    """Record an audit event without touching the database on the request path."""
+    audit_writer.enqueue({
+        "user_id": user_id,
+        "project_id": project_id,
+        "action": action,
+        "details": details or {},
+        "ip_address": request.client.host if request else None,
+        "user_agent": request.headers.get("user-agent") if request else None,
+        # Stamp the event time now; the row is inserted later
+        "created_at": datetime.utcnow(),
+    })
@@ -1,20 +1,232 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .database import get_db
+from .database import get_async_db
 from .models import User
+import asyncio
 import os
+import threading
+import time
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded tokens and user records are cached per process; a TTL of 0 disables caching
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+# Embed user id and is_active/is_admin in tokens so authorization can skip the database
+AUTH_EMBED_USER_CLAIMS = os.getenv("AUTH_EMBED_USER_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+# bcrypt cost factor; raising it re-hashes stored passwords on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads doing bcrypt work, and how many more requests may wait before we shed load
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+
+class HashingPool:
+    """Bounded executor that keeps bcrypt work off the event loop.
+
+    At most ``workers`` hashes run at once and ``max_queue`` more may wait;
+    beyond that requests are rejected with 503 so a login storm cannot pile up
+    unbounded work.
+    """
+    def __init__(self, workers, max_queue):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    @property
+    def queue_depth(self):
+        return max(0, self.in_flight - self.workers)
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.busy_seconds += time.perf_counter() - start
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent authentication requests, please retry.",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._timed, fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "average_seconds": self.busy_seconds / self.completed if self.completed else None,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+        }
+
+
+hashing_pool = HashingPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ClaimRevocations:
+    """User id -> time of the last change to a user's embedded claims, for the tokens still alive.
+
+    The times are stored on ``User.claims_revoked_at``, so every worker sees
+    them and they survive a restart: each process reloads the revocations
+    younger than the token lifetime at most every ``refresh_seconds`` (older
+    ones cannot match a live token, so they drop out), and records the ones
+    it makes itself right away.
+    """
+    def __init__(self, refresh_seconds, lifetime_seconds):
+        self.refresh_seconds = refresh_seconds
+        self.lifetime_seconds = lifetime_seconds
+        self._revoked = {}
+        self._loaded_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def revoke(self, user_id, at=None):
+        with self._lock:
+            self._revoked[user_id] = max(self._revoked.get(user_id, float("-inf")), at or time.time())
+
+    def revoked_at(self, user_id):
+        with self._lock:
+            return self._revoked.get(user_id, float("-inf"))
+
+    async def refresh(self, db: AsyncSession):
+        if time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        # Claimed before the query so concurrent requests don't all reload
+        self._loaded_at = time.monotonic()
+        cutoff = time.time() - self.lifetime_seconds
+        result = await db.execute(
+            select(User.id, User.claims_revoked_at).where(
+                User.claims_revoked_at > datetime.utcfromtimestamp(cutoff)
+            )
+        )
+        loaded = {user_id: _timestamp(revoked) for user_id, revoked in result.all()}
+        with self._lock:
+            # Keep local revocations the database has not returned yet (e.g. still committing)
+            for user_id, revoked in self._revoked.items():
+                if revoked > cutoff and revoked > loaded.get(user_id, float("-inf")):
+                    loaded[user_id] = revoked
+            self._revoked = loaded
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+def _timestamp(value: datetime) -> float:
+    """Epoch seconds of a naive UTC datetime, as ``iat`` is encoded."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+token_cache = TTLCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES)  # token -> claims
+user_cache = TTLCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES)  # username -> column values
+claim_revocations = ClaimRevocations(AUTH_CACHE_TTL_SECONDS, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+_CACHED_USER_FIELDS = [column.name for column in User.__table__.columns if column.name != "hashed_password"]
+_CLAIM_FIELDS = ("is_active", "is_admin", "username")
+
+
+def invalidate_user(username: str):
+    """Drop the cached record for ``username``."""
+    user_cache.pop(username)
+
+
+@event.listens_for(User, "before_update")
+def _revoke_changed_claims(mapper, connection, target):
+    # Set before the UPDATE so the revocation is written in the same statement
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _CLAIM_FIELDS):
+        target.claims_revoked_at = datetime.utcnow()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_updated_user(mapper, connection, target):
+    state = inspect(target)
+    if target.claims_revoked_at is not None:
+        claim_revocations.revoke(target.id, _timestamp(target.claims_revoked_at))
+    if state.deleted or state.was_deleted:
+        claim_revocations.revoke(target.id)
+    username_history = state.attrs.username.history
+    for username in set(username_history.deleted or []) | {target.username}:
+        invalidate_user(username)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -25,6 +237,22 @@ def get_password_hash(password):
 def get_user_by_username(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
 
+async def get_user_by_username_async(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+async def get_cached_user(db: AsyncSession, username: str):
+    """Return a detached copy of the user, served from the user cache when possible."""
+    fields = user_cache.get(username)
+    if fields is None:
+        user = await get_user_by_username_async(db, username)
+        if user is None:
+            return None
+        fields = {name: getattr(user, name) for name in _CACHED_USER_FIELDS}
+        user_cache.set(username, fields)
+    # A fresh transient instance per request, so no session ever owns the cached values
+    return User(**fields)
+
 def authenticate_user(db: Session, username: str, password: str):
     user = get_user_by_username(db, username)
     if not user:
@@ -33,33 +261,94 @@ def authenticate_user(db: Session, username: str, password: str):
         return False
     return user
 
+async def get_password_hash_async(password):
+    return await hashing_pool.run(get_password_hash, password)
+
+async def authenticate_user_async(db: AsyncSession, username: str, password: str):
+    """Like authenticate_user, but bcrypt runs on the hashing pool instead of the event loop.
+
+    The returned user is detached; ``db.add`` it again to persist changes.
+    """
+    user = await get_user_by_username_async(db, username)
+    if not user:
+        return False
+    # Detach first so the loaded attributes survive ending the transaction, then
+    # release the pooled connection while bcrypt runs
+    db.expunge(user)
+    await db.rollback()
+    valid, new_hash = await hashing_pool.run(pwd_context.verify_and_update, password, user.hashed_password)
+    if not valid:
+        return False
+    if new_hash:
+        # Cost factor changed since this hash was made; the caller's commit stores the upgrade
+        user.hashed_password = new_hash
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def token_claims_for(user: User) -> dict:
+    """Claims to put in a user's access token."""
+    claims = {"sub": user.username}
+    if AUTH_EMBED_USER_CLAIMS:
+        claims.update({"uid": user.id, "act": bool(user.is_active), "adm": bool(user.is_admin)})
+    return claims
+
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str) -> dict:
+    """Decode and verify a JWT, caching the claims until the token expires."""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        raise credentials_exception
-    
-    user = get_user_by_username(db, username=username)
+        raise credentials_exception()
+    if claims.get("sub") is None:
+        raise credentials_exception()
+    token_cache.set(token, claims, ttl=claims["exp"] - time.time())
+    return claims
+
+async def _trusted_claims(claims: dict, db: AsyncSession) -> bool:
+    if not AUTH_EMBED_USER_CLAIMS or "uid" not in claims:
+        return False
+    await claim_revocations.refresh(db)
+    return claims.get("iat", 0) > claim_revocations.revoked_at(claims["uid"])
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Full user record for the token (email, timestamps, ...)."""
+    claims = decode_token(token)
+    user = await get_cached_user(db, username=claims["sub"])
+    if user is None:
+        raise credentials_exception()
+    return user
+
+async def get_current_principal(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Identity for authorization only: id, username, is_active and is_admin.
+
+    Built straight from embedded token claims when they are enabled and not
+    revoked, so only the periodic reload of the revocations reaches the
+    database; otherwise the full record.
+    """
+    claims = decode_token(token)
+    if await _trusted_claims(claims, db):
+        return User(id=claims["uid"], username=claims["sub"], is_active=claims["act"], is_admin=claims["adm"])
+    user = await get_cached_user(db, username=claims["sub"])
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
@@ -67,7 +356,18 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-async def get_admin_user(current_user: User = Depends(get_current_active_user)):
+async def get_active_principal(current_user: User = Depends(get_current_principal)):
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+async def get_optional_principal(token: Optional[str] = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Like get_active_principal, but None for anonymous requests."""
+    if token is None:
+        return None
+    return await get_active_principal(await get_current_principal(token, db))
+
+async def get_admin_user(current_user: User = Depends(get_active_principal)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return current_user
@@ -1,13 +1,57 @@
+import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import re
-from sklearn.base import BaseEstimator, TransformerMixin
+import tempfile
+import inspect
 from datetime import datetime
+from .profiler import DataProfile
+from .artifacts import atomic_path
+from .progress import checkpoint, report_chunk
+from .spill import PartitionSpill
+from .similarity import (char_matrix, connected_components, levenshtein_similarity, lsh_candidate_pairs,
+                         minhash_signatures, normalize_strings)
 import warnings
 warnings.filterwarnings('ignore')
 
 
-class ImportDataTransformer(BaseEstimator, TransformerMixin):
+class BaseTransformer:
+    """Base of every pipeline step: ``fit`` learns nothing, ``transform`` does the work.
+
+    Parameters are the ``__init__`` arguments, stored under the same names,
+    so ``get_params``/``set_params`` (and ``Pipeline.set_params``) can read
+    and change them.
+    """
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).transform(X)
+
+    @classmethod
+    def _param_names(cls):
+        parameters = inspect.signature(cls.__init__).parameters.values()
+        return [p.name for p in parameters if p.name != 'self' and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)]
+
+    def get_params(self, deep=True):
+        return {name: getattr(self, name, None) for name in self._param_names()}
+
+    def set_params(self, **params):
+        valid = self._param_names()
+        for name, value in params.items():
+            if name not in valid:
+                raise ValueError(f"Invalid parameter '{name}' for {type(self).__name__}; use one of {valid}")
+            setattr(self, name, value)
+        return self
+
+
+class ImportDataTransformer(BaseTransformer):
     """Import data from CSV, Excel, or Parquet files."""
     def __init__(self, file_path=None):
         self.file_path = file_path
@@ -36,7 +80,15 @@ class ImportDataTransformer(BaseEstimator, TransformerMixin):
         return data
 
 
-class ColumnNameCleaner(BaseEstimator, TransformerMixin):
+def clean_column_name(col):
+    """Column name as ColumnNameCleaner writes it: lower case, special characters as single underscores."""
+    # Remove special characters, replace spaces with underscores, convert to lowercase
+    cleaned = re.sub(r'[^a-zA-Z0-9_]', '_', str(col))
+    cleaned = re.sub(r'_+', '_', cleaned)  # Replace multiple underscores with single
+    return cleaned.strip('_').lower()
+
+
+class ColumnNameCleaner(BaseTransformer):
     """Clean column names by removing special characters and standardizing format."""
     def __init__(self):
         self.errors = pd.DataFrame()
@@ -46,14 +98,7 @@ class ColumnNameCleaner(BaseEstimator, TransformerMixin):
 
     def transform(self, X):
         original_columns = X.columns.tolist()
-        cleaned_columns = []
-        
-        for col in original_columns:
-            # Remove special characters, replace spaces with underscores, convert to lowercase
-            cleaned = re.sub(r'[^a-zA-Z0-9_]', '_', str(col))
-            cleaned = re.sub(r'_+', '_', cleaned)  # Replace multiple underscores with single
-            cleaned = cleaned.strip('_').lower()
-            cleaned_columns.append(cleaned)
+        cleaned_columns = [clean_column_name(col) for col in original_columns]
         
         X.columns = cleaned_columns
         
@@ -69,7 +114,7 @@ class ColumnNameCleaner(BaseEstimator, TransformerMixin):
         return X
 
 
-class MandatoryColumnsChecker(BaseEstimator, TransformerMixin):
+class MandatoryColumnsChecker(BaseTransformer):
     """Check for missing mandatory columns."""
     def __init__(self, mandatory_columns=None):
         self.mandatory_columns = mandatory_columns if mandatory_columns else []
@@ -88,7 +133,7 @@ class MandatoryColumnsChecker(BaseEstimator, TransformerMixin):
         return X
 
 
-class WhitespaceCaseCleaner(BaseEstimator, TransformerMixin):
+class WhitespaceCaseCleaner(BaseTransformer):
     """Clean whitespace and standardize case in text columns."""
     def __init__(self, columns=None, case='upper'):
         self.columns = columns if columns else []
@@ -129,7 +174,7 @@ class WhitespaceCaseCleaner(BaseEstimator, TransformerMixin):
         return X
 
 
-class RemoveUnwantedCharacters(BaseEstimator, TransformerMixin):
+class RemoveUnwantedCharacters(BaseTransformer):
     """Remove unwanted characters from specified columns."""
     def __init__(self, columns=None, unwanted_chars=None):
         self.columns = columns if columns else []
@@ -165,7 +210,60 @@ class RemoveUnwantedCharacters(BaseEstimator, TransformerMixin):
         return X
 
 
-class NumericConverter(BaseEstimator, TransformerMixin):
+class TextCleaner(BaseTransformer):
+    """WhitespaceCaseCleaner followed by RemoveUnwantedCharacters in one pass over each column.
+
+    Each column is converted to strings once instead of once per step. The
+    findings are the same as running both steps, kept apart in
+    ``errors_by_step`` under ``step_names`` so reports still show two checks.
+    """
+    def __init__(self, columns=None, case='upper', unwanted_chars=None,
+                 step_names=('whitespace_case_cleaner', 'remove_unwanted_chars')):
+        self.columns = columns if columns else []
+        self.case = case
+        self.unwanted_chars = unwanted_chars if unwanted_chars else ['\n', '\r', '\t']
+        self.step_names = step_names
+        self.errors = pd.DataFrame()
+        self.errors_by_step = {}
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        case_issues = []
+        char_issues = []
+        for col in self.columns:
+            if col in X.columns:
+                original_values = X[col].astype(str)
+                cased_values = original_values.str.strip()
+                if self.case == 'upper':
+                    cased_values = cased_values.str.upper()
+                elif self.case == 'lower':
+                    cased_values = cased_values.str.lower()
+                elif self.case == 'title':
+                    cased_values = cased_values.str.title()
+                cleaned_values = cased_values
+                for char in self.unwanted_chars:
+                    cleaned_values = cleaned_values.str.replace(char, '', regex=False)
+
+                changes = (original_values != cased_values).sum()
+                if changes > 0:
+                    case_issues.append({'Column': col, 'Changes_Made': changes, 'Check': 'WhitespaceCaseCleaner'})
+                removed = (cased_values != cleaned_values).sum()
+                if removed > 0:
+                    char_issues.append({'Column': col, 'Characters_Removed': removed, 'Check': 'RemoveUnwantedCharacters'})
+
+                X[col] = cleaned_values
+
+        self.errors_by_step = {
+            name: pd.DataFrame(issues) for name, issues in zip(self.step_names, (case_issues, char_issues)) if issues
+        }
+        if self.errors_by_step:
+            self.errors = pd.concat(self.errors_by_step.values(), ignore_index=True)
+        return X
+
+
+class NumericConverter(BaseTransformer):
     """Convert specified columns to numeric, logging conversion failures."""
     def __init__(self, columns=None):
         self.columns = columns if columns else []
@@ -196,7 +294,7 @@ class NumericConverter(BaseEstimator, TransformerMixin):
         return X
 
 
-class DateConverter(BaseEstimator, TransformerMixin):
+class DateConverter(BaseTransformer):
     """Convert specified columns to datetime, logging conversion errors."""
     def __init__(self, columns=None, date_format=None):
         self.columns = columns if columns else []
@@ -231,22 +329,49 @@ class DateConverter(BaseEstimator, TransformerMixin):
         return X
 
 
-class MissingValuesDetector(BaseEstimator, TransformerMixin):
+class ColumnProfiler(BaseTransformer):
+    """Profile columns once so later checks can read their statistics instead of rescanning."""
+    def __init__(self, profile=None, columns=None, chunk_size=500_000, include_numeric=True):
+        self.profile = profile if profile is not None else DataProfile(chunk_size=chunk_size)
+        self.columns = columns if columns else []
+        self.chunk_size = chunk_size
+        self.include_numeric = include_numeric
+        self.errors = pd.DataFrame()
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        columns = list(self.columns)
+        if self.include_numeric:
+            # A ConstantValueDetector without columns looks at every numeric column
+            columns += [col for col in X.columns if pd.api.types.is_numeric_dtype(X[col])]
+        self.profile.chunk_size = self.chunk_size
+        self.profile.fit(X, columns=columns)
+        return X
+
+
+class MissingValuesDetector(BaseTransformer):
     """Detect and flag rows with missing values."""
-    def __init__(self, columns=None):
+    def __init__(self, columns=None, profile=None):
         self.columns = columns if columns else []
+        self.profile = profile
         self.errors = pd.DataFrame()
 
     def fit(self, X, y=None):
         return self
 
     def transform(self, X):
-        if not self.columns:
-            # Check all columns
-            missing_mask = X.isnull().any(axis=1)
-        else:
-            # Check only specified columns
-            missing_mask = X[self.columns].isnull().any(axis=1)
+        columns = self.columns if self.columns else X.columns.tolist()
+        if self.profile is not None:
+            # Only build the row mask over columns the profile saw nulls in
+            columns = [
+                col for col in columns
+                if self.profile.get(col, X) is None or self.profile.get(col, X).null_count > 0
+            ]
+            if not columns:
+                return X
+        missing_mask = X[columns].isnull().any(axis=1)
         
         if missing_mask.any():
             missing_rows = X[missing_mask].copy()
@@ -257,10 +382,11 @@ class MissingValuesDetector(BaseEstimator, TransformerMixin):
         return X
 
 
-class IDValidator(BaseEstimator, TransformerMixin):
+class IDValidator(BaseTransformer):
     """Validate ID columns for missing or invalid values."""
-    def __init__(self, id_column=None):
+    def __init__(self, id_column=None, profile=None):
         self.id_column = id_column
+        self.profile = profile
         self.errors = pd.DataFrame()
 
     def fit(self, X, y=None):
@@ -272,9 +398,13 @@ class IDValidator(BaseEstimator, TransformerMixin):
         
         issues = []
         id_series = X[self.id_column]
+        col_profile = self.profile.get(self.id_column, X) if self.profile is not None else None
         
         # Check for missing IDs
-        missing_ids = id_series.isnull().sum()
+        if col_profile is not None:
+            missing_ids = col_profile.null_count
+        else:
+            missing_ids = id_series.isnull().sum()
         if missing_ids > 0:
             issues.append({
                 'Column': self.id_column,
@@ -283,7 +413,10 @@ class IDValidator(BaseEstimator, TransformerMixin):
             })
         
         # Check for empty string IDs
-        empty_ids = (id_series.astype(str).str.strip() == '').sum()
+        if col_profile is not None:
+            empty_ids = col_profile.empty_count
+        else:
+            empty_ids = (id_series.astype(str).str.strip() == '').sum()
         if empty_ids > 0:
             issues.append({
                 'Column': self.id_column,
@@ -296,10 +429,11 @@ class IDValidator(BaseEstimator, TransformerMixin):
         return X
 
 
-class NegativeZeroChecker(BaseEstimator, TransformerMixin):
+class NegativeZeroChecker(BaseTransformer):
     """Check for negative or zero values in numeric columns."""
-    def __init__(self, columns=None):
+    def __init__(self, columns=None, profile=None):
         self.columns = columns if columns else []
+        self.profile = profile
         self.errors = pd.DataFrame()
 
     def fit(self, X, y=None):
@@ -309,10 +443,15 @@ class NegativeZeroChecker(BaseEstimator, TransformerMixin):
         issues = []
         for col in self.columns:
             if col in X.columns and pd.api.types.is_numeric_dtype(X[col]):
-                # Check for negative values
-                negative_count = (X[col] < 0).sum()
-                # Check for zero values
-                zero_count = (X[col] == 0).sum()
+                col_profile = self.profile.get(col, X) if self.profile is not None else None
+                if col_profile is not None:
+                    negative_count = col_profile.negative_count
+                    zero_count = col_profile.zero_count
+                else:
+                    # Check for negative values
+                    negative_count = (X[col] < 0).sum()
+                    # Check for zero values
+                    zero_count = (X[col] == 0).sum()
                 
                 if negative_count > 0 or zero_count > 0:
                     issues.append({
@@ -327,7 +466,7 @@ class NegativeZeroChecker(BaseEstimator, TransformerMixin):
         return X
 
 
-class DuplicatesFromtheData(BaseEstimator, TransformerMixin):
+class DuplicatesFromtheData(BaseTransformer):
     """Detect fully duplicated rows."""
     def __init__(self):
         self.errors = pd.DataFrame()
@@ -346,7 +485,7 @@ class DuplicatesFromtheData(BaseEstimator, TransformerMixin):
         return X
 
 
-class DuplicateIdentifier(BaseEstimator, TransformerMixin):
+class DuplicateIdentifier(BaseTransformer):
     """Detect duplicate rows based on key columns."""
     def __init__(self, columns=None):
         self.columns = columns if columns else []
@@ -367,16 +506,114 @@ class DuplicateIdentifier(BaseEstimator, TransformerMixin):
             duplicated_rows['Check'] = 'DuplicateIdentifier'
             duplicated_rows['Key_Columns'] = str(self.columns)
             self.errors = duplicated_rows
-        
+
+        return X
+
+
+class FuzzyDuplicateDetector(BaseTransformer):
+    """Find clusters of near-duplicate values (typo'd names, IDs differing in punctuation).
+
+    Values of ``columns`` are normalized (case, accents, punctuation), so
+    ``EUCEBIA__DUBE_3`` and ``EUCEBIA_DUBE_3`` already match. The distinct
+    normalized values are then MinHashed over character 3-grams and only
+    pairs sharing an LSH band and the same blocking key are compared with a
+    vectorized Levenshtein kernel. The blocking key is the values of
+    ``block_columns`` and, with ``match_digits``, the digits of the value, so
+    ``DUBE_3`` and ``DUBE_4`` stay apart. Pairs at or above ``threshold``
+    similarity are merged into clusters, and every row of a cluster holding
+    more than one distinct value is reported.
+    """
+    def __init__(self, columns=None, threshold=0.85, block_columns=None, match_digits=True, num_perm=64,
+                 bands=16, window=20, max_length=48):
+        self.columns = columns if columns else []
+        self.threshold = threshold
+        self.block_columns = block_columns if block_columns else []
+        self.match_digits = match_digits
+        self.num_perm = num_perm
+        self.bands = bands
+        self.window = window
+        self.max_length = max_length
+        self.errors = pd.DataFrame()
+        self.stats = {}
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        columns = [col for col in self.columns if col in X.columns]
+        if not columns or len(X) == 0:
+            return X
+
+        values = X[columns].astype('string').fillna('')
+        raw = values[columns[0]] if len(columns) == 1 else values.agg(' '.join, axis=1)
+        normalized = normalize_strings(raw.to_numpy(dtype=object))
+        present = (normalized != '').to_numpy()
+        block_columns = [col for col in self.block_columns if col in X.columns]
+        block_keys = [X[col].reset_index(drop=True) for col in block_columns]
+        if self.match_digits:
+            block_keys.append(normalized.str.replace(r'\D+', '', regex=True))
+        blocks = np.zeros(len(X), dtype='int64')
+        for key in block_keys:
+            key_codes, key_values = pd.factorize(key, use_na_sentinel=False)
+            blocks = pd.factorize(blocks * len(key_values) + key_codes)[0]
+
+        # One node per distinct (block, normalized value); rows without a value get none
+        value_codes, uniques = pd.factorize(normalized.where(present, None))
+        node_of_row = np.full(len(X), -1, dtype='int64')
+        node_of_row[present] = pd.factorize(blocks[present] * len(uniques) + value_codes[present])[0]
+        n_nodes = int(node_of_row.max()) + 1
+        first_rows = np.empty(n_nodes, dtype='int64')
+        first_rows[node_of_row[present][::-1]] = np.flatnonzero(present)[::-1]
+        node_values = uniques.to_numpy(dtype=object)[value_codes[first_rows]]
+        node_blocks = blocks[first_rows]
+
+        matrix, lengths = char_matrix(node_values, self.max_length)
+        signatures = minhash_signatures(matrix, lengths, self.num_perm)
+        left, right = lsh_candidate_pairs(signatures, self.bands, node_blocks, self.window)
+        # Pairs whose lengths alone rule out the threshold skip the kernel
+        longer = np.maximum(np.maximum(lengths[left], lengths[right]), 1)
+        feasible = np.abs(lengths[left] - lengths[right]) <= (1 - self.threshold) * longer
+        left, right = left[feasible], right[feasible]
+        similar = levenshtein_similarity(matrix, lengths, left, right) >= self.threshold
+        clusters = connected_components(n_nodes, left[similar], right[similar])
+        self.stats = {'distinct_values': n_nodes, 'candidate_pairs': int(len(left)),
+                      'similar_pairs': int(similar.sum())}
+
+        row_clusters = pd.Series(np.where(node_of_row >= 0, clusters[np.maximum(node_of_row, 0)], -1))
+        distinct_raw = raw.reset_index(drop=True).groupby(row_clusters).nunique()
+        fuzzy = distinct_raw.index[(distinct_raw > 1) & (distinct_raw.index >= 0)]
+        mask = row_clusters.isin(fuzzy).to_numpy()
+        if not mask.any():
+            return X
+
+        rows = pd.DataFrame({
+            'Row_Index': X.index[mask],
+            'Value': raw.to_numpy()[mask],
+            'Cluster': row_clusters[mask].to_numpy(),
+        })
+        if len(columns) == 1:
+            rows['Column'] = columns[0]
+        cluster_rows = rows.groupby('Cluster', sort=False)
+        rows['Cluster_Size'] = cluster_rows['Value'].transform('size')
+        # The most frequent value of each cluster
+        counts = rows.groupby(['Cluster', 'Value'], sort=False).size().sort_values(ascending=False, kind='stable')
+        representative = counts.reset_index().drop_duplicates('Cluster').set_index('Cluster')['Value']
+        rows['Representative'] = representative.reindex(rows['Cluster']).to_numpy()
+        # Identify clusters by their first row, which stays meaningful outside this run
+        rows['Cluster'] = cluster_rows['Row_Index'].transform('min')
+        rows['Key_Columns'] = str(columns)
+        rows['Check'] = 'FuzzyDuplicateDetector'
+        self.errors = rows
         return X
 
 
-class YearFilter(BaseEstimator, TransformerMixin):
+class YearFilter(BaseTransformer):
     """Filter rows based on year range in date columns."""
-    def __init__(self, date_column=None, start_year=None, end_year=None):
+    def __init__(self, date_column=None, start_year=None, end_year=None, profile=None):
         self.date_column = date_column
         self.start_year = start_year
         self.end_year = end_year
+        self.profile = profile
         self.errors = pd.DataFrame()
 
     def fit(self, X, y=None):
@@ -390,10 +627,15 @@ class YearFilter(BaseEstimator, TransformerMixin):
             return X
         
         issues = []
-        years = X[self.date_column].dt.year
+        # The profile keeps a year histogram, which answers both bounds without a rescan
+        col_profile = self.profile.get(self.date_column, X) if self.profile is not None else None
+        years = X[self.date_column].dt.year if col_profile is None else None
         
         if self.start_year is not None:
-            before_start = (years < self.start_year).sum()
+            if col_profile is not None:
+                before_start = col_profile.count_years(lambda year: year < self.start_year)
+            else:
+                before_start = (years < self.start_year).sum()
             if before_start > 0:
                 issues.append({
                     'Column': self.date_column,
@@ -403,7 +645,10 @@ class YearFilter(BaseEstimator, TransformerMixin):
                 })
         
         if self.end_year is not None:
-            after_end = (years > self.end_year).sum()
+            if col_profile is not None:
+                after_end = col_profile.count_years(lambda year: year > self.end_year)
+            else:
+                after_end = (years > self.end_year).sum()
             if after_end > 0:
                 issues.append({
                     'Column': self.date_column,
@@ -417,7 +662,7 @@ class YearFilter(BaseEstimator, TransformerMixin):
         return X
 
 
-class StartEndYearComparator(BaseEstimator, TransformerMixin):
+class StartEndYearComparator(BaseTransformer):
     """Compare start and end year columns for logical consistency."""
     def __init__(self, start_year_column=None, end_year_column=None):
         self.start_year_column = start_year_column
@@ -446,10 +691,159 @@ class StartEndYearComparator(BaseEstimator, TransformerMixin):
         return X
 
 
-class ConstantValueDetector(BaseEstimator, TransformerMixin):
-    """Detect columns dominated by a single value."""
-    def __init__(self, threshold=0.95):
+class CoveragePeriodChecker(BaseTransformer):
+    """Detect overlapping, gapped and duplicate coverage periods per key.
+
+    Periods are sorted once by key, start and end, then swept in a single
+    vectorized pass: each period is compared with the latest end seen so far
+    for its key. Ends are inclusive, so a period ending on the 31st followed
+    by one starting on the 1st is contiguous, and of two identical periods the
+    later row is the duplicate. Dates with a time of day are compared at that
+    resolution instead: a period ending at 11:00 and the next starting at
+    12:00 leave a one-hour gap, and ``Days`` is then fractional. Periods with
+    a missing key or date, or ending before they start, are skipped (see
+    StartEndYearComparator).
+    Above ``spill_rows`` periods, they are hash-partitioned on the key to disk
+    and each partition is sorted and swept on its own.
+    """
+    def __init__(self, key_column=None, start_column=None, end_column=None, max_gap_days=0,
+                 dayfirst=False, spill_rows=5_000_000, spill_dir=None):
+        self.key_column = key_column
+        self.start_column = start_column
+        self.end_column = end_column
+        self.max_gap_days = max_gap_days
+        self.dayfirst = dayfirst
+        self.spill_rows = spill_rows
+        self.spill_dir = spill_dir
+        self.errors = pd.DataFrame()
+
+    def fit(self, X, y=None):
+        return self
+
+    def _dates(self, series):
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series, dayfirst=self.dayfirst, errors='coerce')
+        return series.to_numpy('datetime64[ns]')
+
+    @staticmethod
+    def _unit(start, end):
+        """One day when every date is at midnight (ends are then inclusive days), else one nanosecond."""
+        whole_days = not ((start - start.astype('datetime64[D]')).any() or (end - end.astype('datetime64[D]')).any())
+        return np.timedelta64(1, 'D') if whole_days else np.timedelta64(1, 'ns')
+
+    @staticmethod
+    def _sort_order(codes, start, end, unit):
+        """Stable order by key code, start and end; packed into one int64 key when the spans allow."""
+        starts = (start - start.min()) // unit
+        lengths = (end - start) // unit
+        start_span = int(starts.max()) + 1
+        length_span = int(lengths.max()) + 1
+        if (int(codes.max()) + 1) * start_span * length_span >= np.iinfo('int64').max:
+            return np.lexsort((end, start, codes))
+        return np.argsort((codes * start_span + starts) * length_span + lengths, kind='stable')
+
+    def _sweep(self, periods, unit):
+        """Overlaps, gaps and duplicates among ``periods`` (key code, start, end, row), in ``unit`` steps."""
+        if len(periods) < 2:
+            return []
+        codes = periods['key'].to_numpy()
+        start = periods['start'].to_numpy('datetime64[ns]')
+        end = periods['end'].to_numpy('datetime64[ns]')
+        order = self._sort_order(codes, start, end, unit)
+        codes, start, end = codes[order], start[order], end[order]
+        row = periods['row'].to_numpy()[order]
+
+        # Latest end, and the row holding it, over the preceding periods of the same key
+        group = pd.Series(codes)
+        running_end = pd.Series(end).groupby(group, sort=False).cummax().to_numpy()
+        holder = pd.Series(np.where(end == running_end, row, -1))
+        holder = holder.where(holder >= 0).groupby(group, sort=False).ffill().to_numpy()
+        same_key = np.zeros(len(codes), dtype=bool)
+        same_key[1:] = codes[1:] == codes[:-1]
+        previous_end = np.roll(running_end, 1)
+        previous_row = np.roll(holder, 1)
+
+        duplicate = same_key & (start == np.roll(start, 1)) & (end == np.roll(end, 1))
+        # Whole days cover their end day, so a period runs up to (not including) end + unit
+        stop = end + unit if unit == np.timedelta64(1, 'D') else end
+        previous_stop = previous_end + (stop - end)
+        day = np.timedelta64(1, 'D')
+        # A period inside an earlier one overlaps only for its own length
+        overlap_days = (np.minimum(stop, previous_stop) - start) / day
+        gap_days = (start - previous_stop) / day
+        overlap = same_key & ~duplicate & (overlap_days > 0)
+        gap = same_key & (gap_days > self.max_gap_days)
+        if unit == day:
+            overlap_days, gap_days = overlap_days.astype('int64'), gap_days.astype('int64')
+
+        found = []
+        # Days: overlapping days for overlaps, missing days for gaps
+        for issue, mask, span in (('DuplicatePeriod', duplicate, 0), ('Overlap', overlap, overlap_days), ('Gap', gap, gap_days)):
+            if not mask.any():
+                continue
+            found.append(pd.DataFrame({
+                'Row_Index': row[mask],
+                'Issue': issue,
+                'Key': codes[mask],
+                'Period_Start': start[mask],
+                'Period_End': end[mask],
+                'Previous_Row_Index': previous_row[mask].astype('int64'),
+                'Previous_End': previous_end[mask],
+                'Days': span[mask] if issue != 'DuplicatePeriod' else 0,
+            }))
+        return found
+
+    def _spilled_sweep(self, periods, unit):
+        partitions = -(-len(periods) // self.spill_rows)
+        directory = tempfile.mkdtemp(prefix='coverage-', dir=self.spill_dir)
+        found = []
+        with PartitionSpill('key', partitions, directory) as spill:
+            for start in range(0, len(periods), self.spill_rows):
+                spill.write(periods.iloc[start:start + self.spill_rows])
+                report_chunk(min(start + self.spill_rows, len(periods)), len(periods))
+            spill.close()
+            for partition in range(partitions):
+                checkpoint()
+                found.extend(self._sweep(spill.read(partition), unit))
+        return found
+
+    def transform(self, X):
+        columns = (self.key_column, self.start_column, self.end_column)
+        if not all(columns) or any(col not in X.columns for col in columns):
+            return X
+
+        codes, keys = pd.factorize(X[self.key_column])
+        periods = pd.DataFrame({
+            'key': codes.astype('int64'),
+            'start': self._dates(X[self.start_column]),
+            'end': self._dates(X[self.end_column]),
+            'row': X.index.to_numpy(),
+        })
+        periods = periods[(periods['key'] >= 0) & (periods['start'] <= periods['end'])]
+        checkpoint()
+        if len(periods) == 0:
+            return X
+
+        # One resolution for every partition, so spilled and in-memory sweeps agree
+        unit = self._unit(periods['start'].to_numpy('datetime64[ns]'), periods['end'].to_numpy('datetime64[ns]'))
+        if self.spill_rows and len(periods) > self.spill_rows:
+            found = self._spilled_sweep(periods, unit)
+        else:
+            found = self._sweep(periods, unit)
+        if found:
+            errors = pd.concat(found, ignore_index=True).sort_values('Row_Index', kind='stable', ignore_index=True)
+            errors['Key'] = keys.take(errors['Key'].to_numpy())
+            errors['Check'] = 'CoveragePeriodChecker'
+            self.errors = errors
+        return X
+
+
+class ConstantValueDetector(BaseTransformer):
+    """Detect numeric columns dominated by a single value (every numeric column when ``columns`` is None)."""
+    def __init__(self, threshold=0.95, profile=None, columns=None):
         self.threshold = threshold
+        self.profile = profile
+        self.columns = columns
         self.errors = pd.DataFrame()
 
     def fit(self, X, y=None):
@@ -457,8 +851,22 @@ class ConstantValueDetector(BaseEstimator, TransformerMixin):
 
     def transform(self, X):
         issues = []
-        for col in X.columns:
+        columns = X.columns if self.columns is None else [col for col in self.columns if col in X.columns]
+        for col in columns:
             if pd.api.types.is_numeric_dtype(X[col]):
+                col_profile = self.profile.get(col, X) if self.profile is not None else None
+                if col_profile is not None:
+                    most_common = col_profile.most_common
+                    if most_common is not None:
+                        most_common_freq = most_common[1] / col_profile.row_count
+                        if most_common_freq >= self.threshold:
+                            issues.append({
+                                'Column': col,
+                                'Most_Common_Value': most_common[0],
+                                'Frequency': most_common_freq,
+                                'Check': 'ConstantValueDetector'
+                            })
+                    continue
                 value_counts = X[col].value_counts()
                 if len(value_counts) > 0:
                     most_common_freq = value_counts.iloc[0] / len(X[col])
@@ -475,37 +883,69 @@ class ConstantValueDetector(BaseEstimator, TransformerMixin):
         return X
 
 
-class OutlierDetector(BaseEstimator, TransformerMixin):
-    """Detect statistical outliers using IQR or Z-score method."""
-    def __init__(self, columns=None, method='iqr', threshold=1.5):
+class OutlierDetector(BaseTransformer):
+    """Detect statistical outliers using IQR, Z-score or median/MAD method.
+
+    Where the MAD is 0 the ``mad`` method falls back to the scaled mean
+    absolute deviation from the median (see ``robust_spread``).
+
+    Without ``group_by`` the bounds are global and outliers are counted per
+    column. With ``group_by`` columns the bounds are computed per segment in
+    one groupby pass per column and broadcast back to the rows, and each
+    outlier row is reported with its segment and bounds. Segments with fewer
+    than ``min_group_size`` values are not judged.
+    """
+    # Scale the MAD, and the mean absolute deviation, to the standard deviation for normally distributed data
+    MAD_SCALE = 1.4826
+    MEAN_AD_SCALE = 1.2533
+
+    def __init__(self, columns=None, method='iqr', threshold=1.5, profile=None, group_by=None, min_group_size=10):
         self.columns = columns if columns else []
         self.method = method
         self.threshold = threshold
+        self.profile = profile
+        self.group_by = group_by if group_by else []
+        self.min_group_size = min_group_size
         self.errors = pd.DataFrame()
 
     def fit(self, X, y=None):
         return self
 
     def transform(self, X):
+        group_by = [col for col in self.group_by if col in X.columns]
+        if group_by:
+            return self._transform_grouped(X, group_by)
+
         issues = []
         for col in self.columns:
+            checkpoint()
             if col in X.columns and pd.api.types.is_numeric_dtype(X[col]):
-                data = X[col].dropna()
-                if len(data) == 0:
-                    continue
-                
-                outliers = 0
-                if self.method == 'iqr':
-                    Q1 = data.quantile(0.25)
-                    Q3 = data.quantile(0.75)
-                    IQR = Q3 - Q1
-                    lower_bound = Q1 - self.threshold * IQR
-                    upper_bound = Q3 + self.threshold * IQR
-                    outliers = ((data < lower_bound) | (data > upper_bound)).sum()
-                
-                elif self.method == 'zscore':
-                    z_scores = np.abs((data - data.mean()) / data.std())
-                    outliers = (z_scores > self.threshold).sum()
+                col_profile = self.profile.get(col, X) if self.profile is not None else None
+                if col_profile is not None:
+                    outliers = self._count_outliers_from_profile(X[col], col_profile)
+                    if outliers is None:
+                        continue
+                else:
+                    data = X[col].dropna()
+                    if len(data) == 0:
+                        continue
+                    
+                    outliers = 0
+                    if self.method == 'iqr':
+                        Q1 = data.quantile(0.25)
+                        Q3 = data.quantile(0.75)
+                        IQR = Q3 - Q1
+                        lower_bound = Q1 - self.threshold * IQR
+                        upper_bound = Q3 + self.threshold * IQR
+                        outliers = ((data < lower_bound) | (data > upper_bound)).sum()
+                    
+                    elif self.method == 'zscore':
+                        z_scores = np.abs((data - data.mean()) / data.std())
+                        outliers = (z_scores > self.threshold).sum()
+                    
+                    elif self.method == 'mad':
+                        lower_bound, upper_bound = self._mad_bounds(data)
+                        outliers = ((data < lower_bound) | (data > upper_bound)).sum()
                 
                 if outliers > 0:
                     issues.append({
@@ -519,8 +959,122 @@ class OutlierDetector(BaseEstimator, TransformerMixin):
             self.errors = pd.DataFrame(issues)
         return X
 
+    def _count_outliers_from_profile(self, series, col_profile):
+        """Count outliers using bounds from the shared profile; None if the column is empty."""
+        if col_profile.numeric_count == 0:
+            return None
+        if self.method == 'iqr':
+            Q1 = col_profile.quantile(0.25)
+            Q3 = col_profile.quantile(0.75)
+            IQR = Q3 - Q1
+            lower_bound = Q1 - self.threshold * IQR
+            upper_bound = Q3 + self.threshold * IQR
+        elif self.method == 'zscore':
+            std = col_profile.std
+            if not std or np.isnan(std):
+                return 0
+            lower_bound = col_profile.mean - self.threshold * std
+            upper_bound = col_profile.mean + self.threshold * std
+        elif self.method == 'mad':
+            # The profile keeps no deviations from the median, so this needs the column
+            lower_bound, upper_bound = self._mad_bounds(series.dropna())
+        else:
+            return 0
+        # Min/max already tell us when no value can fall outside the bounds
+        if col_profile.min >= lower_bound and col_profile.max <= upper_bound:
+            return 0
+        data = series.dropna()
+        return ((data < lower_bound) | (data > upper_bound)).sum()
+
+    @classmethod
+    def robust_spread(cls, mad, mean_deviation):
+        """Scaled MAD, or the scaled mean absolute deviation where the MAD is 0.
+
+        A MAD of 0 (more than half the values equal, e.g. a fixed premium)
+        would flag every other value. Takes scalars or pandas objects.
+        """
+        if np.ndim(mad) == 0:
+            return cls.MAD_SCALE * mad if mad > 0 else cls.MEAN_AD_SCALE * mean_deviation
+        return (cls.MAD_SCALE * mad).where(mad > 0, cls.MEAN_AD_SCALE * mean_deviation)
+
+    def _mad_bounds(self, data):
+        median = data.median()
+        deviation = (data - median).abs()
+        spread = self.robust_spread(deviation.median(), deviation.mean())
+        return median - self.threshold * spread, median + self.threshold * spread
+
+    @staticmethod
+    def _group_codes(X, group_by):
+        """Dense segment code per row (missing values form their own segment)."""
+        codes = np.zeros(len(X), dtype='int64')
+        for col in group_by:
+            col_codes, uniques = pd.factorize(X[col], use_na_sentinel=False)
+            codes = pd.factorize(codes * len(uniques) + col_codes)[0]
+        return codes
+
+    def _group_bounds(self, values, codes, n_groups):
+        """Lower and upper bounds per group code and column (+-inf for groups too small to judge)."""
+        grouped = values.groupby(codes, sort=False)
+        if self.method == 'iqr':
+            q1, q3 = grouped.quantile(0.25), grouped.quantile(0.75)
+            lower, upper = q1 - self.threshold * (q3 - q1), q3 + self.threshold * (q3 - q1)
+        elif self.method == 'zscore':
+            mean, std = grouped.mean(), grouped.std()
+            lower, upper = mean - self.threshold * std, mean + self.threshold * std
+        elif self.method == 'mad':
+            median = grouped.median()
+            deviation = (values - median.reindex(codes).to_numpy()).abs().groupby(codes, sort=False)
+            spread = self.robust_spread(deviation.median(), deviation.mean())
+            lower, upper = median - self.threshold * spread, median + self.threshold * spread
+        else:
+            return None
+        too_small = grouped.count() < self.min_group_size
+        lower = lower.mask(too_small).reindex(range(n_groups)).fillna(-np.inf).to_numpy()
+        upper = upper.mask(too_small).reindex(range(n_groups)).fillna(np.inf).to_numpy()
+        return lower, upper
+
+    def _transform_grouped(self, X, group_by):
+        columns = [col for col in self.columns
+                   if col not in group_by and col in X.columns and pd.api.types.is_numeric_dtype(X[col])]
+        if not columns or len(X) == 0:
+            return X
+        codes = self._group_codes(X, group_by)
+        n_groups = int(codes.max()) + 1
+        first_rows = np.empty(n_groups, dtype='int64')
+        first_rows[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+        labels = X[group_by].iloc[first_rows].astype(str).agg(' | '.join, axis=1).to_numpy()
+
+        # One groupby pass over all columns; bounds come back as (group, column) arrays
+        values = X[columns].astype('float64').reset_index(drop=True)
+        checkpoint()
+        bounds = self._group_bounds(values, codes, n_groups)
+        if bounds is None:
+            return X
+        issues = []
+        for i, col in enumerate(columns):
+            checkpoint()
+            lower, upper = bounds[0][codes, i], bounds[1][codes, i]
+            data = values[col].to_numpy()
+            mask = (data < lower) | (data > upper)
+            if not mask.any():
+                continue
+            issues.append(pd.DataFrame({
+                'Row_Index': X.index[mask],
+                'Column': col,
+                'Group': labels[codes[mask]],
+                'Value': data[mask],
+                'Lower_Bound': lower[mask],
+                'Upper_Bound': upper[mask],
+                'Method': self.method,
+                'Check': 'OutlierDetector',
+            }))
+
+        if issues:
+            self.errors = pd.concat(issues, ignore_index=True)
+        return X
+
 
-class CrossFieldLogicChecker(BaseEstimator, TransformerMixin):
+class CrossFieldLogicChecker(BaseTransformer):
     """Validate cross-column logic rules."""
     def __init__(self, rules=None):
         self.rules = rules if rules else []
@@ -549,7 +1103,7 @@ class CrossFieldLogicChecker(BaseEstimator, TransformerMixin):
         return X
 
 
-class CategoryValidator(BaseEstimator, TransformerMixin):
+class CategoryValidator(BaseTransformer):
     """Validate categorical values against expected values."""
     def __init__(self, column_expected_values=None):
         self.column_expected_values = column_expected_values if column_expected_values else {}
@@ -576,7 +1130,7 @@ class CategoryValidator(BaseEstimator, TransformerMixin):
         return X
 
 
-class UniqueIDGenerator(BaseEstimator, TransformerMixin):
+class UniqueIDGenerator(BaseTransformer):
     """Generate unique ID column by concatenating specified columns."""
     def __init__(self, id_column=None, columns_to_concat=None):
         self.id_column = id_column
@@ -596,16 +1150,16 @@ class UniqueIDGenerator(BaseEstimator, TransformerMixin):
         # Check for duplicates in generated ID
         duplicates = X[self.id_column].duplicated().sum()
         if duplicates > 0:
-            self.errors = pd.DataFrame({
+            self.errors = pd.DataFrame([{
                 'Generated_ID_Column': self.id_column,
                 'Duplicate_IDs': duplicates,
                 'Check': 'UniqueIDGenerator'
-            })
+            }])
         
         return X
 
 
-class ColumnFilter(BaseEstimator, TransformerMixin):
+class ColumnFilter(BaseTransformer):
     """Keep only selected columns."""
     def __init__(self, columns_to_keep=None):
         self.columns_to_keep = columns_to_keep if columns_to_keep else []
@@ -633,8 +1187,11 @@ class ColumnFilter(BaseEstimator, TransformerMixin):
         return X
 
 
-class IssueSaver(BaseEstimator, TransformerMixin):
+class IssueSaver(BaseTransformer):
     """Compile all detected issues into Excel and JSON reports."""
+    # Excel sheets hold at most 1,048,576 rows including the header
+    EXCEL_MAX_ROWS = 1_048_575
+
     def __init__(self, output_excel="data_issues.xlsx", output_json="data_issues.json"):
         self.output_excel = output_excel
         self.output_json = output_json
@@ -648,48 +1205,122 @@ class IssueSaver(BaseEstimator, TransformerMixin):
         # The actual issue compilation will be done in the pipeline
         return X
 
+    def save_summary(self, all_errors, summary_data=None, columns=None):
+        """Write the JSON summary (issue count per check)."""
+        json_data = {
+            'timestamp': datetime.now().isoformat(),
+            'total_issues': sum(len(df) for df in all_errors.values()),
+            'columns': list(columns) if columns is not None else [],
+            'checks': [{'check': name, 'issues': len(df)} for name, df in all_errors.items()],
+            'summary': summary_data or {}
+        }
+        
+        import json
+        with atomic_path(self.output_json) as tmp_path:
+            with open(tmp_path, 'w') as f:
+                json.dump(json_data, f, indent=2, default=str)
+
+    def save_report(self, all_errors, summary_data=None):
+        """Write the Excel report: a Summary sheet and one sheet per check."""
+        try:
+            with atomic_path(self.output_excel) as tmp_path:
+                with pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
+                    # Summary sheet
+                    if summary_data:
+                        summary_df = pd.DataFrame([summary_data])
+                        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                    
+                    # Individual check sheets
+                    for check_name, errors_df in all_errors.items():
+                        if not errors_df.empty:
+                            errors_df.head(self.EXCEL_MAX_ROWS).to_excel(writer, sheet_name=check_name[:31], index=False)
+            print(f"Issues saved to {self.output_excel}")
+        except Exception as e:
+            print(f"Error saving issues: {e}")
+
     def save_issues(self, all_errors, summary_data=None):
         """Save all issues to Excel and JSON files."""
         try:
-            # Create Excel file with multiple sheets
-            with pd.ExcelWriter(self.output_excel, engine='openpyxl') as writer:
-                # Summary sheet
-                if summary_data:
-                    summary_df = pd.DataFrame([summary_data])
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Individual check sheets
-                for check_name, errors_df in all_errors.items():
-                    if not errors_df.empty:
-                        errors_df.to_excel(writer, sheet_name=check_name, index=False)
-            
-            # Create JSON summary
-            json_data = {
-                'timestamp': datetime.now().isoformat(),
-                'total_issues': sum(len(df) for df in all_errors.values()),
-                'checks': {name: len(df) for name, df in all_errors.items()},
-                'summary': summary_data or {}
-            }
-            
-            import json
-            with open(self.output_json, 'w') as f:
-                json.dump(json_data, f, indent=2)
-            
-            print(f"Issues saved to {self.output_excel} and {self.output_json}")
-            
+            self.save_summary(all_errors, summary_data)
         except Exception as e:
             print(f"Error saving issues: {e}")
+        self.save_report(all_errors, summary_data)
+
 
+class FinalSaver(BaseTransformer):
+    """Export the cleaned data as Parquet, Arrow IPC or CSV.
 
-class FinalSaver(BaseEstimator, TransformerMixin):
-    """Save cleaned data (for future phase)."""
-    def __init__(self, output_file="cleaned_data.csv"):
+    The frame is converted and written ``row_group_size`` rows at a time, so
+    only one chunk exists in Arrow form at once, and the file appears
+    atomically when complete. Only the path and counts are kept afterwards.
+    """
+    FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.csv': 'csv'}
+
+    def __init__(self, output_file="cleaned_data.parquet", file_format=None, compression="zstd", row_group_size=1 << 20):
         self.output_file = output_file
+        self.file_format = file_format
+        self.compression = compression
+        self.row_group_size = row_group_size
         self.errors = pd.DataFrame()
+        self.rows_written = 0
+        self.bytes_written = 0
 
     def fit(self, X, y=None):
         return self
 
+    @property
+    def format(self):
+        fmt = self.file_format or self.FORMATS.get(os.path.splitext(self.output_file)[1].lower())
+        if fmt not in self.FORMATS.values():
+            raise ValueError(f"Unsupported export format '{fmt}'. Use parquet, arrow or csv.")
+        return fmt
+
+    def _schema(self, X):
+        """Arrow schema of ``X``; object columns mixing types are exported as strings."""
+        fields, stringify = [], []
+        for col in X.columns:
+            series = X[col]
+            if series.dtype == object:
+                try:
+                    if pd.api.types.infer_dtype(series, skipna=True).startswith('mixed'):
+                        raise pa.ArrowTypeError(f"Column {col} mixes types")
+                    arrow_type = pa.infer_type(series.to_numpy(), from_pandas=True)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    arrow_type = pa.string()
+                    stringify.append(col)
+            else:
+                arrow_type = pa.Schema.from_pandas(X[[col]].iloc[:0], preserve_index=False).field(0).type
+            if self.format == 'csv' and pa.types.is_dictionary(arrow_type):
+                arrow_type = arrow_type.value_type
+            fields.append(pa.field(str(col), arrow_type))
+        return pa.schema(fields), stringify
+
+    def _writer(self, path, schema):
+        compression = self.compression or None
+        if self.format == 'parquet':
+            return pq.ParquetWriter(path, schema, compression=compression or 'none')
+        if self.format == 'arrow':
+            return pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+        return pa_csv.CSVWriter(path, schema)
+
     def transform(self, X):
-        # This will be implemented in the cleaning phase
-        return X
\ No newline at end of file
+        schema, stringify = self._schema(X)
+        self.rows_written = 0
+        with atomic_path(self.output_file) as tmp_path:
+            writer = self._writer(tmp_path, schema)
+            try:
+                for start in range(0, len(X), self.row_group_size):
+                    chunk = X.iloc[start:start + self.row_group_size]
+                    if stringify:
+                        chunk = chunk.copy()
+                        for col in stringify:
+                            chunk[col] = chunk[col].astype(str).where(chunk[col].notna(), None)
+                    chunk.columns = schema.names
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                    self.rows_written += len(chunk)
+                    report_chunk(self.rows_written, len(X))
+            finally:
+                writer.close()
+        self.bytes_written = os.path.getsize(self.output_file)
+        print(f"Cleaned data saved to {self.output_file}")
+        return X
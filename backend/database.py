@@ -1,16 +1,141 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .models import Base
 import os
 
 # Database URL - using SQLite for simplicity, can be changed to PostgreSQL/MySQL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dataviz.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+# Async driver used for each database; ASYNC_DATABASE_URL overrides the derived URL
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
+
+# SQLite connection pragmas
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# SQLite serializes writers and aiosqlite runs one thread per connection, so a few connections suffice
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+
+# Connection pool sizing for PostgreSQL/MySQL
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+
+def engine_options(url):
+    """Keyword arguments for ``create_engine`` tuned for the database behind ``url``."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases keep SQLAlchemy's default single-connection pool
+            return options
+        options.update(pool_size=SQLITE_POOL_SIZE, max_overflow=0, pool_timeout=DB_POOL_TIMEOUT)
+        return options
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        # Recycle before server-side idle timeouts (e.g. MySQL wait_timeout) close connections
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL lets readers proceed while one writer commits; NORMAL is durable in WAL mode except on power loss
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    finally:
+        cursor.close()
+
+
+def build_engine(url=DATABASE_URL):
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    return engine
+
+
+def async_database_url(url):
+    """``url`` with its driver swapped for the async one (aiosqlite, asyncpg, aiomysql)."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def build_async_engine(url):
+    options = engine_options(url)
+    if "pool_size" in options and make_url(url).get_backend_name() == "sqlite":
+        # aiosqlite defaults to NullPool, which would open a new file connection per session
+        options["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(url, **options)
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return async_engine
+
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+async_engine = build_async_engine(ASYNC_DATABASE_URL)
+# Objects stay loaded after commit so handlers can return them without another round trip
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+class QueryCounter:
+    """Count SQL statements executed on ``engines`` (default: both app engines) while active.
+
+        with QueryCounter() as queries:
+            ...
+        assert queries.count == 2
+    """
+    def __init__(self, *engines):
+        self.engines = [getattr(e, "sync_engine", e) for e in (engines or (engine, async_engine))]
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        for e in self.engines:
+            event.listen(e, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for e in self.engines:
+            event.remove(e, "before_cursor_execute", self._record)
+
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add nullable columns and indexes introduced since then
+    existing = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        present = {column["name"] for column in existing.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present and column.nullable:
+                with engine.begin() as connection:
+                    connection.execute(text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                    ))
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def get_db():
     db = SessionLocal()
@@ -18,3 +143,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
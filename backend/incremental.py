@@ -0,0 +1,411 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from .artifacts import atomic_path
+from .custom_transformers import OutlierDetector
+from .profiler import QuantileSketch
+
+BASELINE_DIR = os.getenv("BASELINE_DIR", "baselines")
+# Sorted hash segments per index before they are merged into one
+BASELINE_MAX_SEGMENTS = int(os.getenv("BASELINE_MAX_SEGMENTS", "8"))
+BASELINE_SKETCH_SIZE = int(os.getenv("BASELINE_SKETCH_SIZE", "100000"))
+# Category dictionaries stop growing (and new values stop being reported) past this size
+BASELINE_MAX_CATEGORIES = int(os.getenv("BASELINE_MAX_CATEGORIES", "10000"))
+
+# Configuration the stored state depends on; changing any of it needs a new baseline
+SIGNATURE_KEYS = ('duplicate_key_columns', 'id_column', 'numeric_columns', 'outlier_detection', 'category_validation')
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def config_signature(configs):
+    relevant = {key: configs.get(key) for key in SIGNATURE_KEYS}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def outlier_columns(configs):
+    outlier_config = configs.get('outlier_detection', {}) or {}
+    return outlier_config.get('columns', configs.get('numeric_columns', []))
+
+
+def _comparable(series):
+    """``series`` in a dtype that does not depend on how its batch happened to be parsed.
+
+    The same column can load as integers, floats (with a missing value) or
+    strings (with one malformed value) in different batches, so numbers are
+    hashed as float64 unless that would lose integer precision.
+    """
+    if series.dtype == object:
+        # Strings that are not numbers usually show in the first few values
+        head = series.dropna().head(100)
+        if len(head) == 0 or pd.to_numeric(head, errors='coerce').isna().any():
+            return series
+        numbers = pd.to_numeric(series, errors='coerce')
+        if numbers.notna().sum() != series.notna().sum():
+            return series
+        series = numbers
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series) and len(series) and series.abs().max() >= 2 ** 53:
+        return series
+    return series.astype('float64')
+
+
+def _fold(state, values):
+    """Count, mean and sum of squared deviations of ``state`` with ``values`` added (Chan et al.)."""
+    state = dict(state or {'count': 0, 'mean': 0.0, 'm2': 0.0})
+    if len(values):
+        n_b, mean_b = len(values), values.mean()
+        total = state['count'] + n_b
+        diff = mean_b - state['mean']
+        state['m2'] += ((values - mean_b) ** 2).sum() + diff ** 2 * state['count'] * n_b / total
+        state['mean'] += diff * n_b / total
+        state['count'] = total
+    return state
+
+
+def _outlier_bounds(method, threshold, state, sketch):
+    """Bounds of ``method`` over the values summarized by ``state`` and ``sketch``; None when undefined."""
+    if method == 'iqr':
+        q1, q3 = sketch.quantile(0.25), sketch.quantile(0.75)
+        return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+    if method == 'zscore' and state['count'] > 1:
+        std = np.sqrt(state['m2'] / (state['count'] - 1))
+        return state['mean'] - threshold * std, state['mean'] + threshold * std
+    if method == 'mad':
+        # Deviations from the median, with the sketch's weights; exact while it is not compacted
+        median = sketch.quantile(0.5)
+        deviations = QuantileSketch(sketch.capacity)
+        deviations.values, deviations.weights = np.abs(sketch.values - median), sketch.weights
+        spread = OutlierDetector.robust_spread(deviations.quantile(0.5),
+                                               np.average(deviations.values, weights=deviations.weights))
+        return median - threshold * spread, median + threshold * spread
+    return None
+
+
+def _read_sketch(stored, suffix=''):
+    sketch = QuantileSketch(BASELINE_SKETCH_SIZE)
+    sketch.values = stored[f'values{suffix}']
+    sketch.weights = stored[f'weights{suffix}'] if f'weights{suffix}' in stored.files else None
+    return sketch
+
+
+def _sketch_arrays(sketch, suffix=''):
+    arrays = {f'values{suffix}': sketch.values}
+    if sketch.weights is not None:
+        arrays[f'weights{suffix}'] = sketch.weights
+    return arrays
+
+
+def _hashes(X, columns):
+    """uint64 hash per row of ``columns``, stable across batches whose dtypes differ."""
+    frame = pd.DataFrame({i: _comparable(X[col]) for i, col in enumerate(columns)})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class HashIndex:
+    """Set of uint64 row hashes stored as sorted ``.npy`` segments.
+
+    Each batch adds one segment, so appending costs the size of the batch.
+    Lookups binary-search every segment through a memory map, touching only the
+    pages they need. Once there are more than ``max_segments`` segments they
+    are merged into one.
+    """
+    def __init__(self, directory, name, segments=None, max_segments=BASELINE_MAX_SEGMENTS):
+        self.directory = directory
+        self.name = name
+        self.segments = list(segments or [])
+        self.max_segments = max_segments
+
+    def _load(self, segment):
+        return np.load(os.path.join(self.directory, segment), mmap_mode='r')
+
+    def contains(self, hashes):
+        if not self.segments or len(hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        # Sorted probes walk each segment front to back instead of jumping around it
+        order = np.argsort(hashes)
+        probes = hashes[order]
+        found = np.zeros(len(probes), dtype=bool)
+        for segment in self.segments:
+            values = self._load(segment)
+            if len(values) == 0:
+                continue
+            positions = np.minimum(np.searchsorted(values, probes), len(values) - 1)
+            found |= values[positions] == probes
+        result = np.empty(len(hashes), dtype=bool)
+        result[order] = found
+        return result
+
+    def _write(self, values):
+        segment = f"{self.name}-{uuid.uuid4().hex}.npy"
+        with atomic_path(os.path.join(self.directory, segment)) as tmp_path:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, values)
+        return segment
+
+    def add(self, hashes):
+        """Write ``hashes`` as a new segment; returns the segment files no longer referenced."""
+        self.segments.append(self._write(np.unique(hashes)))
+        if len(self.segments) <= self.max_segments:
+            return []
+        merged = np.unique(np.concatenate([self._load(segment) for segment in self.segments]))
+        obsolete, self.segments = self.segments, [self._write(merged)]
+        return obsolete
+
+
+class Baseline:
+    """Persisted validation state of a project's data, for checking appended batches.
+
+    Holds hash indexes of full rows, ``duplicate_key_columns`` and IDs, a
+    quantile sketch and moments per outlier column (per column and segment
+    with ``group_by``), and the values seen in each validated category column. :meth:`check` validates a new batch against the
+    state without reading earlier batches; :meth:`append` then folds the batch in.
+    """
+    def __init__(self, project_id, root=BASELINE_DIR):
+        self.project_id = project_id
+        self.directory = os.path.join(root, str(int(project_id)))
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        with _locks_guard:
+            self.lock = _locks.setdefault(self.directory, threading.Lock())
+
+    def load(self):
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def summary(self):
+        manifest = self.load()
+        if manifest is None:
+            return None
+        return {
+            'project_id': self.project_id,
+            'row_count': manifest['row_count'],
+            'batches': manifest['batches'],
+            'indexes': {name: len(segments) for name, segments in manifest['indexes'].items()},
+            'outlier_columns': sorted(manifest['outliers']),
+            'category_columns': sorted(manifest['categories']),
+        }
+
+    def ensure_compatible(self, configs):
+        manifest = self.load()
+        if manifest is not None and manifest['signature'] != config_signature(configs):
+            raise ValueError("The baseline was built with a different configuration; reset it before changing "
+                             + ", ".join(SIGNATURE_KEYS) + ".")
+
+    def reset(self):
+        with self.lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _index(self, manifest, name):
+        segments = manifest['indexes'].get(name, []) if manifest else []
+        return HashIndex(self.directory, name, segments)
+
+    def _sketch(self, manifest, column):
+        state = manifest['outliers'].get(column) if manifest else None
+        if not state:
+            return QuantileSketch(BASELINE_SKETCH_SIZE)
+        with np.load(os.path.join(self.directory, state['sketch'])) as stored:
+            return _read_sketch(stored)
+
+    def _group_sketches(self, state):
+        """Sketch per segment label of a grouped outlier column, all kept in one file."""
+        if not state.get('sketch'):
+            return {}
+        with np.load(os.path.join(self.directory, state['sketch'])) as stored:
+            return {label: _read_sketch(stored, f"_{group['slot']}") for label, group in state['groups'].items()}
+
+    def _check_groups(self, manifest, X, col, labels, outlier_config, delta):
+        """Row issues of ``col`` against the bounds of each segment's baseline plus batch values."""
+        method = outlier_config.get('method', 'iqr')
+        threshold = outlier_config.get('threshold', 1.5)
+        min_group_size = outlier_config.get('min_group_size', 10)
+        stored = (manifest['outliers'].get(col) if manifest else None) or {'groups': {}}
+        states = dict(stored['groups'])
+        sketches = self._group_sketches(stored)
+        values = X[col].to_numpy(dtype='float64', na_value=np.nan)
+        present = ~np.isnan(values)
+        codes, uniques = pd.factorize(labels)
+        issues = []
+        for code, label in enumerate(uniques):
+            in_group = (codes == code) & present
+            group_values = values[in_group]
+            states[label] = state = _fold(states.get(label), group_values)
+            sketch = sketches.setdefault(label, QuantileSketch(BASELINE_SKETCH_SIZE))
+            sketch.update(group_values)
+            # Segments too small to judge, as in the pipeline's grouped check
+            if state['count'] < min_group_size or len(group_values) == 0:
+                continue
+            bounds = _outlier_bounds(method, threshold, state, sketch)
+            if bounds is None:
+                continue
+            lower, upper = bounds
+            mask = in_group & ((values < lower) | (values > upper))
+            if mask.any():
+                issues.append(pd.DataFrame({
+                    'Row_Index': X.index[mask],
+                    'Column': col,
+                    'Group': label,
+                    'Value': values[mask],
+                    'Lower_Bound': lower,
+                    'Upper_Bound': upper,
+                    'Method': method,
+                    'Baseline_Rows': (manifest or {}).get('row_count', 0),
+                    'Check': 'OutlierDetector',
+                }))
+        delta['outliers'][col] = {'groups': states, 'sketches': sketches}
+        return issues
+
+    def check(self, X, configs):
+        """Issues of batch ``X`` that only show against the baseline, and the state update to :meth:`append`.
+
+        Returns ``(errors, delta)``: ``errors`` maps a step name to an issue
+        DataFrame in the shape the pipeline's checks produce.
+        """
+        manifest = self.load()
+        errors = {}
+        delta = {'rows': len(X), 'hashes': {}, 'outliers': {}, 'categories': {}}
+
+        def row_issues(mask, check, **details):
+            rows = X[mask].copy()
+            rows['Row_Index'] = rows.index
+            for name, value in details.items():
+                rows[name] = value
+            rows['Check'] = check
+            return rows
+
+        # Cross-batch duplicates: rows and keys already present in an earlier batch
+        key_columns = [col for col in configs.get('duplicate_key_columns', []) if col in X.columns]
+        indexed = [('rows', list(X.columns), 'DuplicatesFromtheData')]
+        if key_columns:
+            indexed.append(('keys', key_columns, 'DuplicateIdentifier'))
+        for name, columns, check in indexed:
+            hashes = _hashes(X, columns)
+            delta['hashes'][name] = hashes
+            seen = self._index(manifest, name).contains(hashes)
+            if seen.any():
+                details = {'Key_Columns': str(columns)} if name == 'keys' else {}
+                errors[f"baseline_{name}"] = row_issues(seen, check, Duplicate_Of='baseline', **details)
+
+        id_column = configs.get('id_column')
+        if id_column and id_column in X.columns:
+            present = X[id_column].notna().to_numpy()
+            hashes = _hashes(X, [id_column])
+            delta['hashes']['ids'] = hashes[present]
+            seen = self._index(manifest, 'ids').contains(hashes) & present
+            if seen.any():
+                errors['baseline_ids'] = row_issues(seen, 'IDValidator', Column=id_column, Issue='ID already in baseline')
+
+        # Outliers against the bounds of baseline plus batch, per segment with group_by
+        outlier_config = configs.get('outlier_detection', {}) or {}
+        method = outlier_config.get('method', 'iqr')
+        threshold = outlier_config.get('threshold', 1.5)
+        group_by = [col for col in outlier_config.get('group_by', []) or [] if col in X.columns]
+        labels = X[group_by].astype(str).agg(' | '.join, axis=1).to_numpy() if group_by else None
+        outliers, grouped = [], []
+        for col in outlier_columns(configs):
+            if col not in X.columns or col in group_by or not pd.api.types.is_numeric_dtype(X[col]):
+                continue
+            if group_by:
+                grouped += self._check_groups(manifest, X, col, labels, outlier_config, delta)
+                continue
+            values = X[col].dropna().to_numpy(dtype='float64')
+            state = _fold(manifest['outliers'].get(col) if manifest else None, values)
+            sketch = self._sketch(manifest, col)
+            sketch.update(values)
+            delta['outliers'][col] = (state, sketch)
+            if state['count'] == 0 or len(values) == 0:
+                continue
+            bounds = _outlier_bounds(method, threshold, state, sketch)
+            if bounds is None:
+                continue
+            lower, upper = bounds
+            count = int(((values < lower) | (values > upper)).sum())
+            if count:
+                outliers.append({'Column': col, 'Outliers_Detected': count, 'Method': method,
+                                 'Baseline_Rows': (manifest or {}).get('row_count', 0), 'Check': 'OutlierDetector'})
+        if outliers:
+            errors['baseline_outliers'] = pd.DataFrame(outliers)
+        if grouped:
+            errors['baseline_outliers'] = pd.concat(grouped, ignore_index=True)
+
+        # Category values never seen in an earlier batch
+        new_categories = []
+        for col in configs.get('category_validation', {}) or {}:
+            if col not in X.columns:
+                continue
+            known = (manifest['categories'].get(col) if manifest else None) or {'values': [], 'truncated': False}
+            observed = [str(value) for value in X[col].dropna().unique()]
+            new_values = sorted(set(observed) - set(known['values']))
+            delta['categories'][col] = new_values
+            if manifest and new_values and not known['truncated']:
+                new_categories.append({'Column': col, 'New_Values': new_values[:100],
+                                       'New_Value_Count': len(new_values), 'Check': 'NewCategoryDetector'})
+        if new_categories:
+            errors['baseline_categories'] = pd.DataFrame(new_categories)
+
+        return errors, delta
+
+    def append(self, delta, configs, run_uuid=None):
+        """Fold a checked batch into the state and persist it atomically."""
+        manifest = self.load() or {
+            'version': 1,
+            'signature': config_signature(configs),
+            'row_count': 0,
+            'batches': [],
+            'indexes': {},
+            'outliers': {},
+            'categories': {},
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        obsolete = []
+        for name, hashes in delta['hashes'].items():
+            index = self._index(manifest, name)
+            obsolete += index.add(hashes)
+            manifest['indexes'][name] = index.segments
+
+        for col, update in delta['outliers'].items():
+            previous = manifest['outliers'].get(col)
+            if previous:
+                obsolete.append(previous['sketch'])
+            if isinstance(update, dict):
+                # Every segment's sketch in one file, found by its slot
+                arrays, groups = {}, {}
+                for slot, (label, group) in enumerate(update['groups'].items()):
+                    arrays.update(_sketch_arrays(update['sketches'][label], f"_{slot}"))
+                    groups[label] = {**group, 'slot': slot}
+                state = {'groups': groups}
+            else:
+                state, sketch = update
+                arrays = _sketch_arrays(sketch)
+            state['sketch'] = f"sketch-{uuid.uuid4().hex}.npz"
+            with atomic_path(os.path.join(self.directory, state['sketch'])) as tmp_path:
+                np.savez(tmp_path, **arrays)
+            manifest['outliers'][col] = state
+
+        for col, new_values in delta['categories'].items():
+            known = manifest['categories'].setdefault(col, {'values': [], 'truncated': False})
+            room = BASELINE_MAX_CATEGORIES - len(known['values'])
+            known['values'] += new_values[:max(room, 0)]
+            known['truncated'] = known['truncated'] or len(new_values) > room
+
+        manifest['row_count'] += delta['rows']
+        manifest['batches'].append({'run_uuid': run_uuid, 'rows': delta['rows'], 'created_at': datetime.utcnow().isoformat() + 'Z'})
+        with atomic_path(self.manifest_path) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+        # Only unreferenced once the new manifest is in place
+        for name in obsolete:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+        return manifest
@@ -1,20 +1,41 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request, status
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request, Response, BackgroundTasks, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-import pandas as pd
-import io
+import base64
+import functools
+import asyncio
+import json
+import time
 import os
+import shutil
+import uuid
 import yaml
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from .pipeline import create_issue_pipeline
-from .database import get_db, create_tables
-from .models import User, Project, Log
-from .schemas import UserCreate, User as UserSchema, ProjectCreate, Project as ProjectSchema, ProjectUpdate, Log as LogSchema, Token
-from .auth import authenticate_user, create_access_token, get_current_active_user, get_admin_user, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
-from fastapi import Body
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from .uploads import ResumableUploadStore
+from .artifacts import artifact_store, artifact_response
+from .database import AsyncSessionLocal, async_engine, get_db, get_async_db, create_tables
+from .audit import audit_writer, log_action
+from .stats import ensure_counters, read_counters
+from .progress import RunCancelled, progress_runs, tracking
+from .models import User, Project, Log, Run
+from .schemas import UserCreate, User as UserSchema, UserUpdate, ProjectCreate, Project as ProjectSchema, ProjectUpdate, Log as LogSchema, Run as RunSchema, Token, UploadInitiate, UploadComplete, SqlSourceConnect
+from .auth import authenticate_user_async, create_access_token, token_claims_for, get_current_active_user, get_active_principal, get_optional_principal, get_admin_user, get_password_hash, get_password_hash_async, hashing_pool, token_cache, user_cache, ACCESS_TOKEN_EXPIRE_MINUTES
+from fastapi import Body, Form
+
+# pandas, pyarrow and the modules built on them are imported by the endpoints
+# that use them, so starting a worker only loads the web stack
+if TYPE_CHECKING:
+    import pandas as pd
+    from .incremental import Baseline
+    from .progress import RunProgress
+    from .sql_source import SqlSource
 
 app = FastAPI(title="DatViz API", version="1.0.0")
 
@@ -24,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Range", "Accept-Ranges"],
 )
 
 # Create tables on startup
@@ -43,23 +65,41 @@ async def startup_event():
         )
         db.add(admin_user)
         db.commit()
+    # Backfill the dashboard counters once; afterwards they are kept up to date on write
+    ensure_counters(db)
     db.close()
+    audit_writer.start()
+    artifact_store.start()
+    upload_store.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Write out audit events still waiting in memory
+    audit_writer.stop()
+    artifact_store.stop()
+    upload_store.stop()
+    await async_engine.dispose()
 
 data = None  # Global DataFrame
 configs: Dict[str, Any] = {}
 
-# Helper function to log actions
-def log_action(db: Session, user_id: int, action: str, details: dict = None, project_id: int = None, request: Request = None):
-    log = Log(
-        user_id=user_id,
-        project_id=project_id,
-        action=action,
-        details=details or {},
-        ip_address=request.client.host if request else None,
-        user_agent=request.headers.get("user-agent") if request else None
-    )
-    db.add(log)
-    db.commit()
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+# Engine of runs that do not choose one: pandas, polars (falls back to pandas for steps it cannot run),
+# or sql (checks the table connected with /sources/sql in place)
+CHECK_ENGINE = os.getenv("CHECK_ENGINE", "pandas")
+upload_store = ResumableUploadStore(os.path.join(UPLOAD_DIR, "sessions"))
+# Tracks the background ingestion of the most recent upload
+ingestion: Dict[str, Any] = {"ingestion_id": None, "status": "idle", "path": None, "rows": None, "error": None}
+# Artifact directory of the most recent /identify-issues run, served by /download-issues
+latest_run_uuid: Optional[str] = None
+# Database table connected with /sources/sql, checked in place by engine=sql runs
+sql_source: Optional["SqlSource"] = None
+# Config of the most recent quick scans, so /identify-issues?scan_id= can promote one to a full run
+quick_scans: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+QUICK_SCAN_HISTORY = 32
+# How often a run's event stream looks for new events, and how long it may stay silent
+PROGRESS_POLL_SECONDS = 0.25
+PROGRESS_KEEPALIVE_SECONDS = 15.0
 
 def load_configs() -> Dict[str, Any]:
     """Load configuration from root-level config.yaml if present."""
@@ -78,39 +118,226 @@ def load_configs() -> Dict[str, Any]:
                 return {}
     return {}
 
-def clear_old_files():
-    if os.path.exists("data_issues.xlsx"):
-        os.remove("data_issues.xlsx")
-    if os.path.exists("data_issues.json"):
-        os.remove("data_issues.json")
+def read_data_file(path: str) -> "pd.DataFrame":
+    import pandas as pd
+    if path.endswith('.csv'):
+        return pd.read_csv(path, encoding="utf-8")
+    elif path.endswith('.xlsx'):
+        return pd.read_excel(path)
+    elif path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    raise ValueError("Unsupported file format.")
 
-@app.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+def ingest_file(ingestion_id: str, path: Optional[str], read: Optional[Callable[[], "pd.DataFrame"]] = None):
+    """Parse the full file (or call ``read``) in the background and publish it as the current dataset."""
+    global data
+    try:
+        frame = read() if read is not None else read_data_file(path)
+    except Exception as e:
+        if ingestion["ingestion_id"] == ingestion_id:
+            ingestion.update(status="failed", error=str(e))
+        return
+    # A newer upload may have started while this one was parsing
+    if ingestion["ingestion_id"] == ingestion_id:
+        data = frame
+        ingestion.update(status="ready", rows=len(frame))
+
+def start_ingestion(background_tasks: BackgroundTasks, path: Optional[str], read: Optional[Callable[[], "pd.DataFrame"]] = None) -> str:
     global data
+    previous_path = ingestion["path"]
+    if previous_path and previous_path != path and os.path.exists(previous_path):
+        os.remove(previous_path)
+    ingestion_id = uuid.uuid4().hex
+    data = None
+    ingestion.update(ingestion_id=ingestion_id, status="loading", path=path, rows=None, error=None)
+    background_tasks.add_task(ingest_file, ingestion_id, path, read)
+    return ingestion_id
+
+def require_data() -> "pd.DataFrame":
+    if data is None:
+        if ingestion["status"] == "loading":
+            raise HTTPException(status_code=409, detail="Data is still being ingested. Please try again shortly.")
+        raise HTTPException(status_code=400, detail="No data uploaded.")
+    return data
+
+def save_upload(file: UploadFile) -> str:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}_{os.path.basename(file.filename)}")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out, 1024 * 1024)
+    return path
+
+@app.post("/upload")
+async def upload_file(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    """Return schema, preview and a sample from the head of the file; parse the rest in the background."""
     global configs
-    clear_old_files()
-    contents = await file.read()
 
     if not file.filename.endswith(('.csv', '.xlsx', '.parquet')):
         raise HTTPException(status_code=400, detail="Unsupported file format.")
 
+    from .preview import read_preview
+    path = await run_in_threadpool(save_upload, file)
     try:
-        if file.filename.endswith('.csv'):
-            data = pd.read_csv(io.StringIO(contents.decode("utf-8")))
-        elif file.filename.endswith('.xlsx'):
-            data = pd.read_excel(io.BytesIO(contents))
-        elif file.filename.endswith('.parquet'):
-            data = pd.read_parquet(io.BytesIO(contents))
+        preview = await run_in_threadpool(read_preview, path)
     except Exception as e:
+        os.remove(path)
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
 
+    ingestion_id = start_ingestion(background_tasks, path)
+
     # Load configs once a file is uploaded so we can parameterize the pipeline
     configs = load_configs()
 
     return {
         "message": "File uploaded successfully.",
-        "columns": data.columns.tolist(),
-        "preview": data.head(5).to_dict(orient="records")
+        "ingestion_id": ingestion_id,
+        "columns": preview["columns"],
+        "preview": preview["preview"],
+        "schema": preview["schema"],
+        "sample": preview["sample"],
+        "row_count": preview["row_count"],
+        "ingestion": ingestion["status"],
+    }
+
+# Resumable uploads: initiate, send numbered parts (in parallel), query missing parts, complete
+@app.post("/uploads")
+async def initiate_upload(request: UploadInitiate):
+    try:
+        return upload_store.initiate(request.filename, request.total_size, request.part_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.put("/uploads/{upload_id}/parts/{part_number}")
+async def upload_part(upload_id: str, part_number: int, request: Request):
+    """Store one part; the body is the raw part bytes and X-Content-SHA256 its hex digest."""
+    content = await request.body()
+    try:
+        return await run_in_threadpool(
+            upload_store.store_part, upload_id, part_number, content, request.headers.get("x-content-sha256")
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/uploads/{upload_id}")
+async def get_upload_status(upload_id: str):
+    try:
+        return upload_store.status(upload_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/uploads/{upload_id}/preview")
+async def preview_upload(upload_id: str):
+    """Preview a CSV upload from its leading part, before the remaining parts arrive."""
+    try:
+        status_info = upload_store.status(upload_id)
+        part_path = upload_store.leading_part_path(upload_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not status_info["filename"].endswith(".csv"):
+        raise HTTPException(status_code=409, detail="Only CSV uploads can be previewed before completion.")
+    if part_path is None:
+        raise HTTPException(status_code=409, detail="The first part has not arrived yet.")
+    from .preview import read_preview
+    try:
+        return await run_in_threadpool(
+            read_preview, part_path, file_format="csv", partial=status_info["part_count"] > 1
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+
+@app.post("/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str, background_tasks: BackgroundTasks, request: Optional[UploadComplete] = None):
+    global configs
+    try:
+        path, checksum = await run_in_threadpool(upload_store.complete, upload_id, UPLOAD_DIR, request.checksum if request else None)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    from .preview import read_preview
+    try:
+        preview = await run_in_threadpool(read_preview, path)
+    except Exception as e:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+
+    ingestion_id = start_ingestion(background_tasks, path)
+    configs = load_configs()
+    return {
+        "message": "File uploaded successfully.",
+        "ingestion_id": ingestion_id,
+        "checksum": checksum,
+        "columns": preview["columns"],
+        "preview": preview["preview"],
+        "schema": preview["schema"],
+        "sample": preview["sample"],
+        "row_count": preview["row_count"],
+        "ingestion": ingestion["status"],
+    }
+
+@app.delete("/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    try:
+        upload_store.abort(upload_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"message": "Upload aborted."}
+
+@app.get("/upload/status")
+async def upload_status():
+    """Report whether the full file behind the last preview has been ingested."""
+    return {key: ingestion[key] for key in ("ingestion_id", "status", "rows", "error")}
+
+@app.post("/sources/sql")
+async def connect_sql_source(
+    request: SqlSourceConnect,
+    background_tasks: BackgroundTasks,
+    load: bool = True,
+    current_user: User = Depends(get_admin_user)
+):
+    """Use a SQLite or PostgreSQL table as the dataset (admin only: the server connects to ``url``).
+
+    ``engine=sql`` runs of /identify-issues check the table where it lives.
+    With ``load`` (the default) the table is also read into memory in the
+    background, as an upload would be, for the other engines and endpoints.
+    """
+    global configs, data, sql_source
+    from .preview import _records
+    from .sql_source import SqlSource
+
+    def connect():
+        source = SqlSource(request.url, request.table)
+        try:
+            return source, source.row_count(), source.read_frame(limit=5)
+        except Exception:
+            source.dispose()
+            raise
+
+    try:
+        source, row_count, head = await run_in_threadpool(connect)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading table: {str(e)}")
+    if sql_source is not None:
+        sql_source.dispose()
+    sql_source = source
+
+    ingestion_id = None
+    if load:
+        ingestion_id = start_ingestion(background_tasks, None, source.read_frame)
+    else:
+        data = None
+    configs = load_configs()
+    log_action(current_user.id, "connect_sql_source", {"table": request.table, "rows": row_count})
+    return {
+        "message": "Table connected.",
+        "ingestion_id": ingestion_id,
+        "columns": source.columns,
+        "schema": source.schema(),
+        "preview": _records(head),
+        "row_count": row_count,
+        "ingestion": ingestion["status"] if load else "idle",
     }
 
 @app.post("/configure-checks")
@@ -141,61 +368,669 @@ async def upload_config(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
 
-@app.post("/identify-issues")
-async def identify_issues():
-    global data
-    global configs
-    if data is None:
-        raise HTTPException(status_code=400, detail="No data uploaded.")
+def execute_checks(frame: Optional["pd.DataFrame"], run_config: Dict[str, Any], output_dir: str, fingerprint: bool = False,
+                   baseline: Optional["Baseline"] = None, run_uuid: Optional[str] = None,
+                   source: Optional["SqlSource"] = None, progress: Optional["RunProgress"] = None) -> Dict[str, Any]:
+    """Run the configured checks on ``frame`` and write what they found to ``output_dir``.
 
-    try:
-        # Build and run the pipeline with loaded configs
-        pipeline = create_issue_pipeline(configs=configs or {})
-        transformed = pipeline.fit_transform(data)
+    The pipeline cleans columns in place, so it runs on a shallow copy and the
+    uploaded data stays as it was for the next run. The normalized issues
+    (``issues.parquet``) and the JSON summary are written before returning;
+    ``write_report`` writes the slower Excel report and is left to the caller.
+    With an ``export`` format configured the cleaned data is written there too.
 
-        # If IssueSaver created the xlsx, optionally expose a small JSON summary alongside it
-        summary_path = "data_issues.json"
+    With a ``baseline`` the frame is a new batch of the project's data: it is
+    also checked against the stored state of earlier batches, which it then
+    joins. Outliers are only judged against baseline plus batch.
+
+    With the ``sql`` engine the checks run on the ``source`` table instead of
+    ``frame`` (see ``sql_source.run_pipeline_sql``); such runs have no
+    fingerprint, baseline or export.
+
+    ``progress`` receives the run's step and chunk events (steps run by the
+    polars and sql engines are not reported one by one) and cancels it
+    between steps, chunks and queries.
+    """
+    from .pipeline import create_issue_pipeline, run_pipeline
+    from .planner import compile_plan
+    from .runs import dataset_fingerprint, issue_counts, normalize_issues, row_keys, write_issues
+    pipeline_config = run_config
+    if baseline is not None:
+        pipeline_config = {**run_config, "outlier_detection": {**(run_config.get("outlier_detection") or {}), "columns": []}}
+    engine = run_config.get("engine") or CHECK_ENGINE
+    plan = None
+    if progress is not None:
+        # The plan's cost estimates give the progress events their ETA
+        if engine == "sql":
+            plan = compile_plan(pipeline_config, columns=source.columns, rows=source.row_count())
+        else:
+            plan = compile_plan(pipeline_config, columns=list(frame.columns), rows=len(frame))
+        progress.start(plan, engine)
+    pipeline = create_issue_pipeline(configs=pipeline_config, output_dir=output_dir, plan=plan)
+    result = None
+    if engine == "sql":
+        from .sql_source import run_pipeline_sql
+        key_columns = [run_config["id_column"]] if run_config.get("id_column") else None
+        # Steps are not reported one by one, but cancelling still stops the run between queries and batches
+        with tracking(progress):
+            result = run_pipeline_sql(pipeline, source, key_columns)
+    elif engine == "polars":
+        from .polars_engine import UnsupportedPlan, run_pipeline_polars
         try:
-            # The IssueSaver writes a Summary sheet; we recompute a light summary here
-            summary = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "columns": list(transformed.columns),
-            }
-            # Defer to IssueSaver-produced counts if present via a lightweight read
-            # We avoid heavy engine dependencies by keeping JSON simple here
-            with open(summary_path, "w", encoding="utf-8") as f:
-                import json
-                json.dump(summary, f)
-        except Exception:
-            pass
+            with tracking(progress):
+                result = run_pipeline_polars(pipeline, frame.copy(deep=False))
+        except UnsupportedPlan as e:
+            print(f"Running the checks on pandas: {e}")
+            pipeline = create_issue_pipeline(configs=pipeline_config, output_dir=output_dir, plan=plan)
+    if result is None:
+        engine = "pandas"
+        result = run_pipeline(pipeline, frame.copy(deep=False), progress)
+    if progress is not None:
+        progress.check()
+    output = result["output"]
+    delta = None
+    rows = result["row_count"] if engine == "sql" else len(frame)
+    stopped_by = result["stopped_by"]
+    # A run stopped by a fatal check does not join the project's baseline
+    if baseline is not None and stopped_by is None:
+        start = time.perf_counter()
+        baseline_errors, delta = baseline.check(output, run_config)
+        result["errors"].update(baseline_errors)
+        result["timings"]["baseline"] = time.perf_counter() - start
+    if engine == "sql":
+        # Only the flagged rows were read back, and keyed, from the database
+        keys, columns, column_count = result["keys"], result["columns"], len(source.columns)
+    else:
+        key_columns = [run_config["id_column"]] if run_config.get("id_column") else None
+        keys = row_keys(output, key_columns)
+        columns, column_count = list(output.columns), len(frame.columns)
+    # Nothing below needs the cleaned rows; any export has been written by the final_saver step
+    del output, result["output"]
+    issues = normalize_issues(result["errors"], keys, result["data_columns"])
+    issues_path = write_issues(issues, os.path.join(output_dir, "issues.parquet"))
+    if delta is not None:
+        baseline.append(delta, run_config, run_uuid=run_uuid)
 
-        return {
-            "message": "Issue detection complete.",
-            "download": "/download-issues",
-            "summary_download": "/download-issues-summary"
+    saver = pipeline.named_steps["issue_saver"]
+    summary = {"rows": rows, "columns": column_count, "total_issues": len(issues)}
+    saver.save_summary(result["errors"], summary, columns=columns)
+    export = None
+    if "final_saver" in pipeline.named_steps and "final_saver" not in result["skipped"]:
+        final_saver = pipeline.named_steps["final_saver"]
+        export = {
+            "name": os.path.basename(final_saver.output_file),
+            "format": final_saver.format,
+            "rows": final_saver.rows_written,
+            "bytes": final_saver.bytes_written,
         }
+    return {
+        "fingerprint": dataset_fingerprint(frame) if fingerprint and frame is not None else None,
+        "row_count": rows,
+        "column_count": column_count,
+        "step_timings": {name: round(seconds, 6) for name, seconds in result["timings"].items()},
+        "issue_counts": issue_counts(issues),
+        "total_issues": len(issues),
+        "issues_path": issues_path,
+        "export": export,
+        "engine": engine,
+        "stopped_by": stopped_by,
+        "skipped_steps": result["skipped"],
+        "pushed_down": result.get("pushed_down"),
+        "write_report": functools.partial(saver.save_report, result["errors"], summary),
+    }
+
+async def get_owned_project(db: AsyncSession, project_id: int, user: User) -> Project:
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.owner_id == user.id))
+    project = result.scalars().first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+async def get_owned_run(db: AsyncSession, run_id: int, user: User) -> Run:
+    result = await db.execute(
+        select(Run).join(Project, Run.project_id == Project.id).where(Run.id == run_id, Project.owner_id == user.id)
+    )
+    run = result.scalars().first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+async def get_visible_progress(db: AsyncSession, run_uuid: str, user: Optional[User]) -> "RunProgress":
+    """Progress of a run; a run saved to a project is only visible to the project's owner."""
+    progress = progress_runs.get(run_uuid)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if progress.project_id is not None:
+        if user is None:
+            raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+        result = await db.execute(
+            select(Project.id).where(Project.id == progress.project_id, Project.owner_id == user.id)
+        )
+        owned = result.first() is not None
+        # Don't hold a pooled connection for the length of an event stream
+        await db.rollback()
+        if not owned:
+            raise HTTPException(status_code=404, detail="Run not found")
+    return progress
+
+@app.post("/identify-issues")
+async def identify_issues(
+    background_tasks: BackgroundTasks,
+    project_id: Optional[int] = None,
+    export: Optional[str] = Query(None, pattern="^(parquet|arrow|csv)$"),
+    incremental: bool = False,
+    engine: Optional[str] = Query(None, pattern="^(pandas|polars|sql)$"),
+    scan_id: Optional[str] = None,
+    background: bool = False,
+    current_user: Optional[User] = Depends(get_optional_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Run the configured checks. With ``project_id`` the run is stored in the project's history.
+
+    Every run writes its outputs to its own artifact directory, so concurrent runs never share a file.
+    ``export`` (parquet, arrow or csv) also writes the cleaned data there.
+    ``engine`` (pandas or polars) overrides the configured check engine; ``sql``
+    checks the table connected with /sources/sql where it lives, without an
+    export or incremental validation.
+    ``scan_id`` promotes a /quick-scan to the full run, with the configuration it used.
+    ``incremental`` treats the data as a new batch of the project and validates
+    it against the project's baseline (duplicates, IDs, outliers and categories
+    across batches) instead of re-checking the full history.
+    ``background`` answers 202 right away; follow the run on its events stream
+    and stop it with its cancel URL. The final event carries the usual response.
+    """
+    if scan_id is not None and scan_id not in quick_scans:
+        raise HTTPException(status_code=404, detail="Quick scan not found; run /quick-scan again.")
+    run_config = dict(quick_scans[scan_id] if scan_id is not None else configs or {})
+    if export:
+        run_config["export"] = {**(run_config.get("export") or {}), "format": export}
+    if engine:
+        run_config["engine"] = engine
+    source = None
+    if (run_config.get("engine") or CHECK_ENGINE) == "sql":
+        if sql_source is None:
+            raise HTTPException(status_code=400, detail="No SQL source connected.")
+        if (run_config.get("export") or {}).get("format") or incremental:
+            raise HTTPException(status_code=400, detail="The sql engine neither exports nor validates incrementally; load the table and use another engine.")
+        source, data = sql_source, None
+    else:
+        data = require_data()
+    run_uuid = str(uuid.uuid4())
+
+    run = None
+    if project_id is not None:
+        if current_user is None:
+            raise HTTPException(status_code=401, detail="Sign in to save runs to a project.", headers={"WWW-Authenticate": "Bearer"})
+        await get_owned_project(db, project_id, current_user)
+        # Don't hold a pooled connection while the checks run
+        await db.rollback()
+        run = Run(project_id=project_id, user_id=current_user.id, run_uuid=run_uuid, config=run_config)
+
+    baseline = None
+    if incremental:
+        if run is None:
+            raise HTTPException(status_code=400, detail="Incremental validation needs a project_id.")
+        from .incremental import Baseline
+        baseline = Baseline(project_id)
+        try:
+            baseline.ensure_compatible(run_config)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        run.config = {**run_config, "incremental": True}
+
+    progress = progress_runs.register(run_uuid, project_id)
+
+    def checks():
+        output_dir = artifact_store.run_dir(run_uuid)
+        if baseline is None:
+            return execute_checks(data, run_config, output_dir, run is not None, source=source, progress=progress)
+        # One batch at a time per project, so each batch sees the ones before it
+        with baseline.lock:
+            return execute_checks(data, run_config, output_dir, True, baseline, run_uuid, progress=progress)
+
+    async def complete(db: AsyncSession):
+        try:
+            result = await run_in_threadpool(checks)
+        except RunCancelled:
+            progress.finish("cancelled")
+            raise HTTPException(status_code=409, detail="Run cancelled.")
+        except Exception as e:
+            progress.finish("failed", error=str(e))
+            raise HTTPException(status_code=500, detail=f"Issue detection failed: {str(e)}")
+        try:
+            response = await record_run(db, result, run_uuid, run, current_user)
+        except Exception as e:
+            # Every run ends with an event, so its stream closes and the registry can let it go
+            print(f"Error storing run {run_uuid}: {e}")
+            progress.finish("failed", error=str(e))
+            raise HTTPException(status_code=500, detail=f"Storing the run failed: {str(e)}")
+        progress.finish("finished", response=response)
+        return response, result
+
+    if background:
+        async def run_in_background():
+            async with AsyncSessionLocal() as background_db:
+                try:
+                    _, result = await complete(background_db)
+                except HTTPException:
+                    return
+            await run_in_threadpool(result["write_report"])
+
+        background_tasks.add_task(run_in_background)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={
+            "message": "Issue detection started.",
+            "run_uuid": run_uuid,
+            "events": f"/identify-issues/{run_uuid}/events",
+            "cancel": f"/identify-issues/{run_uuid}/cancel",
+        })
+
+    response, result = await complete(db)
+    # The Excel report is only needed on download; write it after responding
+    background_tasks.add_task(result["write_report"])
+    return response
+
+async def record_run(db: AsyncSession, result: Dict[str, Any], run_uuid: str, run: Optional[Run], current_user: Optional[User]) -> Dict[str, Any]:
+    """The /identify-issues response for a finished run; stores the run when it belongs to a project."""
+    global latest_run_uuid
+    latest_run_uuid = run_uuid
+
+    response = {
+        "message": "Issue detection complete.",
+        "run_uuid": run_uuid,
+        "download": f"/artifacts/{run_uuid}/data_issues.xlsx",
+        "summary_download": f"/artifacts/{run_uuid}/data_issues.json",
+        "total_issues": result["total_issues"],
+        "issue_counts": result["issue_counts"],
+        "step_timings": result["step_timings"],
+        "engine": result["engine"],
+    }
+    if result["pushed_down"] is not None:
+        response["pushed_down"] = result["pushed_down"]
+    if result["stopped_by"]:
+        response["stopped_by"] = result["stopped_by"]
+        response["skipped_steps"] = result["skipped_steps"]
+    if result["export"]:
+        response["export"] = {**result["export"], "download": f"/artifacts/{run_uuid}/{result['export']['name']}"}
+    if run is not None:
+        run.dataset_fingerprint = result["fingerprint"]
+        run.row_count = result["row_count"]
+        run.column_count = result["column_count"]
+        run.step_timings = result["step_timings"]
+        run.issue_counts = result["issue_counts"]
+        run.total_issues = result["total_issues"]
+        run.issues_path = result["issues_path"]
+        db.add(run)
+        await db.commit()
+        log_action(current_user.id, "run_checks", {"run_id": run.id, "total_issues": run.total_issues}, project_id=run.project_id)
+        response["run"] = RunSchema.model_validate(run).model_dump(mode="json")
+    return response
+
+def sse_message(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+@app.get("/identify-issues/{run_uuid}/events")
+async def run_events(
+    run_uuid: str,
+    request: Request,
+    current_user: Optional[User] = Depends(get_optional_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Server-sent events of a run: run_started, step_started, progress, step_finished, then run_finished,
+    run_failed or run_cancelled. Reconnecting clients resume after their ``Last-Event-ID``.
+    Runs saved to a project stream only to the project's owner.
+    """
+    progress = await get_visible_progress(db, run_uuid, current_user)
+    try:
+        last_id = int(request.headers.get("last-event-id", 0))
+    except ValueError:
+        last_id = 0
+
+    async def stream():
+        nonlocal last_id
+        idle = 0.0
+        while True:
+            events = progress.since(last_id)
+            for event in events:
+                yield sse_message(event)
+            if events:
+                last_id, idle = events[-1]["id"], 0.0
+            elif progress.done:
+                return
+            elif idle >= PROGRESS_KEEPALIVE_SECONDS:
+                # Keeps proxies from closing a stream that is quiet during a long step
+                yield ": keepalive\n\n"
+                idle = 0.0
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(PROGRESS_POLL_SECONDS)
+            idle += PROGRESS_POLL_SECONDS
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/identify-issues/{run_uuid}/cancel")
+async def cancel_run(
+    run_uuid: str,
+    current_user: Optional[User] = Depends(get_optional_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stop a run at its next step or chunk; its events end with run_cancelled.
+    Runs saved to a project can only be cancelled by the project's owner.
+    """
+    progress = await get_visible_progress(db, run_uuid, current_user)
+    if progress.done:
+        raise HTTPException(status_code=409, detail=f"Run already {progress.status}.")
+    progress.cancel()
+    return {"message": "Cancelling run.", "run_uuid": run_uuid}
+
+@app.post("/reconcile")
+async def reconcile_schedules(
+    policy_file: UploadFile = File(...),
+    premium_file: UploadFile = File(...),
+    config: Optional[str] = Form(None),
+    partitions: Optional[int] = Query(None, ge=1, le=4096)
+):
+    """Reconcile a premium schedule against a policy schedule.
+
+    Both files are streamed and hash-partitioned on the policy number, so their
+    size is bounded by disk, not memory. ``config`` is a JSON object overriding
+    the column mapping and tolerance. Issues are browsable under ``/issues/{run_uuid}``.
+    """
+    for upload in (policy_file, premium_file):
+        if not upload.filename.endswith(('.csv', '.xlsx', '.parquet')):
+            raise HTTPException(status_code=400, detail="Unsupported file format.")
+    try:
+        overrides = json.loads(config) if config else None
+        if overrides is not None and not isinstance(overrides, dict):
+            raise ValueError("Top-level JSON must be an object.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid config: {str(e)}")
+
+    policy_path = await run_in_threadpool(save_upload, policy_file)
+    premium_path = await run_in_threadpool(save_upload, premium_file)
+    from .reconciliation import reconcile
+    run_uuid = str(uuid.uuid4())
+    options = {"partitions": partitions} if partitions else {}
+    try:
+        result = await run_in_threadpool(
+            reconcile, policy_path, premium_path, artifact_store.run_dir(run_uuid), overrides, **options
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Column not found: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Issue detection failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Reconciliation failed: {str(e)}")
+    finally:
+        for path in (policy_path, premium_path):
+            if os.path.exists(path):
+                os.remove(path)
+    result.pop("issues_path")
+    return {
+        "message": "Reconciliation complete.",
+        "run_uuid": run_uuid,
+        "issues": f"/issues/{run_uuid}",
+        "summary_download": f"/artifacts/{run_uuid}/reconciliation.json",
+        **result,
+    }
+
+@app.get("/projects/{project_id}/baseline")
+async def get_project_baseline(
+    project_id: int,
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Rows, batches and tracked columns of the project's incremental validation state."""
+    from .incremental import Baseline
+    await get_owned_project(db, project_id, current_user)
+    summary = await run_in_threadpool(Baseline(project_id).summary)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Project has no baseline yet")
+    return summary
+
+@app.delete("/projects/{project_id}/baseline")
+async def reset_project_baseline(
+    project_id: int,
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Forget the project's incremental state; the next incremental run starts a new baseline."""
+    from .incremental import Baseline
+    await get_owned_project(db, project_id, current_user)
+    await run_in_threadpool(Baseline(project_id).reset)
+    log_action(current_user.id, "reset_baseline", {}, project_id=project_id)
+    return {"message": "Baseline reset."}
+
+@app.get("/projects/{project_id}/runs", response_model=List[RunSchema])
+async def get_project_runs(
+    project_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Run history of a project, newest first."""
+    await get_owned_project(db, project_id, current_user)
+    result = await db.execute(
+        select(Run).where(Run.project_id == project_id).order_by(Run.created_at.desc(), Run.id.desc()).limit(limit)
+    )
+    return result.scalars().all()
+
+@app.get("/runs/{run_id}", response_model=RunSchema)
+async def get_run(
+    run_id: int,
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await get_owned_run(db, run_id, current_user)
+
+@app.get("/runs/{run_id}/compare/{base_run_id}")
+async def compare_runs(
+    run_id: int,
+    base_run_id: int,
+    sample_size: int = Query(100, ge=0, le=1000),
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Issues that are new in ``run_id``, resolved since ``base_run_id``, or persisting in both."""
+    run = await get_owned_run(db, run_id, current_user)
+    base_run = await get_owned_run(db, base_run_id, current_user)
+    # Detach the runs (keeping their loaded values) and release the connection for the diff
+    db.expunge_all()
+    await db.rollback()
+    for r in (run, base_run):
+        if not r.issues_path or not os.path.exists(r.issues_path):
+            raise HTTPException(status_code=410, detail=f"Issue details for run {r.id} are no longer available")
+    from .runs import compare_issue_files
+    diff = await run_in_threadpool(compare_issue_files, base_run.issues_path, run.issues_path, sample_size)
+    return {
+        "run_id": run.id,
+        "base_run_id": base_run.id,
+        "same_dataset": run.dataset_fingerprint == base_run.dataset_fingerprint,
+        **diff,
+    }
+
+@app.get("/profile")
+async def get_profile(top_k: int = 10):
+    """Profile every column of the uploaded data in a single pass.
+
+    Returns null/empty counts, signs, min/max, moments, quantiles, top values and a
+    suggested type per column so the frontend can propose a configuration.
+    """
+    from .profiler import profile_dataframe
+    return profile_dataframe(require_data()).to_dict(top_k=top_k)
+
+ARTIFACT_MEDIA_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".json": "application/json",
+    ".parquet": "application/vnd.apache.parquet",
+    ".arrow": "application/vnd.apache.arrow.file",
+    ".csv": "text/csv",
+}
+
+def serve_artifact(request: Request, run_uuid: Optional[str], name: str):
+    try:
+        path = artifact_store.path(run_uuid, name)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    media_type = ARTIFACT_MEDIA_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+    return artifact_response(request, path, media_type, name)
+
+@app.get("/artifacts/{run_uuid}")
+async def list_artifacts(run_uuid: str):
+    try:
+        return {"run_uuid": run_uuid, "artifacts": artifact_store.list(run_uuid)}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/artifacts/{run_uuid}/{name}")
+async def download_artifact(run_uuid: str, name: str, request: Request):
+    """Download one output of a run; supports ETag revalidation and byte ranges."""
+    return serve_artifact(request, run_uuid, name)
+
+ISSUE_STREAM_FORMATS = {
+    "ndjson": ("iter_ndjson", "application/x-ndjson"),
+    "arrow": ("iter_arrow_ipc", "application/vnd.apache.arrow.stream"),
+}
+
+def issues_file(run_uuid: str) -> str:
+    try:
+        return artifact_store.path(run_uuid, "issues.parquet")
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+def parse_issue_sort(sort: Optional[str]):
+    """``row_index,-column`` -> [("row_index", "ascending"), ("column", "descending")]."""
+    if not sort:
+        return None
+    from .runs import ISSUE_SORT_COLUMNS
+    keys = []
+    for field in sort.split(","):
+        name = field.strip().lstrip("-")
+        if name not in ISSUE_SORT_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Cannot sort by '{name}'; use one of {list(ISSUE_SORT_COLUMNS)}")
+        keys.append((name, "descending" if field.strip().startswith("-") else "ascending"))
+    return keys
+
+def encode_issue_cursor(kind: str, value: int) -> str:
+    return base64.urlsafe_b64encode(f"{kind}|{value}".encode()).decode()
+
+def decode_issue_cursor(cursor: str, kind: str) -> int:
+    try:
+        cursor_kind, value = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if cursor_kind != kind:
+            raise ValueError(cursor_kind)
+        return int(value)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/issues/{run_uuid}")
+async def browse_issues(
+    run_uuid: str,
+    check: Optional[List[str]] = Query(None),
+    column: Optional[List[str]] = Query(None),
+    row_min: Optional[int] = Query(None, ge=0),
+    row_max: Optional[int] = Query(None, ge=0),
+    sort: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000),
+    cursor: Optional[str] = None,
+    format: str = Query("ndjson", pattern="^(ndjson|arrow)$"),
+):
+    """Page through a run's issues, streamed as NDJSON or Arrow IPC.
+
+    Filters on check, column and row range are pushed down to the Parquet row
+    groups. Pass the X-Next-Cursor response header back as ``cursor`` to get the
+    next page; the header is absent on the last page.
+    """
+    from . import runs
+    path = issues_file(run_uuid)
+    sort_keys = parse_issue_sort(sort)
+    # Keyset (file position) pages in the file's own order, offset pages for other sorts
+    kind = "o" if sort_keys else "p"
+    start = decode_issue_cursor(cursor, kind) if cursor else 0
+    table, next_start = await run_in_threadpool(
+        runs.query_issues, path, runs.issue_filter(check, column, row_min, row_max), sort_keys, limit,
+        start if kind == "p" else 0, start if kind == "o" else 0
+    )
+    serializer, media_type = ISSUE_STREAM_FORMATS[format]
+    serialize = getattr(runs, serializer)
+    headers = {"X-Next-Cursor": encode_issue_cursor(kind, next_start)} if next_start is not None else {}
+    return StreamingResponse(serialize(table), media_type=media_type, headers=headers)
+
+@app.get("/issues/{run_uuid}/facets")
+async def get_issue_facets(run_uuid: str):
+    """Issue count per check and column, for building filters."""
+    from .runs import issue_facets
+    return await run_in_threadpool(issue_facets, issues_file(run_uuid))
 
 @app.get("/download-issues")
-async def download_issues():
-    path = "data_issues.xlsx"
-    if os.path.exists(path):
-        return FileResponse(
-            path,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            filename="data_issues.xlsx"
-        )
-    raise HTTPException(status_code=404, detail="Issues file not found.")
+async def download_issues(request: Request):
+    """Excel report of the most recent run."""
+    if latest_run_uuid is None:
+        raise HTTPException(status_code=404, detail="Issues file not found.")
+    return serve_artifact(request, latest_run_uuid, "data_issues.xlsx")
+
+@app.get("/download-cleaned")
+async def download_cleaned(request: Request):
+    """Cleaned data export of the most recent run, if it wrote one."""
+    if latest_run_uuid is not None:
+        for name in ("cleaned_data.parquet", "cleaned_data.arrow", "cleaned_data.csv"):
+            try:
+                return serve_artifact(request, latest_run_uuid, name)
+            except HTTPException:
+                continue
+    raise HTTPException(status_code=404, detail="Cleaned data not found. Run the checks with an export format.")
 
 @app.get("/download-issues-summary")
-async def download_issues_summary():
-    path = "data_issues.json"
-    if os.path.exists(path):
-        return FileResponse(path, media_type="application/json", filename="data_issues.json")
-    raise HTTPException(status_code=404, detail="Issues summary not found.")
+async def download_issues_summary(request: Request):
+    """JSON summary of the most recent run."""
+    if latest_run_uuid is None:
+        raise HTTPException(status_code=404, detail="Issues summary not found.")
+    return serve_artifact(request, latest_run_uuid, "data_issues.json")
 
 # Configuration endpoints
+@app.post("/quick-scan")
+async def quick_scan_checks(
+    sample_size: Optional[int] = Query(None, ge=100),
+    stratify_by: Optional[List[str]] = Query(None),
+    seed: Optional[int] = None
+):
+    """Estimate how often each configured check fails from a sample of the loaded data.
+
+    ``stratify_by`` columns (e.g. ``line_of_business``) split the sample in
+    proportion to their groups; without them it is uniform. Each check gets
+    an estimated rate with a 95% confidence interval; duplicates come from
+    a hash sample of keys over all rows. ``promote`` runs the full
+    checks with the configuration the scan used.
+    """
+    from .quick_scan import QUICK_SCAN_SAMPLE_ROWS, quick_scan
+    frame = require_data()
+    run_config = dict(configs or {})
+    try:
+        result = await run_in_threadpool(
+            quick_scan, frame, run_config, sample_size or QUICK_SCAN_SAMPLE_ROWS, stratify_by, seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Quick scan failed: {str(e)}")
+    scan_id = uuid.uuid4().hex
+    quick_scans[scan_id] = run_config
+    while len(quick_scans) > QUICK_SCAN_HISTORY:
+        quick_scans.popitem(last=False)
+    return {
+        "message": "Quick scan complete.",
+        "scan_id": scan_id,
+        **result,
+        "promote": f"/identify-issues?scan_id={scan_id}",
+    }
+
+@app.get("/explain")
+async def explain_checks():
+    """Execution plan for the current configuration: the steps that will run, in order,
+    with a rough cost estimate against the loaded data, and the checks skipped and why."""
+    from .planner import compile_plan
+    if data is None:
+        return compile_plan(configs)
+    return compile_plan(configs, columns=list(data.columns), rows=len(data))
+
 @app.get("/config/default")
 async def get_default_config():
     """Get default configuration for data quality checks."""
@@ -259,8 +1094,8 @@ async def configure_checks(check_config: dict):
 
 # Authentication endpoints
 @app.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -269,24 +1104,26 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=token_claims_for(user), expires_delta=access_token_expires
     )
-    # Update last login
+    # Update last login (and any upgraded password hash) on the detached user
     user.last_login = datetime.utcnow()
-    db.commit()
-    log_action(db, user.id, "login", request=None)
+    db.add(user)
+    await db.commit()
+    log_action(user.id, "login", request=None)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/register", response_model=UserSchema)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    if db.query(User).filter(User.username == user.username).first():
+    if (await db.execute(select(User.id).where(User.username == user.username))).first():
         raise HTTPException(status_code=400, detail="Username already registered")
-    if db.query(User).filter(User.email == user.email).first():
+    if (await db.execute(select(User.id).where(User.email == user.email))).first():
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user; release the connection while bcrypt runs on the hashing pool
+    await db.rollback()
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -294,9 +1131,9 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
         full_name=user.full_name
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    log_action(db, db_user.id, "register", {"username": user.username})
+    await db.commit()
+    await db.refresh(db_user)
+    log_action(db_user.id, "register", {"username": user.username})
     return db_user
 
 @app.get("/me", response_model=UserSchema)
@@ -307,8 +1144,8 @@ async def read_users_me(current_user: User = Depends(get_current_active_user)):
 @app.post("/projects", response_model=ProjectSchema)
 async def create_project(
     project: ProjectCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     db_project = Project(
         name=project.name,
@@ -317,26 +1154,27 @@ async def create_project(
         owner_id=current_user.id
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
-    log_action(db, current_user.id, "create_project", {"project_id": db_project.id, "project_name": project.name})
+    await db.commit()
+    await db.refresh(db_project)
+    log_action(current_user.id, "create_project", {"project_id": db_project.id, "project_name": project.name})
     return db_project
 
 @app.get("/projects", response_model=List[ProjectSchema])
 async def get_projects(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    projects = db.query(Project).filter(Project.owner_id == current_user.id).all()
-    return projects
+    result = await db.execute(select(Project).where(Project.owner_id == current_user.id))
+    return result.scalars().all()
 
 @app.get("/projects/{project_id}", response_model=ProjectSchema)
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.owner_id == current_user.id))
+    project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -345,10 +1183,11 @@ async def get_project(
 async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_active_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    project = db.query(Project).filter(Project.id == project_id, Project.owner_id == current_user.id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.owner_id == current_user.id))
+    project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -356,43 +1195,102 @@ async def update_project(
     for field, value in update_data.items():
         setattr(project, field, value)
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
-    log_action(db, current_user.id, "update_project", {"project_id": project_id, "changes": update_data})
+    await db.commit()
+    await db.refresh(project)
+    log_action(current_user.id, "update_project", {"project_id": project_id, "changes": update_data})
     return project
 
 # Admin endpoints
 @app.get("/admin/users", response_model=List[UserSchema])
 async def get_all_users(
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(select(User))
+    return result.scalars().all()
+
+@app.put("/admin/users/{user_id}", response_model=UserSchema)
+async def update_user(
+    user_id: int,
+    user_update: UserUpdate,
+    current_user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    users = db.query(User).all()
-    return users
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    update_data = user_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(user, field, value)
+    # Committing fires the User update hook, which drops cached auth state for this user
+    await db.commit()
+    await db.refresh(user)
+    log_action(current_user.id, "update_user", {"user_id": user_id, "changes": update_data})
+    return user
+
+def encode_log_cursor(log: Log) -> str:
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_log_cursor(cursor: str):
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(log_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @app.get("/admin/logs", response_model=List[LogSchema])
 async def get_logs(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    action: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    logs = db.query(Log).offset(skip).limit(limit).order_by(Log.created_at.desc()).all()
+    """Newest logs first, paginated by (created_at, id) keyset.
+
+    Pass the X-Next-Cursor response header back as ``cursor`` to get the next page;
+    the header is absent on the last page.
+    """
+    # Users are fetched in one extra query for the whole page, not per row
+    query = select(Log).options(selectinload(Log.user))
+    if user_id is not None:
+        query = query.where(Log.user_id == user_id)
+    if project_id is not None:
+        query = query.where(Log.project_id == project_id)
+    if action is not None:
+        query = query.where(Log.action == action)
+    if cursor:
+        created_at, log_id = decode_log_cursor(cursor)
+        query = query.where(tuple_(Log.created_at, Log.id) < tuple_(created_at, log_id))
+    result = await db.execute(query.order_by(Log.created_at.desc(), Log.id.desc()).limit(limit + 1))
+    logs = result.scalars().all()
+    if len(logs) > limit:
+        logs = logs[:limit]
+        response.headers["X-Next-Cursor"] = encode_log_cursor(logs[-1])
     return logs
 
+@app.get("/admin/metrics")
+async def get_admin_metrics(current_user: User = Depends(get_admin_user)):
+    """Runtime metrics of in-process pools and caches."""
+    return {
+        "password_hashing": hashing_pool.stats(),
+        "audit_log": audit_writer.stats(),
+        "auth_cache": {
+            "token_entries": len(token_cache),
+            "user_entries": len(user_cache),
+            "user_hits": user_cache.hits,
+            "user_misses": user_cache.misses,
+        },
+    }
+
 @app.get("/admin/stats")
 async def get_admin_stats(
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    total_projects = db.query(Project).count()
-    total_logs = db.query(Log).count()
-    
-    return {
-        "total_users": total_users,
-        "active_users": active_users,
-        "total_projects": total_projects,
-        "total_logs": total_logs
-    }
+    # Counters are maintained on write (see stats.py) instead of counting full tables
+    return await db.run_sync(read_counters)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -18,10 +18,12 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime)
+    # Embedded token claims issued before this (is_active, is_admin or username changed) are not trusted
+    claims_revoked_at = Column(DateTime)
     
-    # Relationships
-    projects = relationship("Project", back_populates="owner")
-    logs = relationship("Log", back_populates="user")
+    # Relationships; never lazy-loaded, so list endpoints must choose a loader strategy (no N+1)
+    projects = relationship("Project", back_populates="owner", lazy="raise_on_sql")
+    logs = relationship("Log", back_populates="user", lazy="raise_on_sql")
 
 class Project(Base):
     __tablename__ = "projects"
@@ -37,11 +39,19 @@ class Project(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    owner = relationship("User", back_populates="projects")
-    logs = relationship("Log", back_populates="project")
+    owner = relationship("User", back_populates="projects", lazy="raise_on_sql")
+    logs = relationship("Log", back_populates="project", lazy="raise_on_sql")
+    runs = relationship("Run", back_populates="project", lazy="raise_on_sql")
 
 class Log(Base):
     __tablename__ = "logs"
+    # Composite indexes back keyset pagination on (created_at, id), optionally filtered
+    __table_args__ = (
+        Index("ix_logs_created_at_id", "created_at", "id"),
+        Index("ix_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_logs_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_logs_action_created_at_id", "action", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -53,5 +63,35 @@ class Log(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="logs")
-    project = relationship("Project", back_populates="logs")
+    user = relationship("User", back_populates="logs", lazy="raise_on_sql")
+    project = relationship("Project", back_populates="logs", lazy="raise_on_sql")
+
+class Run(Base):
+    __tablename__ = "runs"
+    __table_args__ = (
+        Index("ix_runs_project_id_created_at", "project_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    run_uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    dataset_fingerprint = Column(String(64), index=True)
+    row_count = Column(Integer)
+    column_count = Column(Integer)
+    config = Column(JSON)  # Effective check configuration
+    step_timings = Column(JSON)  # Seconds per pipeline step
+    issue_counts = Column(JSON)  # Issues per check
+    total_issues = Column(Integer, default=0)
+    issues_path = Column(String(255))  # Parquet file with the normalized issues
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    project = relationship("Project", back_populates="runs", lazy="raise_on_sql")
+
+class StatCounter(Base):
+    __tablename__ = "stat_counters"
+    
+    # Incrementally maintained totals for the admin dashboard (see stats.py)
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -1,41 +1,126 @@
-from sklearn.pipeline import Pipeline
 from .custom_transformers import (
     ImportDataTransformer,
     ColumnNameCleaner,
     MandatoryColumnsChecker,
     WhitespaceCaseCleaner,
     RemoveUnwantedCharacters,
+    TextCleaner,
     NumericConverter,
     DateConverter,
+    ColumnProfiler,
     MissingValuesDetector,
     IDValidator,
     NegativeZeroChecker,
     DuplicatesFromtheData,
     DuplicateIdentifier,
+    FuzzyDuplicateDetector,
     YearFilter,
     StartEndYearComparator,
+    CoveragePeriodChecker,
     ConstantValueDetector,
     OutlierDetector,
     CrossFieldLogicChecker,
     CategoryValidator,
     UniqueIDGenerator,
     ColumnFilter,
-    IssueSaver
+    IssueSaver,
+    FinalSaver
 )
+from .profiler import DataProfile
+from .planner import compile_plan
+from .progress import tracking
+import os
+import time
 
 
-def create_issue_pipeline(configs=None):
+class Pipeline:
+    """Named steps run one after another, each ``fit_transform`` feeding the next.
+
+    Keeps the parts of the scikit-learn Pipeline this app relies on
+    (``steps``, ``named_steps``, ``fit_transform``, ``step__param`` in
+    ``set_params``) without importing scikit-learn.
+
+    ``fatal_steps`` names the steps whose findings stop ``run_pipeline``.
+    """
+    def __init__(self, steps, fatal_steps=()):
+        names = [name for name, _ in steps]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Step names must be unique: {duplicates}")
+        self.steps = list(steps)
+        self.fatal_steps = list(fatal_steps)
+
+    @property
+    def named_steps(self):
+        return dict(self.steps)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.named_steps[key]
+        if isinstance(key, slice):
+            return Pipeline(self.steps[key], [name for name, _ in self.steps[key] if name in self.fatal_steps])
+        return self.steps[key][1]
+
+    def fit(self, X, y=None):
+        self.fit_transform(X, y)
+        return self
+
+    def transform(self, X):
+        for _, step in self.steps:
+            X = step.transform(X)
+        return X
+
+    def fit_transform(self, X, y=None):
+        for _, step in self.steps:
+            X = step.fit_transform(X, y)
+        return X
+
+    def get_params(self, deep=True):
+        params = {'steps': self.steps}
+        if deep:
+            for name, step in self.steps:
+                params[name] = step
+                params.update({f"{name}__{key}": value for key, value in step.get_params().items()})
+        return params
+
+    def set_params(self, **params):
+        named_steps = self.named_steps
+        for key, value in params.items():
+            name, _, param = key.partition('__')
+            if name not in named_steps:
+                raise ValueError(f"Invalid step '{name}'; use one of {list(named_steps)}")
+            if param:
+                named_steps[name].set_params(**{param: value})
+            else:
+                self.steps = [(step_name, value if step_name == name else step) for step_name, step in self.steps]
+                named_steps = self.named_steps
+        return self
+
+
+def create_issue_pipeline(configs=None, output_dir=None, plan=None):
     """
     Create a comprehensive data quality checking pipeline.
     
+    Only the steps of the execution plan (see ``planner.compile_plan``) are
+    built: checks without configuration are left out and the text hygiene
+    steps run as one pass.
+    
     Args:
         configs: Dictionary containing configuration for various checks
+        output_dir: Directory for the issue reports and the cleaned data export
+            (current directory when None)
+        plan: Plan compiled from ``configs``, compiled here when None
         
     Returns:
-        sklearn Pipeline object
+        Pipeline object
     """
     if configs is None:
         configs = {}
+    if plan is None:
+        plan = compile_plan(configs)
     
     # Extract configuration values with defaults
     mandatory_columns = configs.get('mandatory_columns', [])
@@ -44,8 +129,10 @@ def create_issue_pipeline(configs=None):
     date_columns = configs.get('date_columns', [])
     id_column = configs.get('id_column', '')
     duplicate_key_columns = configs.get('duplicate_key_columns', [])
+    fuzzy_config = configs.get('fuzzy_duplicates', {}) or {}
     year_filter_config = configs.get('year_filter', {})
     start_end_year_config = configs.get('start_end_year', {})
+    coverage_config = configs.get('coverage_periods', {}) or {}
     outlier_config = configs.get('outlier_detection', {})
     cross_field_rules = configs.get('cross_field_rules', [])
     category_validation = configs.get('category_validation', {})
@@ -53,90 +140,194 @@ def create_issue_pipeline(configs=None):
     columns_to_keep = configs.get('columns_to_keep', [])
     unwanted_chars = configs.get('unwanted_characters', ['\n', '\r', '\t'])
     case_standardization = configs.get('case_standardization', 'upper')
+    outlier_columns = outlier_config.get('columns', numeric_columns)
+    export_config = configs.get('export', {}) or {}
+    planned_columns = {step['name']: step['columns'] for step in plan['steps']}
+    
+    # One profile shared by the checks below so each column is scanned once
+    profile = DataProfile()
     
-    # Build the pipeline
-    pipeline_steps = [
+    builders = {
         # 1. Import Data (handled separately in upload endpoint)
         # 2. Column hygiene
-        ('column_name_cleaner', ColumnNameCleaner()),
+        'column_name_cleaner': lambda: ColumnNameCleaner(),
         
         # 3. Structure check
-        ('mandatory_columns_checker', MandatoryColumnsChecker(
+        'mandatory_columns_checker': lambda: MandatoryColumnsChecker(
             mandatory_columns=mandatory_columns
-        )),
+        ),
         
         # 4. Cell hygiene
-        ('whitespace_case_cleaner', WhitespaceCaseCleaner(
+        'text_cleaner': lambda: TextCleaner(
+            columns=text_columns,
+            case=case_standardization,
+            unwanted_chars=unwanted_chars
+        ),
+        'whitespace_case_cleaner': lambda: WhitespaceCaseCleaner(
             columns=text_columns,
             case=case_standardization
-        )),
-        ('remove_unwanted_chars', RemoveUnwantedCharacters(
+        ),
+        'remove_unwanted_chars': lambda: RemoveUnwantedCharacters(
             columns=text_columns,
             unwanted_chars=unwanted_chars
-        )),
+        ),
         
         # 5. Type coercions
-        ('numeric_converter', NumericConverter(
+        'numeric_converter': lambda: NumericConverter(
             columns=numeric_columns
-        )),
-        ('date_converter', DateConverter(
+        ),
+        'date_converter': lambda: DateConverter(
             columns=date_columns
-        )),
+        ),
+        'column_profiler': lambda: ColumnProfiler(
+            profile=profile,
+            columns=planned_columns['column_profiler'],
+            chunk_size=configs.get('profile_chunk_size', 500_000),
+            include_numeric=False
+        ),
         
         # 6. Row integrity
-        ('missing_values_detector', MissingValuesDetector(
-            columns=text_columns + numeric_columns + date_columns
-        )),
-        ('duplicates_from_data', DuplicatesFromtheData()),
-        ('duplicate_identifier', DuplicateIdentifier(
+        'missing_values_detector': lambda: MissingValuesDetector(
+            columns=text_columns + numeric_columns + date_columns,
+            profile=profile
+        ),
+        'duplicates_from_data': lambda: DuplicatesFromtheData(),
+        'duplicate_identifier': lambda: DuplicateIdentifier(
             columns=duplicate_key_columns
-        )),
-        ('id_validator', IDValidator(
-            id_column=id_column
-        )),
+        ),
+        'fuzzy_duplicate_detector': lambda: FuzzyDuplicateDetector(
+            columns=fuzzy_config.get('columns', []),
+            threshold=fuzzy_config.get('threshold', 0.85),
+            block_columns=fuzzy_config.get('block_columns', []),
+            match_digits=fuzzy_config.get('match_digits', True),
+            num_perm=fuzzy_config.get('num_perm', 64),
+            bands=fuzzy_config.get('bands', 16)
+        ),
+        'id_validator': lambda: IDValidator(
+            id_column=id_column,
+            profile=profile
+        ),
         
         # 7. Range & logic
-        ('negative_zero_checker', NegativeZeroChecker(
-            columns=numeric_columns
-        )),
-        ('year_filter', YearFilter(
+        'negative_zero_checker': lambda: NegativeZeroChecker(
+            columns=numeric_columns,
+            profile=profile
+        ),
+        'year_filter': lambda: YearFilter(
             date_column=year_filter_config.get('date_column', ''),
             start_year=year_filter_config.get('start_year'),
-            end_year=year_filter_config.get('end_year')
-        )),
-        ('start_end_year_comparator', StartEndYearComparator(
+            end_year=year_filter_config.get('end_year'),
+            profile=profile
+        ),
+        'start_end_year_comparator': lambda: StartEndYearComparator(
             start_year_column=start_end_year_config.get('start_year_column', ''),
             end_year_column=start_end_year_config.get('end_year_column', '')
-        )),
-        ('constant_value_detector', ConstantValueDetector(
-            threshold=configs.get('constant_value_threshold', 0.95)
-        )),
-        ('outlier_detector', OutlierDetector(
-            columns=outlier_config.get('columns', numeric_columns),
+        ),
+        'coverage_period_checker': lambda: CoveragePeriodChecker(
+            key_column=coverage_config.get('key_column', ''),
+            start_column=coverage_config.get('start_column', ''),
+            end_column=coverage_config.get('end_column', ''),
+            max_gap_days=coverage_config.get('max_gap_days', 0),
+            dayfirst=coverage_config.get('dayfirst', False),
+            spill_rows=coverage_config.get('spill_rows', 5_000_000)
+        ),
+        'constant_value_detector': lambda: ConstantValueDetector(
+            threshold=configs.get('constant_value_threshold', 0.95),
+            profile=profile,
+            columns=planned_columns['constant_value_detector']
+        ),
+        'outlier_detector': lambda: OutlierDetector(
+            columns=outlier_columns,
             method=outlier_config.get('method', 'iqr'),
-            threshold=outlier_config.get('threshold', 1.5)
-        )),
-        ('cross_field_logic_checker', CrossFieldLogicChecker(
+            threshold=outlier_config.get('threshold', 1.5),
+            profile=profile,
+            group_by=outlier_config.get('group_by', []),
+            min_group_size=outlier_config.get('min_group_size', 10)
+        ),
+        'cross_field_logic_checker': lambda: CrossFieldLogicChecker(
             rules=cross_field_rules
-        )),
-        ('category_validator', CategoryValidator(
+        ),
+        'category_validator': lambda: CategoryValidator(
             column_expected_values=category_validation
-        )),
+        ),
         
         # 8. Data transformation
-        ('unique_id_generator', UniqueIDGenerator(
+        'unique_id_generator': lambda: UniqueIDGenerator(
             id_column=unique_id_config.get('id_column', ''),
             columns_to_concat=unique_id_config.get('columns_to_concat', [])
-        )),
-        ('column_filter', ColumnFilter(
+        ),
+        'column_filter': lambda: ColumnFilter(
             columns_to_keep=columns_to_keep
-        )),
+        ),
         
         # 9. Bookkeeping
-        ('issue_saver', IssueSaver())
-    ]
+        'issue_saver': lambda: IssueSaver(
+            output_excel=os.path.join(output_dir or '', 'data_issues.xlsx'),
+            output_json=os.path.join(output_dir or '', 'data_issues.json')
+        ),
+        
+        # 10. Export of the cleaned data, when a format is configured
+        'final_saver': lambda: FinalSaver(
+            output_file=os.path.join(output_dir or '', f"cleaned_data.{export_config.get('format')}"),
+            file_format=export_config.get('format'),
+            compression=export_config.get('compression', 'zstd'),
+            row_group_size=export_config.get('row_group_size', 1 << 20)
+        ),
+    }
     
-    return Pipeline(pipeline_steps)
+    pipeline_steps = [(step['name'], builders[step['name']]()) for step in plan['steps']]
+    return Pipeline(pipeline_steps, fatal_steps=plan['fatal_steps'])
+
+
+def run_pipeline(pipeline, X, progress=None):
+    """Run each step of ``pipeline`` on ``X``, timing it and collecting its ``errors``.
+
+    Equivalent to ``pipeline.fit_transform(X)``, but keeps what each check found.
+    A fused step reports under the names of the steps it replaces
+    (``errors_by_step``). When one of the pipeline's ``fatal_steps`` finds
+    issues the run stops there, except for the bookkeeping ``issue_saver``.
+    A ``progress.RunProgress`` receives step and chunk events, and stops the
+    run with ``RunCancelled`` once cancelled. The profiles the steps share are
+    reset first, so a check never reads the profile of an earlier run.
+
+    Returns:
+        Dictionary with the transformed ``output``, ``errors`` and ``timings``
+        (seconds) keyed by step name, ``data_columns``: every column name the
+        data had along the way, ``stopped_by``: the fatal step that stopped
+        the run (None if it ran through) and the ``skipped`` step names.
+    """
+    errors = {}
+    timings = {}
+    data_columns = set(X.columns)
+    stopped_by = None
+    skipped = []
+    for profile in {id(profile): profile for profile in
+                    (getattr(step, 'profile', None) for _, step in pipeline.steps) if profile is not None}.values():
+        profile.reset()
+    with tracking(progress):
+        for name, step in pipeline.steps:
+            if stopped_by is not None and name != 'issue_saver':
+                skipped.append(name)
+                continue
+            if progress is not None:
+                progress.step_started(name)
+            start = time.perf_counter()
+            X = step.fit_transform(X)
+            timings[name] = time.perf_counter() - start
+            data_columns.update(X.columns)
+            step_errors = getattr(step, 'errors_by_step', None)
+            if step_errors is None:
+                step_errors = {name: getattr(step, 'errors', None)}
+            for step_name, frame in step_errors.items():
+                if frame is not None and not frame.empty:
+                    errors[step_name] = frame
+                    if name in pipeline.fatal_steps:
+                        stopped_by = name
+            if progress is not None:
+                progress.step_finished(name, timings[name], step_errors)
+
+    return {'output': X, 'errors': errors, 'timings': timings, 'data_columns': data_columns,
+            'stopped_by': stopped_by, 'skipped': skipped}
 
 
 def get_default_config():
@@ -153,6 +344,14 @@ def get_default_config():
         'date_columns': [],
         'id_column': '',
         'duplicate_key_columns': [],
+        'fuzzy_duplicates': {
+            'columns': [],
+            'threshold': 0.85,
+            'block_columns': [],
+            'match_digits': True,
+            'num_perm': 64,
+            'bands': 16
+        },
         'year_filter': {
             'date_column': '',
             'start_year': None,
@@ -162,10 +361,20 @@ def get_default_config():
             'start_year_column': '',
             'end_year_column': ''
         },
+        'coverage_periods': {
+            'key_column': '',
+            'start_column': '',
+            'end_column': '',
+            'max_gap_days': 0,
+            'dayfirst': False,
+            'spill_rows': 5_000_000
+        },
         'outlier_detection': {
             'columns': [],
             'method': 'iqr',
-            'threshold': 1.5
+            'threshold': 1.5,
+            'group_by': [],
+            'min_group_size': 10
         },
         'cross_field_rules': [],
         'category_validation': {},
@@ -176,7 +385,15 @@ def get_default_config():
         'columns_to_keep': [],
         'unwanted_characters': ['\n', '\r', '\t'],
         'case_standardization': 'upper',
-        'constant_value_threshold': 0.95
+        'constant_value_threshold': 0.95,
+        'constant_value_columns': [],
+        'fail_fast': True,
+        'engine': '',
+        'export': {
+            'format': '',
+            'compression': 'zstd',
+            'row_group_size': 1 << 20
+        }
     }
 
 
@@ -190,8 +407,8 @@ def get_available_checks():
     return [
         {
             'name': 'MandatoryColumnsChecker',
-            'description': 'Detects missing required columns',
-            'config_fields': ['mandatory_columns']
+            'description': 'Detects missing required columns (stops the run when fail_fast is on)',
+            'config_fields': ['mandatory_columns', 'fail_fast']
         },
         {
             'name': 'WhitespaceCaseCleaner',
@@ -233,6 +450,11 @@ def get_available_checks():
             'description': 'Flags duplicate rows by key columns',
             'config_fields': ['duplicate_key_columns']
         },
+        {
+            'name': 'FuzzyDuplicateDetector',
+            'description': 'Clusters near-duplicate names or IDs (MinHash/LSH candidates, edit-distance similarity)',
+            'config_fields': ['fuzzy_duplicates']
+        },
         {
             'name': 'DateConverter',
             'description': 'Coerces columns to datetime and logs errors',
@@ -243,6 +465,11 @@ def get_available_checks():
             'description': 'Checks logical order of start/end year columns',
             'config_fields': ['start_end_year']
         },
+        {
+            'name': 'CoveragePeriodChecker',
+            'description': 'Finds overlapping, gapped and duplicate periods per key',
+            'config_fields': ['coverage_periods']
+        },
         {
             'name': 'YearFilter',
             'description': 'Flags years outside a valid range',
@@ -250,12 +477,12 @@ def get_available_checks():
         },
         {
             'name': 'ConstantValueDetector',
-            'description': 'Detects columns dominated by a single value',
-            'config_fields': ['constant_value_threshold']
+            'description': 'Detects numeric columns dominated by a single value',
+            'config_fields': ['constant_value_threshold', 'constant_value_columns']
         },
         {
             'name': 'OutlierDetector',
-            'description': 'Finds statistical outliers (IQR or Z-score)',
+            'description': 'Finds statistical outliers (IQR, Z-score or median/MAD), globally or per segment',
             'config_fields': ['outlier_detection']
         },
         {
@@ -277,5 +504,10 @@ def get_available_checks():
             'name': 'ColumnFilter',
             'description': 'Keeps only selected columns',
             'config_fields': ['columns_to_keep']
+        },
+        {
+            'name': 'FinalSaver',
+            'description': 'Exports the cleaned data as Parquet, Arrow IPC or CSV',
+            'config_fields': ['export']
         }
     ]
\ No newline at end of file
@@ -0,0 +1,210 @@
+from .custom_transformers import clean_column_name
+
+# Execution order of the phases; steps keep their listed order within a phase
+PHASES = ('structure', 'hygiene', 'types', 'profile', 'integrity', 'range', 'transform', 'bookkeeping', 'export')
+
+# Rough single-core cost of one cell (row x column) per kind of work, in nanoseconds.
+# Only meant to rank steps and give an order of magnitude in /explain.
+CELL_COST_NS = {
+    'metadata': 0,
+    'mask': 2,
+    'lookup': 5,
+    'eval': 10,
+    'profile': 25,
+    'hash': 40,
+    'numeric': 60,
+    'write': 60,
+    'sort': 120,
+    'text': 250,
+    'date': 400,
+    'fuzzy': 20_000,
+}
+
+ALL_COLUMNS = '*'
+
+
+def _unique(columns):
+    return list(dict.fromkeys(col for col in columns if col))
+
+
+def _step(name, check, phase, kind, columns, reason=None, profiled=False, fatal=False):
+    """One candidate step; inactive (skipped) when ``reason`` says why."""
+    return {
+        'name': name,
+        'check': check,
+        'phase': phase,
+        'kind': kind,
+        'columns': columns if columns == ALL_COLUMNS else _unique(columns),
+        'reason': reason,
+        'profiled': profiled,
+        'fatal': fatal,
+    }
+
+
+def _candidate_steps(configs):
+    """Every step the pipeline knows, in pipeline order, with the columns the config gives it."""
+    mandatory_columns = configs.get('mandatory_columns', []) or []
+    text_columns = configs.get('text_columns', []) or []
+    numeric_columns = configs.get('numeric_columns', []) or []
+    date_columns = configs.get('date_columns', []) or []
+    id_column = configs.get('id_column', '') or ''
+    duplicate_key_columns = configs.get('duplicate_key_columns', []) or []
+    fuzzy_config = configs.get('fuzzy_duplicates', {}) or {}
+    year_filter_config = configs.get('year_filter', {}) or {}
+    start_end_year_config = configs.get('start_end_year', {}) or {}
+    coverage_config = configs.get('coverage_periods', {}) or {}
+    outlier_config = configs.get('outlier_detection', {}) or {}
+    cross_field_rules = configs.get('cross_field_rules', []) or []
+    category_validation = configs.get('category_validation', {}) or {}
+    unique_id_config = configs.get('unique_id_generation', {}) or {}
+    columns_to_keep = configs.get('columns_to_keep', []) or []
+    constant_threshold = configs.get('constant_value_threshold', 0.95)
+    constant_columns = configs.get('constant_value_columns') or numeric_columns
+    outlier_columns = outlier_config.get('columns', numeric_columns) or []
+    export_format = (configs.get('export', {}) or {}).get('format')
+
+    def needs(value, fields):
+        return None if value else f"no {fields} configured"
+
+    year_column = year_filter_config.get('date_column', '')
+    year_bounds = year_filter_config.get('start_year') is not None or year_filter_config.get('end_year') is not None
+    start_end_columns = [start_end_year_config.get('start_year_column', ''), start_end_year_config.get('end_year_column', '')]
+    coverage_columns = [coverage_config.get(key, '') for key in ('key_column', 'start_column', 'end_column')]
+    unique_id_columns = unique_id_config.get('columns_to_concat', []) or []
+    missing_columns = text_columns + numeric_columns + date_columns
+
+    return [
+        _step('column_name_cleaner', 'ColumnNameCleaner', 'structure', 'metadata', ALL_COLUMNS),
+        _step('mandatory_columns_checker', 'MandatoryColumnsChecker', 'structure', 'metadata', mandatory_columns,
+              needs(mandatory_columns, 'mandatory_columns'), fatal=True),
+        _step('whitespace_case_cleaner', 'WhitespaceCaseCleaner', 'hygiene', 'text', text_columns,
+              needs(text_columns, 'text_columns')),
+        _step('remove_unwanted_chars', 'RemoveUnwantedCharacters', 'hygiene', 'text', text_columns,
+              needs(text_columns, 'text_columns')),
+        _step('numeric_converter', 'NumericConverter', 'types', 'numeric', numeric_columns,
+              needs(numeric_columns, 'numeric_columns')),
+        _step('date_converter', 'DateConverter', 'types', 'date', date_columns,
+              needs(date_columns, 'date_columns')),
+        _step('column_profiler', 'ColumnProfiler', 'profile', 'profile', []),
+        _step('missing_values_detector', 'MissingValuesDetector', 'integrity', 'mask', missing_columns,
+              needs(missing_columns, 'text_columns, numeric_columns or date_columns'), profiled=True),
+        _step('duplicates_from_data', 'DuplicatesFromtheData', 'integrity', 'hash', ALL_COLUMNS),
+        _step('duplicate_identifier', 'DuplicateIdentifier', 'integrity', 'hash', duplicate_key_columns,
+              needs(duplicate_key_columns, 'duplicate_key_columns')),
+        _step('fuzzy_duplicate_detector', 'FuzzyDuplicateDetector', 'integrity', 'fuzzy',
+              fuzzy_config.get('columns', []) or [], needs(fuzzy_config.get('columns'), 'fuzzy_duplicates.columns')),
+        _step('id_validator', 'IDValidator', 'integrity', 'hash', [id_column], needs(id_column, 'id_column'),
+              profiled=True),
+        _step('negative_zero_checker', 'NegativeZeroChecker', 'range', 'lookup', numeric_columns,
+              needs(numeric_columns, 'numeric_columns'), profiled=True),
+        _step('year_filter', 'YearFilter', 'range', 'lookup', [year_column],
+              needs(year_column and year_bounds, 'year_filter.date_column with a start_year or end_year'), profiled=True),
+        _step('start_end_year_comparator', 'StartEndYearComparator', 'range', 'mask', start_end_columns,
+              needs(all(start_end_columns), 'start_end_year columns')),
+        _step('coverage_period_checker', 'CoveragePeriodChecker', 'range', 'sort', coverage_columns,
+              needs(all(coverage_columns), 'coverage_periods key, start and end columns')),
+        _step('constant_value_detector', 'ConstantValueDetector', 'range', 'lookup', constant_columns,
+              needs(constant_threshold and constant_columns, 'constant_value_threshold with numeric columns'),
+              profiled=True),
+        _step('outlier_detector', 'OutlierDetector', 'range',
+              'sort' if outlier_config.get('group_by') else 'lookup',
+              outlier_columns + (outlier_config.get('group_by', []) or []),
+              needs(outlier_columns, 'outlier_detection.columns or numeric_columns'), profiled=True),
+        _step('cross_field_logic_checker', 'CrossFieldLogicChecker', 'range', 'eval', ALL_COLUMNS,
+              needs(cross_field_rules, 'cross_field_rules')),
+        _step('category_validator', 'CategoryValidator', 'range', 'hash', list(category_validation),
+              needs(category_validation, 'category_validation')),
+        _step('unique_id_generator', 'UniqueIDGenerator', 'transform', 'text', unique_id_columns,
+              needs(unique_id_config.get('id_column') and unique_id_columns, 'unique_id_generation')),
+        _step('column_filter', 'ColumnFilter', 'transform', 'metadata', columns_to_keep,
+              needs(columns_to_keep, 'columns_to_keep')),
+        _step('issue_saver', 'IssueSaver', 'bookkeeping', 'metadata', []),
+        _step('final_saver', 'FinalSaver', 'export', 'write', ALL_COLUMNS, needs(export_format, 'export.format')),
+    ]
+
+
+def _merge_text_steps(steps):
+    """Fuse the two text hygiene steps into one ``text_cleaner`` pass when both run on the same columns."""
+    by_name = {step['name']: step for step in steps}
+    case_step, char_step = by_name['whitespace_case_cleaner'], by_name['remove_unwanted_chars']
+    if case_step['reason'] or char_step['reason'] or case_step['columns'] != char_step['columns']:
+        return steps
+    fused = {**case_step, 'name': 'text_cleaner', 'check': 'TextCleaner',
+             'merges': [case_step['name'], char_step['name']]}
+    return [fused if step is case_step else step for step in steps if step is not char_step]
+
+
+def _estimate_seconds(step, rows, column_count):
+    if rows is None:
+        return None
+    if step['name'] == 'column_profiler':
+        width = len(step['columns'])
+    elif step['columns'] == ALL_COLUMNS:
+        width = column_count or 0
+    else:
+        width = len(step['columns'])
+    if step['check'] == 'TextCleaner':
+        width *= 2
+    return round(rows * width * CELL_COST_NS[step['kind']] / 1e9, 6)
+
+
+def compile_plan(configs=None, columns=None, rows=None):
+    """Turn a check config into the list of steps that will actually run.
+
+    Steps without the configuration they need are dropped (and listed in
+    ``skipped`` with the reason), the whitespace/case and unwanted character
+    steps become one ``text_cleaner`` pass, the column profiler only profiles
+    the columns its active consumers read (and is dropped without any), and
+    the structural checks run first. With ``fail_fast`` (the default) a step
+    marked ``fatal`` that finds issues, i.e. missing mandatory columns, stops
+    the run; ``run_pipeline`` then skips everything after it.
+
+    With the data's ``columns`` and ``rows`` each step gets a rough
+    ``estimated_seconds`` and the configured columns the data lacks (after
+    column name cleaning) are reported as ``missing_columns``.
+    """
+    configs = configs or {}
+    candidates = _merge_text_steps(_candidate_steps(configs))
+    active = [step for step in candidates if step['reason'] is None]
+
+    profiler = next(step for step in active if step['name'] == 'column_profiler')
+    consumers = [step for step in active if step['profiled']]
+    if consumers:
+        profiler['columns'] = _unique(col for step in consumers for col in step['columns'])
+        profiler['consumers'] = [step['name'] for step in consumers]
+    else:
+        profiler['reason'] = 'no active check reads the column profile'
+        active.remove(profiler)
+    active.sort(key=lambda step: PHASES.index(step['phase']))
+
+    data_columns = None
+    if columns is not None:
+        data_columns = set(clean_column_name(col) for col in columns)
+        generated = (configs.get('unique_id_generation', {}) or {}).get('id_column')
+        if generated and any(step['name'] == 'unique_id_generator' for step in active):
+            data_columns.add(generated)
+    column_count = len(columns) if columns is not None else None
+
+    steps = []
+    for step in active:
+        planned = {key: value for key, value in step.items() if key not in ('reason', 'profiled')}
+        planned['estimated_seconds'] = _estimate_seconds(step, rows, column_count)
+        if data_columns is not None and step['columns'] != ALL_COLUMNS:
+            planned['missing_columns'] = [col for col in step['columns'] if col not in data_columns]
+        steps.append(planned)
+
+    fail_fast = bool(configs.get('fail_fast', True))
+    fatal_steps = [step['name'] for step in steps if step['fatal']] if fail_fast else []
+    stops_at = next((step['name'] for step in steps if step['name'] in fatal_steps and step.get('missing_columns')), None)
+    estimates = [step['estimated_seconds'] for step in steps if step['estimated_seconds'] is not None]
+    return {
+        'steps': steps,
+        'skipped': [{'name': step['name'], 'check': step['check'], 'reason': step['reason']}
+                    for step in candidates if step['reason'] is not None],
+        'fail_fast': fail_fast,
+        'fatal_steps': fatal_steps,
+        'expected_stop': stops_at,
+        'rows': rows,
+        'columns': column_count,
+        'estimated_seconds': round(sum(estimates), 6) if rows is not None else None,
+    }
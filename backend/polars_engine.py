@@ -0,0 +1,610 @@
+import _strptime
+import time
+import numpy as np
+import pandas as pd
+from .custom_transformers import (
+    ColumnNameCleaner,
+    MandatoryColumnsChecker,
+    TextCleaner,
+    NumericConverter,
+    DateConverter,
+    ColumnProfiler,
+    MissingValuesDetector,
+    DuplicatesFromtheData,
+    DuplicateIdentifier,
+    IDValidator,
+    NegativeZeroChecker,
+    YearFilter,
+    StartEndYearComparator,
+    ConstantValueDetector,
+    OutlierDetector,
+    CategoryValidator,
+    UniqueIDGenerator,
+    ColumnFilter,
+    IssueSaver,
+    FinalSaver
+)
+from .pipeline import Pipeline, run_pipeline
+from .progress import checkpoint
+
+# Steps run as they are on the pandas frame: column metadata before the checks, and what follows them
+LEADING_PANDAS_STEPS = (ColumnNameCleaner, MandatoryColumnsChecker)
+TRAILING_PANDAS_STEPS = (UniqueIDGenerator, ColumnFilter, IssueSaver, FinalSaver)
+# Steps that change the data; they run before the frame is collected for the checks
+TRANSFORM_STEPS = (TextCleaner, NumericConverter, DateConverter)
+# Formats guessed by pandas that polars' strptime does not read the same way
+UNSUPPORTED_DATE_DIRECTIVES = ('%f', '%z', '%Z')
+
+
+class UnsupportedPlan(Exception):
+    """The pipeline has a step, or the data a column, the polars engine cannot run with the pandas results."""
+
+
+def _is_numeric(dtype):
+    # pandas counts booleans as numeric; the profile then treats them as booleans
+    return dtype.is_numeric()
+
+
+def _as_strings(series):
+    """An object column of strings and numbers as strings only, the way astype(str) and to_numeric read the numbers."""
+    kinds = set(map(type, series.dropna().to_numpy()))
+    if all(issubclass(kind, str) for kind in kinds):
+        return series
+    if not all(issubclass(kind, (str, int, float)) and not issubclass(kind, bool) for kind in kinds):
+        raise UnsupportedPlan(f"column '{series.name}' mixes strings with values other than numbers")
+    return series.where(series.isna(), series.astype(str))
+
+
+class _Plan:
+    """The checks of one run as lazy polars queries, collected together.
+
+    Transform steps replace columns of the lazy ``frame`` and add per-row
+    helper columns for their own counts. Before the first check the frame is
+    collected once, so the conversions are not repeated by every query; each
+    step then adds a query over it to ``queries`` with a function that turns
+    the query's result into the step's ``errors``. Transforms must come before
+    the checks, as in the pipeline.
+    """
+    def __init__(self, pl, X, text_columns, numeric_columns):
+        self.pl = pl
+        self.X = X
+        self.columns = list(X.columns)
+        self.row = '__row__'
+        while self.row in self.columns:
+            self.row += '_'
+        source = X.copy(deep=False)
+        for col in set(text_columns) | set(numeric_columns):
+            if source[col].dtype == object:
+                source[col] = _as_strings(source[col])
+        for col in text_columns:
+            # astype(str) spells missing values out ('nan', 'None'); do the same before polars makes them null
+            missing = source[col].isna()
+            if missing.any():
+                source[col] = source[col].where(~missing, source[col][missing].astype(str))
+        try:
+            self.frame = pl.from_pandas(source).lazy().with_row_index(self.row)
+        except Exception as e:
+            raise UnsupportedPlan(f"data cannot be converted to polars: {e}")
+        self.schema = dict(self.frame.collect_schema())
+        self.queries = []
+        self.transformed = {}  # column -> names of its final values in the output frame
+        self.integer_columns = set()
+        self.pending = []  # (aggregates over the helper columns, finish) of the transforms
+        self.output = None
+        self._checked = None
+
+    def add_transform(self, stages, stats, finish, scratch=()):
+        """Apply ``stages`` of expressions in turn, then drop the ``scratch`` columns between them.
+
+        Each stage reads the columns the one before wrote; an expression
+        reusing another inline is expanded again in every place it is used.
+        """
+        if self.output is not None:
+            raise UnsupportedPlan("a transform step runs after a check")
+        for expressions in stages:
+            self.frame = self.frame.with_columns(expressions)
+        self.frame = self.frame.drop(list(scratch))
+        self.pending.append((stats, finish))
+
+    def materialize(self):
+        """Collect the transformed frame; the transforms' counts become queries over it."""
+        if self.output is None:
+            try:
+                self.output = self.frame.collect()
+            except self.pl.exceptions.PolarsError as e:
+                raise UnsupportedPlan(f"polars could not convert the data: {e}")
+            self.frame = self.output.lazy()
+            self.queries += [(self.frame.select(stats), finish) for stats, finish in self.pending]
+
+    def add_query(self, query, finish):
+        self.queries.append((query, finish))
+
+    def data_columns(self):
+        return [col for col in self.columns if col in self.schema]
+
+    @property
+    def checked(self):
+        """The pandas frame after the transforms: untouched columns as they were, the rest from polars.
+
+        Only built once a check flags rows, after the transforms' results said
+        which converted columns stay integers.
+        """
+        if self._checked is None:
+            checked = self.X.copy(deep=False)
+            for col, names in self.transformed.items():
+                name = names[-1] if col in self.integer_columns else names[0]
+                checked[col] = self.output[name].to_numpy()
+            self._checked = checked
+        return self._checked
+
+
+def _text_cleaner(plan, name, step):
+    pl = plan.pl
+    columns = [col for col in step.columns if col in plan.schema]
+    if step.case == 'title':
+        raise UnsupportedPlan("title case differs between pandas and polars")
+    casing, cleaning, counts = [], [], []
+    for col in columns:
+        if plan.schema[col] != pl.String:
+            raise UnsupportedPlan(f"text column '{col}' is not a string column")
+        cased = pl.col(col).str.strip_chars()
+        if step.case == 'upper':
+            cased = cased.str.to_uppercase()
+        elif step.case == 'lower':
+            cased = cased.str.to_lowercase()
+        casing.append(cased.alias(f"{col}\x00cased"))
+        cleaned = pl.col(f"{col}\x00cased")
+        for char in step.unwanted_chars:
+            cleaned = cleaned.str.replace_all(char, '', literal=True)
+        cleaning += [cleaned.alias(col), (pl.col(col) != pl.col(f"{col}\x00cased")).alias(f"{col}\x00case"),
+                     (pl.col(f"{col}\x00cased") != cleaned).alias(f"{col}\x00chars")]
+        counts += [pl.col(f"{col}\x00case").sum(), pl.col(f"{col}\x00chars").sum()]
+    if not columns:
+        return
+
+    def finish(result):
+        case_issues, char_issues = [], []
+        for col in columns:
+            changes = result[f"{col}\x00case"][0]
+            if changes > 0:
+                case_issues.append({'Column': col, 'Changes_Made': changes, 'Check': 'WhitespaceCaseCleaner'})
+            removed = result[f"{col}\x00chars"][0]
+            if removed > 0:
+                char_issues.append({'Column': col, 'Characters_Removed': removed, 'Check': 'RemoveUnwantedCharacters'})
+        return {step_name: pd.DataFrame(issues)
+                for step_name, issues in zip(step.step_names, (case_issues, char_issues)) if issues}
+
+    plan.add_transform([casing, cleaning], counts, finish, scratch=[f"{col}\x00cased" for col in columns])
+    plan.transformed.update({col: [col] for col in columns})
+
+
+def _numeric_converter(plan, name, step):
+    pl = plan.pl
+    columns = [col for col in step.columns if col in plan.schema and plan.schema[col] == pl.String]
+    if any(col in plan.schema and plan.schema[col] != pl.String and not _is_numeric(plan.schema[col])
+           for col in step.columns):
+        raise UnsupportedPlan("a numeric column is neither text nor numeric")
+    if not columns:
+        return
+    stripping, casting, fixing, stats = [], [], [], []
+    for col in columns:
+        text, parsed = pl.col(f"{col}\x00text"), pl.col(f"{col}\x00parsed")
+        stripping.append(pl.col(col).str.strip_chars().alias(f"{col}\x00text"))
+        casting += [text.cast(pl.Float64, strict=False).alias(f"{col}\x00parsed"),
+                    text.cast(pl.Int64, strict=False).alias(f"{col}\x00int")]
+        # pandas reads overflowing numbers ('1e400') and 'nan' as missing, polars as inf and NaN
+        missing = parsed.is_nan() | (parsed.is_infinite() & ~text.str.contains('(?i)inf'))
+        fixing += [pl.when(missing).then(None).otherwise(parsed).alias(col),
+                   ((parsed.is_null() | missing) & pl.col(col).is_not_null()).alias(f"{col}\x00failures")]
+        stats += [
+            pl.col(f"{col}\x00failures").sum(),
+            # pandas keeps int64 when every value is an integer
+            (pl.col(f"{col}\x00int").is_not_null().all() & (pl.len() > 0)).alias(f"{col}\x00integer"),
+        ]
+
+    def finish(result):
+        issues = []
+        for col in columns:
+            if result[f"{col}\x00integer"][0]:
+                plan.integer_columns.add(col)
+            failures = result[f"{col}\x00failures"][0]
+            if failures > 0:
+                issues.append({'Column': col, 'Conversion_Failures': failures, 'Check': 'NumericConverter'})
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_transform([stripping, casting, fixing], stats, finish,
+                       scratch=[f"{col}\x00{part}" for col in columns for part in ('text', 'parsed')])
+    for col in columns:
+        plan.transformed[col] = [col, f"{col}\x00int"]
+        plan.schema[col] = pl.Float64
+
+
+def _date_converter(plan, name, step):
+    pl = plan.pl
+    columns = []
+    formats = {}
+    for col in step.columns:
+        if col not in plan.schema:
+            continue
+        dtype = plan.schema[col]
+        if dtype == pl.Datetime('ns'):
+            continue
+        if dtype != pl.String or col in plan.transformed:
+            raise UnsupportedPlan(f"date column '{col}' is not an untouched text column")
+        date_format = step.date_format
+        if not date_format:
+            values = plan.X[col].dropna()
+            if len(values) == 0:
+                continue
+            try:
+                from pandas.core.tools.datetimes import _guess_datetime_format_for_array
+            except ImportError:
+                raise UnsupportedPlan("pandas does not expose its date format guess")
+            date_format = _guess_datetime_format_for_array(values.iloc[:1].to_numpy(dtype=object))
+        if not date_format or any(directive in date_format for directive in UNSUPPORTED_DATE_DIRECTIVES):
+            raise UnsupportedPlan(f"no polars format for the dates of '{col}'")
+        columns.append(col)
+        formats[col] = date_format
+    if not columns:
+        return
+    parsed = {}
+    for col in columns:
+        try:
+            pattern = _strptime.TimeRE().pattern(formats[col])
+        except (KeyError, ValueError):
+            raise UnsupportedPlan(f"no polars format for the dates of '{col}'")
+        # strptime in polars takes '2' for %Y; pandas, like Python, wants the widths of this pattern
+        parsed[col] = (pl.when(pl.col(col).str.contains(f"(?i)^{pattern}$"))
+                       .then(pl.col(col).str.strptime(pl.Datetime('ns'), formats[col], strict=False)))
+    parsing = [parsed[col].alias(f"{col}\x00parsed") for col in columns]
+    expressions = []
+    for col in columns:
+        expressions += [pl.col(f"{col}\x00parsed").alias(col),
+                        (pl.col(f"{col}\x00parsed").is_null() & pl.col(col).is_not_null()).alias(f"{col}\x00failures")]
+    stats = [pl.col(f"{col}\x00failures").sum().alias(col) for col in columns]
+
+    def finish(result):
+        issues = [{'Column': col, 'Date_Conversion_Failures': result[col][0], 'Check': 'DateConverter'}
+                  for col in columns if result[col][0] > 0]
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_transform([parsing, expressions], stats, finish, scratch=[f"{col}\x00parsed" for col in columns])
+    for col in columns:
+        plan.transformed[col] = [col]
+        plan.schema[col] = pl.Datetime('ns')
+
+
+def _column_profiler(plan, name, step):
+    # Every check below aggregates its own columns in its own query
+    pass
+
+
+def _row_check(plan, name, mask, rows_to_errors):
+    """Positions of the rows ``mask`` flags, turned into an errors frame of the copied rows."""
+    query = plan.frame.filter(mask).select(plan.row)
+
+    def finish(result):
+        positions = result[plan.row].to_numpy()
+        if len(positions) == 0:
+            return {}
+        return {name: rows_to_errors(positions)}
+
+    plan.add_query(query, finish)
+
+
+def _flagged_rows(plan, positions, check, **extra):
+    rows = plan.checked.iloc[positions].copy()
+    rows['Row_Index'] = rows.index
+    rows['Check'] = check
+    for key, value in extra.items():
+        rows[key] = value
+    return rows
+
+
+def _missing_values_detector(plan, name, step):
+    pl = plan.pl
+    columns = step.columns if step.columns else plan.data_columns()
+    if any(col not in plan.schema for col in columns):
+        raise UnsupportedPlan("missing values are checked in a column the data lacks")
+    if not columns:
+        return
+    _row_check(plan, name, pl.any_horizontal([pl.col(col).is_null() for col in columns]),
+               lambda positions: _flagged_rows(plan, positions, 'MissingValuesDetector'))
+
+
+def _duplicates_from_data(plan, name, step):
+    pl = plan.pl
+    columns = plan.data_columns()
+    if not columns:
+        return
+    _row_check(plan, name, pl.struct(columns).is_duplicated(),
+               lambda positions: _flagged_rows(plan, positions, 'DuplicatesFromtheData'))
+
+
+def _duplicate_identifier(plan, name, step):
+    pl = plan.pl
+    if not step.columns:
+        return
+    if any(col not in plan.schema for col in step.columns):
+        raise UnsupportedPlan("duplicate key columns the data lacks")
+    _row_check(plan, name, pl.struct(step.columns).is_duplicated(),
+               lambda positions: _flagged_rows(plan, positions, 'DuplicateIdentifier', Key_Columns=str(step.columns)))
+
+
+def _id_validator(plan, name, step):
+    pl = plan.pl
+    col = step.id_column
+    if not col or col not in plan.schema:
+        return
+    stats = [pl.col(col).is_null().sum().alias('missing')]
+    if plan.schema[col] == pl.String:
+        stats.append((pl.col(col).str.strip_chars() == '').sum().alias('empty'))
+
+    def finish(result):
+        issues = []
+        if result['missing'][0] > 0:
+            issues.append({'Column': col, 'Missing_IDs': result['missing'][0], 'Check': 'IDValidator'})
+        if 'empty' in result.columns and result['empty'][0] > 0:
+            issues.append({'Column': col, 'Empty_IDs': result['empty'][0], 'Check': 'IDValidator'})
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_query(plan.frame.select(stats), finish)
+
+
+def _negative_zero_checker(plan, name, step):
+    pl = plan.pl
+    columns = [col for col in step.columns if col in plan.schema and _is_numeric(plan.schema[col])]
+    if not columns:
+        return
+    stats = []
+    for col in columns:
+        stats += [(pl.col(col) < 0).sum().alias(f"{col}\x00negative"), (pl.col(col) == 0).sum().alias(f"{col}\x00zero")]
+
+    def finish(result):
+        issues = []
+        for col in columns:
+            negative_count, zero_count = result[f"{col}\x00negative"][0], result[f"{col}\x00zero"][0]
+            if negative_count > 0 or zero_count > 0:
+                issues.append({'Column': col, 'Negative_Values': negative_count, 'Zero_Values': zero_count,
+                               'Check': 'NegativeZeroChecker'})
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_query(plan.frame.select(stats), finish)
+
+
+def _year_filter(plan, name, step):
+    pl = plan.pl
+    col = step.date_column
+    if not col or col not in plan.schema or not isinstance(plan.schema[col], pl.Datetime):
+        return
+    years = pl.col(col).dt.year()
+    stats = [pl.lit(0).alias('before'), pl.lit(0).alias('after')]
+    if step.start_year is not None:
+        stats[0] = (years < step.start_year).sum().alias('before')
+    if step.end_year is not None:
+        stats[1] = (years > step.end_year).sum().alias('after')
+
+    def finish(result):
+        issues = []
+        if step.start_year is not None and result['before'][0] > 0:
+            issues.append({'Column': col, 'Years_Before_Start': result['before'][0], 'Start_Year': step.start_year,
+                           'Check': 'YearFilter'})
+        if step.end_year is not None and result['after'][0] > 0:
+            issues.append({'Column': col, 'Years_After_End': result['after'][0], 'End_Year': step.end_year,
+                           'Check': 'YearFilter'})
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_query(plan.frame.select(stats), finish)
+
+
+def _start_end_year_comparator(plan, name, step):
+    pl = plan.pl
+    start, end = step.start_year_column, step.end_year_column
+    if not start or not end or start not in plan.schema or end not in plan.schema:
+        return
+    start_type, end_type = plan.schema[start], plan.schema[end]
+    comparable = (
+        (_is_numeric(start_type) and _is_numeric(end_type))
+        or start_type == end_type == pl.String
+        or (isinstance(start_type, pl.Datetime) and isinstance(end_type, pl.Datetime))
+    )
+    if not comparable:
+        raise UnsupportedPlan(f"cannot compare '{start}' with '{end}' like pandas does")
+    _row_check(plan, name, (pl.col(start) > pl.col(end)).fill_null(False),
+               lambda positions: _flagged_rows(plan, positions, 'StartEndYearComparator'))
+
+
+def _constant_value_detector(plan, name, step):
+    pl = plan.pl
+    candidates = plan.data_columns() if step.columns is None else step.columns
+    columns = [col for col in candidates if col in plan.schema and _is_numeric(plan.schema[col])]
+    if not columns:
+        return
+    stats = [pl.len().alias('\x00rows')]
+    for col in columns:
+        top = pl.col(col).drop_nulls().value_counts(sort=True, name='count').first()
+        stats += [top.struct.field(col).alias(f"{col}\x00value"), top.struct.field('count').alias(f"{col}\x00count")]
+
+    def finish(result):
+        issues = []
+        rows = result['\x00rows'][0]
+        for col in columns:
+            count = result[f"{col}\x00count"][0]
+            if count is None or rows == 0:
+                continue
+            frequency = count / rows
+            if frequency >= step.threshold:
+                value = result[f"{col}\x00value"][0]
+                if col in plan.integer_columns:
+                    value = int(value)
+                issues.append({'Column': col, 'Most_Common_Value': value, 'Frequency': frequency,
+                               'Check': 'ConstantValueDetector'})
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_query(plan.frame.select(stats), finish)
+
+
+def _outlier_detector(plan, name, step):
+    pl = plan.pl
+    if any(col in plan.schema for col in step.group_by):
+        raise UnsupportedPlan("segmented outlier detection runs on pandas")
+    columns = [col for col in step.columns
+               if col in plan.schema and _is_numeric(plan.schema[col]) and plan.schema[col] != pl.Boolean]
+    if not columns or step.method not in ('iqr', 'zscore', 'mad'):
+        return
+    stats = []
+    for col in columns:
+        # The bounds are aggregates, broadcast against the column within the same query
+        values = pl.col(col).cast(pl.Float64)
+        if step.method == 'iqr':
+            q1, q3 = values.quantile(0.25, 'linear'), values.quantile(0.75, 'linear')
+            outside = (values < q1 - step.threshold * (q3 - q1)) | (values > q3 + step.threshold * (q3 - q1))
+        elif step.method == 'zscore':
+            mean, std = values.mean(), values.std()
+            outside = ((values < mean - step.threshold * std) | (values > mean + step.threshold * std)) & (std > 0)
+        else:
+            median = values.median()
+            deviation = (values - median).abs()
+            # Scaled mean absolute deviation where the MAD is 0, as OutlierDetector.robust_spread
+            spread = pl.when(deviation.median() > 0).then(step.MAD_SCALE * deviation.median()) \
+                .otherwise(step.MEAN_AD_SCALE * deviation.mean())
+            outside = deviation > step.threshold * spread
+        stats.append(outside.sum().alias(col))
+
+    def finish(result):
+        issues = [{'Column': col, 'Outliers_Detected': result[col][0], 'Method': step.method, 'Check': 'OutlierDetector'}
+                  for col in columns if result[col][0] > 0]
+        return {name: pd.DataFrame(issues)} if issues else {}
+
+    plan.add_query(plan.frame.select(stats), finish)
+
+
+def _category_validator(plan, name, step):
+    pl = plan.pl
+    for col, expected_values in step.column_expected_values.items():
+        if col not in plan.schema:
+            continue
+        dtype = plan.schema[col]
+        expected = list(expected_values)
+        allows_missing = any(value is None or (isinstance(value, float) and np.isnan(value)) for value in expected)
+        expected = [value for value in expected if value is not None and not (isinstance(value, float) and np.isnan(value))]
+        if dtype == pl.String:
+            valid_types = all(isinstance(value, str) for value in expected)
+        elif dtype == pl.Boolean:
+            valid_types = all(isinstance(value, bool) for value in expected)
+        elif _is_numeric(dtype):
+            valid_types = all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in expected)
+        else:
+            valid_types = False
+        if not valid_types:
+            raise UnsupportedPlan(f"expected values of '{col}' do not match its type")
+        if expected:
+            valid = pl.col(col).is_in(pl.lit(pl.Series(expected, dtype=dtype)).implode()).fill_null(allows_missing)
+        else:
+            valid = pl.col(col).is_null() & allows_missing
+        _row_check(plan, f"{name}\x00{col}", ~valid, lambda positions, col=col, expected_values=expected_values: _flagged_rows(
+            plan, positions, 'CategoryValidator', Column=col, Expected_Values=str(expected_values)))
+
+
+POLARS_STEPS = {
+    TextCleaner: _text_cleaner,
+    NumericConverter: _numeric_converter,
+    DateConverter: _date_converter,
+    ColumnProfiler: _column_profiler,
+    MissingValuesDetector: _missing_values_detector,
+    DuplicatesFromtheData: _duplicates_from_data,
+    DuplicateIdentifier: _duplicate_identifier,
+    IDValidator: _id_validator,
+    NegativeZeroChecker: _negative_zero_checker,
+    YearFilter: _year_filter,
+    StartEndYearComparator: _start_end_year_comparator,
+    ConstantValueDetector: _constant_value_detector,
+    OutlierDetector: _outlier_detector,
+    CategoryValidator: _category_validator,
+}
+
+
+def run_pipeline_polars(pipeline, X):
+    """Run ``pipeline`` like ``pipeline.run_pipeline``, with its checks as one polars query plan.
+
+    The column name and mandatory column steps run first on the pandas
+    frame. The steps between them and the data transformation steps are
+    translated to lazy polars expressions: the text, numeric and date
+    conversions are collected once, then the checks run over the converted
+    frame as queries collected together, each reading only the columns it
+    needs, on polars' thread pool. The
+    trailing steps (unique IDs, column filter, reports, export) run on the
+    pandas frame rebuilt from the result, so the issues and the output match
+    the pandas engine's.
+
+    Raises UnsupportedPlan, before any check has run, when a step or a
+    column's type has no polars translation with the same results; the
+    caller then runs the pipeline on pandas.
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        raise UnsupportedPlan("polars is not installed")
+
+    steps = pipeline.steps
+    lead = 0
+    while lead < len(steps) and isinstance(steps[lead][1], LEADING_PANDAS_STEPS):
+        lead += 1
+    end = lead
+    while end < len(steps) and type(steps[end][1]) in POLARS_STEPS:
+        end += 1
+    unsupported = [name for name, step in steps[end:] if not isinstance(step, TRAILING_PANDAS_STEPS)]
+    if unsupported:
+        raise UnsupportedPlan(f"no polars translation for {unsupported[0]}")
+
+    result = run_pipeline(pipeline[:lead], X)
+    X = result['output']
+    if result['stopped_by'] is not None:
+        trailing = run_pipeline(Pipeline([(name, step) for name, step in steps[lead:] if name == 'issue_saver']), X)
+        result['skipped'] += [name for name, _ in steps[lead:] if name != 'issue_saver']
+        result['timings'].update(trailing['timings'])
+        return result
+
+    start = time.perf_counter()
+    text_columns = [col for _, step in steps[lead:end] if isinstance(step, TextCleaner)
+                    for col in step.columns if col in X.columns]
+    numeric_columns = [col for _, step in steps[lead:end] if isinstance(step, NumericConverter)
+                       for col in step.columns if col in X.columns]
+    plan = _Plan(pl, X, text_columns, numeric_columns)
+    for name, step in steps[lead:end]:
+        checkpoint()
+        if not isinstance(step, TRANSFORM_STEPS):
+            plan.materialize()
+        POLARS_STEPS[type(step)](plan, name, step)
+    plan.materialize()
+    timings = {'polars_transforms': time.perf_counter() - start}
+
+    checkpoint()
+    start = time.perf_counter()
+    try:
+        collected = pl.collect_all([query for query, _ in plan.queries])
+    except pl.exceptions.PolarsError as e:
+        raise UnsupportedPlan(f"polars could not run the checks: {e}")
+    timings['polars_checks'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    errors = {}
+    for (_, finish), frame in zip(plan.queries, collected):
+        for step_name, step_frame in finish(frame).items():
+            # Per-column queries of one step share its name before the NUL
+            step_name = step_name.split('\x00')[0]
+            if step_name in errors:
+                step_frame = pd.concat([errors[step_name], step_frame], ignore_index=True)
+            errors[step_name] = step_frame
+    checked = plan.checked
+    timings['polars_results'] = time.perf_counter() - start
+
+    trailing = run_pipeline(pipeline[end:], checked)
+    return {
+        'output': trailing['output'],
+        'errors': {**result['errors'], **errors, **trailing['errors']},
+        'timings': {**result['timings'], **timings, **trailing['timings']},
+        'data_columns': result['data_columns'] | trailing['data_columns'],
+        'stopped_by': None,
+        'skipped': [],
+    }
@@ -0,0 +1,125 @@
+import pandas as pd
+import numpy as np
+import io
+import os
+from .profiler import profile_dataframe, json_safe
+
+DEFAULT_PREVIEW_BYTES = 256 * 1024
+DEFAULT_PREVIEW_ROWS = 1_000
+DEFAULT_SAMPLE_SIZE = 100
+
+
+def reservoir_sample(chunks, k, seed=None):
+    """Uniform sample of ``k`` rows from an iterable of DataFrame chunks (Algorithm R).
+
+    Each chunk is processed with vectorized draws, so the sample can be fed
+    incrementally without holding more than ``k`` rows.
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    seen = 0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        chunk = chunk.reset_index(drop=True)
+        if reservoir is None:
+            reservoir = chunk.iloc[:0].copy()
+        fill = min(k - len(reservoir), len(chunk))
+        if fill > 0:
+            reservoir = pd.concat([reservoir, chunk.iloc[:fill]], ignore_index=True)
+        rest = chunk.iloc[fill:]
+        if len(rest):
+            positions = seen + fill + np.arange(len(rest))
+            slots = np.floor(rng.random(len(rest)) * (positions + 1)).astype('int64')
+            replace = slots < k
+            # Later rows win on slot collisions, as in the sequential algorithm
+            reservoir.iloc[slots[replace]] = rest[replace].to_numpy()
+        seen += len(chunk)
+    return reservoir if reservoir is not None else pd.DataFrame()
+
+
+def _read_csv_head(path, max_bytes, partial=False):
+    with open(path, 'rb') as f:
+        head = f.read(max_bytes + 1)
+    truncated = len(head) > max_bytes or partial
+    if truncated:
+        # Drop the partial last line so every parsed row is complete
+        head = head[:max_bytes]
+        head = head[:head.rfind(b'\n') + 1] or head
+    frame = pd.read_csv(io.BytesIO(head), encoding='utf-8')
+    return frame, truncated, None
+
+
+def _read_parquet_head(path):
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(path)
+    # Footer metadata gives the exact row count; only the first row group is decoded
+    row_count = parquet_file.metadata.num_rows
+    if parquet_file.num_row_groups == 0:
+        frame = parquet_file.schema_arrow.empty_table().to_pandas()
+    else:
+        frame = parquet_file.read_row_group(0).to_pandas()
+    return frame, parquet_file.num_row_groups > 1, row_count
+
+
+def _read_xlsx_head(path, max_rows):
+    # openpyxl is opened in read-only mode by pandas, so only the leading rows are parsed
+    frame = pd.read_excel(path, sheet_name=0, nrows=max_rows)
+    return frame, len(frame) >= max_rows, None
+
+
+def read_preview(path, max_bytes=DEFAULT_PREVIEW_BYTES, max_rows=DEFAULT_PREVIEW_ROWS,
+                 sample_size=DEFAULT_SAMPLE_SIZE, preview_rows=5, file_format=None, partial=False):
+    """Read only the head of a data file and describe it.
+
+    CSV files are read up to ``max_bytes``, Parquet files through their footer and
+    first row group, and XLSX files up to ``max_rows`` rows of the first sheet.
+    ``file_format`` overrides the extension of ``path``; ``partial`` marks a CSV
+    that is only the leading part of a larger upload.
+
+    Returns:
+        Dictionary with columns, schema (dtype and suggested type), the first
+        ``preview_rows`` rows, a reservoir sample of the rows read, the number of
+        rows scanned and the exact row count when the format stores it.
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.')
+    if file_format == 'csv':
+        frame, truncated, row_count = _read_csv_head(path, max_bytes, partial=partial)
+    elif file_format == 'parquet':
+        frame, truncated, row_count = _read_parquet_head(path)
+    elif file_format == 'xlsx':
+        frame, truncated, row_count = _read_xlsx_head(path, max_rows)
+    else:
+        raise ValueError("Unsupported file format! Please use CSV, XLSX, or Parquet.")
+
+    if row_count is None and not truncated:
+        row_count = len(frame)
+
+    profile = profile_dataframe(frame)
+    schema = [
+        {
+            'name': col,
+            'dtype': str(frame[col].dtype),
+            'suggested_type': profile.get(col).suggested_type(),
+        }
+        for col in frame.columns
+    ]
+    sample = reservoir_sample([frame], sample_size)
+
+    return {
+        'columns': frame.columns.tolist(),
+        'schema': schema,
+        'preview': _records(frame.head(preview_rows)),
+        'sample': _records(sample),
+        'rows_scanned': len(frame),
+        'row_count': row_count,
+        'truncated': truncated,
+    }
+
+
+def _records(frame):
+    """Rows as JSON-safe dicts (NaN -> None, timestamps -> ISO strings)."""
+    return [
+        {col: json_safe(value) for col, value in row.items()}
+        for row in frame.to_dict(orient='records')
+    ]
@@ -0,0 +1,301 @@
+import pandas as pd
+import numpy as np
+import warnings
+import weakref
+from .progress import report_chunk
+warnings.filterwarnings('ignore')
+
+DEFAULT_CHUNK_SIZE = 500_000
+# Quantiles stay exact while a column has at most this many non-null values
+DEFAULT_SKETCH_SIZE = 1_000_000
+DEFAULT_TOP_K = 10
+TOP_K_CAPACITY = 1_000
+TYPE_SAMPLE_SIZE = 1_000
+
+
+def json_safe(value):
+    """Convert numpy/pandas scalars into JSON friendly Python values."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class QuantileSketch:
+    """Bounded, mergeable sample of numeric values used to answer quantile queries.
+
+    Values are kept verbatim until ``capacity`` is exceeded, so quantiles match
+    ``Series.quantile`` exactly for columns of that size. Larger columns are
+    compacted into ``capacity`` weighted points.
+    """
+    def __init__(self, capacity=DEFAULT_SKETCH_SIZE):
+        self.capacity = capacity
+        self.values = np.empty(0, dtype='float64')
+        self.weights = None  # None while every value carries weight 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        if len(values) == 0:
+            return
+        self.values = np.concatenate([self.values, values])
+        if self.weights is not None:
+            self.weights = np.concatenate([self.weights, np.ones(len(values))])
+        if len(self.values) > self.capacity:
+            self._compact()
+
+    def _compact(self):
+        weights = self.weights if self.weights is not None else np.ones(len(self.values))
+        order = np.argsort(self.values, kind='mergesort')
+        values = self.values[order]
+        cumulative = np.cumsum(weights[order])
+        total = cumulative[-1]
+        # Pick evenly spaced weighted ranks; each kept point represents total/capacity values
+        targets = (np.arange(self.capacity) + 0.5) * (total / self.capacity)
+        self.values = values[np.searchsorted(cumulative, targets)]
+        self.weights = np.full(self.capacity, total / self.capacity)
+
+    def quantile(self, q):
+        if len(self.values) == 0:
+            return np.nan
+        if self.weights is None:
+            return float(np.quantile(self.values, q))
+        order = np.argsort(self.values, kind='mergesort')
+        values = self.values[order]
+        cumulative = np.cumsum(self.weights[order])
+        positions = (cumulative - self.weights[order] / 2) / cumulative[-1]
+        return float(np.interp(q, positions, values))
+
+
+class ColumnProfile:
+    """Statistics for a single column collected in one pass over the data."""
+    def __init__(self, name, sketch_size=DEFAULT_SKETCH_SIZE):
+        self.name = name
+        self.dtype = None
+        self.row_count = 0
+        self.null_count = 0
+        self.empty_count = 0
+        self.negative_count = 0
+        self.zero_count = 0
+        self.min = None
+        self.max = None
+        # Running moments (Chan et al. parallel variance)
+        self.numeric_count = 0
+        self.mean_value = 0.0
+        self.m2 = 0.0
+        self.sketch = None
+        self.top_counts = {}
+        self.top_truncated = False
+        self.year_counts = {}
+        self.sample_values = []
+        self._sketch_size = sketch_size
+
+    @property
+    def kind(self):
+        if self.dtype is None:
+            return 'unknown'
+        if pd.api.types.is_bool_dtype(self.dtype):
+            return 'boolean'
+        if pd.api.types.is_numeric_dtype(self.dtype):
+            return 'numeric'
+        if pd.api.types.is_datetime64_any_dtype(self.dtype):
+            return 'datetime'
+        return 'text'
+
+    @property
+    def mean(self):
+        return self.mean_value if self.numeric_count else np.nan
+
+    @property
+    def std(self):
+        # Sample standard deviation to match Series.std()
+        if self.numeric_count < 2:
+            return np.nan
+        return float(np.sqrt(self.m2 / (self.numeric_count - 1)))
+
+    @property
+    def most_common(self):
+        """Return (value, count) of the most frequent non-null value, or None."""
+        if not self.top_counts:
+            return None
+        return max(self.top_counts.items(), key=lambda item: item[1])
+
+    @property
+    def distinct_count(self):
+        """Exact number of distinct non-null values, or None once the counter was truncated."""
+        return None if self.top_truncated else len(self.top_counts)
+
+    def quantile(self, q):
+        if self.sketch is None:
+            return np.nan
+        return self.sketch.quantile(q)
+
+    def count_years(self, predicate):
+        return sum(count for year, count in self.year_counts.items() if predicate(year))
+
+    def update(self, series):
+        """Fold one chunk of the column into the profile."""
+        self.dtype = series.dtype
+        self.row_count += len(series)
+        null_mask = series.isna()
+        self.null_count += int(null_mask.sum())
+        non_null = series[~null_mask]
+
+        kind = self.kind
+        if kind == 'numeric':
+            values = non_null.to_numpy(dtype='float64')
+            self._update_numeric(values)
+        elif kind == 'datetime':
+            self._update_extremes(non_null.min() if len(non_null) else None,
+                                  non_null.max() if len(non_null) else None)
+            for year, count in non_null.dt.year.value_counts().items():
+                self.year_counts[int(year)] = self.year_counts.get(int(year), 0) + int(count)
+        elif kind == 'text':
+            self.empty_count += int((series.astype(str).str.strip() == '').sum())
+            if len(self.sample_values) < TYPE_SAMPLE_SIZE:
+                needed = TYPE_SAMPLE_SIZE - len(self.sample_values)
+                self.sample_values.extend(non_null.head(needed).tolist())
+
+        self._update_top_counts(non_null.value_counts())
+
+    def _update_numeric(self, values):
+        if len(values) == 0:
+            return
+        self.negative_count += int((values < 0).sum())
+        self.zero_count += int((values == 0).sum())
+        self._update_extremes(values.min(), values.max())
+
+        n_b = len(values)
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+        n_a = self.numeric_count
+        total = n_a + n_b
+        delta = mean_b - self.mean_value
+        self.mean_value += delta * n_b / total
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / total
+        self.numeric_count = total
+
+        if self.sketch is None:
+            self.sketch = QuantileSketch(self._sketch_size)
+        self.sketch.update(values)
+
+    def _update_extremes(self, chunk_min, chunk_max):
+        if chunk_min is None:
+            return
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+
+    def _update_top_counts(self, value_counts):
+        if len(value_counts) > TOP_K_CAPACITY:
+            # value_counts is sorted, so the tail cannot contain a heavy hitter of this chunk
+            value_counts = value_counts.head(TOP_K_CAPACITY)
+            self.top_truncated = True
+        counts = self.top_counts
+        for value, count in value_counts.items():
+            counts[value] = counts.get(value, 0) + int(count)
+        if len(counts) > TOP_K_CAPACITY:
+            # Keep the heaviest hitters; counts stay exact for values that dominate a column
+            kept = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:TOP_K_CAPACITY]
+            self.top_counts = dict(kept)
+            self.top_truncated = True
+
+    def suggested_type(self):
+        """Suggest how the column should be configured: numeric, date, boolean or text."""
+        kind = self.kind
+        if kind == 'datetime':
+            return 'date'
+        if kind in ('numeric', 'boolean'):
+            return kind
+        if not self.sample_values:
+            return 'text'
+        sample = pd.Series(self.sample_values, dtype='object').astype(str).str.strip()
+        if pd.to_numeric(sample, errors='coerce').notna().mean() >= 0.95:
+            return 'numeric'
+        for dayfirst in (False, True):
+            if pd.to_datetime(sample, errors='coerce', dayfirst=dayfirst).notna().mean() >= 0.95:
+                return 'date'
+        return 'text'
+
+    def to_dict(self, top_k=DEFAULT_TOP_K):
+        top = sorted(self.top_counts.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        result = {
+            'column': self.name,
+            'dtype': str(self.dtype),
+            'suggested_type': self.suggested_type(),
+            'row_count': self.row_count,
+            'null_count': self.null_count,
+            'empty_count': self.empty_count,
+            'distinct_count': self.distinct_count,
+            'min': json_safe(self.min),
+            'max': json_safe(self.max),
+            'top_values': [{'value': json_safe(v), 'count': c} for v, c in top],
+        }
+        if self.kind == 'numeric':
+            result.update({
+                'negative_count': self.negative_count,
+                'zero_count': self.zero_count,
+                'mean': json_safe(self.mean),
+                'std': json_safe(self.std),
+                'quantiles': {str(q): json_safe(self.quantile(q)) for q in (0.25, 0.5, 0.75)},
+            })
+        return result
+
+
+class DataProfile:
+    """Column profiles for a DataFrame, built by scanning each column once per chunk.
+
+    A single instance is shared by the checks of a pipeline: the ``ColumnProfiler``
+    step fills it and later checks read their decisions from it instead of
+    rescanning the same columns. It answers only for the very frame it was
+    fitted on (held by a weak reference, as ids are reused once a frame is
+    freed), and ``run_pipeline`` resets it before each run.
+    """
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, sketch_size=DEFAULT_SKETCH_SIZE):
+        self.chunk_size = chunk_size
+        self.sketch_size = sketch_size
+        self.columns = {}
+        self.row_count = 0
+        self._frame = None
+
+    def reset(self):
+        """Forget the profiled frame, so no check reads a profile of an earlier run."""
+        self.columns = {}
+        self.row_count = 0
+        self._frame = None
+
+    def fit(self, X, columns=None):
+        """Profile ``columns`` of ``X`` (all columns when None)."""
+        columns = [col for col in (columns if columns is not None else X.columns) if col in X.columns]
+        columns = list(dict.fromkeys(columns))
+        self.columns = {col: ColumnProfile(col, sketch_size=self.sketch_size) for col in columns}
+        self.row_count = len(X)
+        self._frame = weakref.ref(X)
+
+        chunk_size = self.chunk_size or len(X) or 1
+        for start in range(0, max(len(X), 1), chunk_size):
+            chunk = X.iloc[start:start + chunk_size]
+            for col in columns:
+                self.columns[col].update(chunk[col])
+            report_chunk(start + len(chunk), len(X))
+        return self
+
+    def get(self, column, X=None):
+        """Return the profile for ``column`` if it was profiled on ``X``; otherwise None."""
+        if X is not None and (self._frame is None or self._frame() is not X or len(X) != self.row_count):
+            return None
+        return self.columns.get(column)
+
+    def to_dict(self, top_k=DEFAULT_TOP_K):
+        return {
+            'row_count': self.row_count,
+            'columns': {col: profile.to_dict(top_k=top_k) for col, profile in self.columns.items()},
+        }
+
+
+def profile_dataframe(X, columns=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convenience wrapper returning a fitted DataProfile."""
+    return DataProfile(chunk_size=chunk_size).fit(X, columns=columns)
@@ -0,0 +1,187 @@
+import contextlib
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+# Chunk progress events of a step are emitted at most this often; step events always are
+PROGRESS_MIN_INTERVAL_SECONDS = float(os.getenv("PROGRESS_MIN_INTERVAL_SECONDS", "0.5"))
+# How long the events of a finished run stay available to late subscribers
+PROGRESS_RETENTION_SECONDS = float(os.getenv("PROGRESS_RETENTION_SECONDS", "600"))
+
+# Progress of the run executing in the current thread, for steps that report chunks
+_current = ContextVar("run_progress", default=None)
+
+
+class RunCancelled(Exception):
+    """Raised in the executor at the next step or chunk once its run was cancelled."""
+
+
+class RunProgress:
+    """Events of one run, appended by the executor and read by any number of subscribers.
+
+    Emitting only appends to a list under a lock; subscribers poll ``since``,
+    so a slow or absent reader never holds up the checks. Chunk events are
+    throttled to one per ``min_interval`` seconds. ``cancel`` sets a flag the
+    executor checks before each step and after each chunk.
+    """
+    def __init__(self, run_uuid, min_interval=PROGRESS_MIN_INTERVAL_SECONDS, project_id=None):
+        self.run_uuid = run_uuid
+        self.project_id = project_id
+        self.min_interval = min_interval
+        self.status = "pending"
+        self.events = []
+        self.issue_counts = {}
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._started = time.perf_counter()
+        self._rows = None
+        self._planned = {}
+        self._steps = []
+        self._done = {}
+        self._step = None
+        self._step_started = None
+        self._step_fraction = 0.0
+        self._last_chunk = 0.0
+
+    @property
+    def done(self):
+        return self.status in ("finished", "failed", "cancelled")
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def emit(self, event, **data):
+        with self._lock:
+            self.events.append({"id": len(self.events) + 1, "event": event,
+                                "elapsed": round(time.perf_counter() - self._started, 3), **data})
+
+    def since(self, last_id):
+        with self._lock:
+            return self.events[last_id:]
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise RunCancelled("Run cancelled.")
+
+    def start(self, plan=None, engine=None):
+        """The run begins: ``plan`` (see ``planner.compile_plan``) gives the steps and their estimated seconds."""
+        plan = plan or {"steps": []}
+        self.status = "running"
+        self._rows = plan.get("rows")
+        self._steps = [step["name"] for step in plan["steps"]]
+        self._planned = {step["name"]: step.get("estimated_seconds") or 0.0 for step in plan["steps"]}
+        self.emit("run_started", rows=self._rows, steps=self._steps, engine=engine,
+                  eta_seconds=self.eta_seconds())
+        self.check()
+
+    def eta_seconds(self):
+        """Planned seconds of the steps still to run, scaled by how the finished steps compared to their plan."""
+        remaining = sum(seconds for name, seconds in self._planned.items() if name not in self._done)
+        if self._step in self._planned:
+            remaining -= self._planned[self._step] * self._step_fraction
+        planned_done = sum(self._planned.get(name, 0.0) for name in self._done)
+        ratio = sum(self._done.values()) / planned_done if planned_done > 0 else 1.0
+        return round(max(remaining, 0.0) * ratio, 3)
+
+    def step_started(self, name):
+        self.check()
+        self._step, self._step_started, self._step_fraction, self._last_chunk = name, time.perf_counter(), 0.0, 0.0
+        index = self._steps.index(name) + 1 if name in self._steps else None
+        self.emit("step_started", step=name, index=index, total=len(self._steps) or None,
+                  eta_seconds=self.eta_seconds())
+
+    def chunk(self, rows_done, rows_total):
+        """A step finished a chunk; emits a progress event unless one was sent less than ``min_interval`` ago."""
+        self.check()
+        if self._step is None:
+            return
+        now = time.perf_counter()
+        self._step_fraction = rows_done / rows_total if rows_total else 0.0
+        if now - self._last_chunk < self.min_interval:
+            return
+        self._last_chunk = now
+        seconds = now - self._step_started
+        self.emit("progress", step=self._step, rows_done=int(rows_done), rows_total=int(rows_total),
+                  rows_per_second=round(rows_done / seconds) if seconds > 0 else None,
+                  eta_seconds=self.eta_seconds())
+
+    def step_finished(self, name, seconds, errors):
+        """``errors`` is what the step found, as in ``run_pipeline`` (step name -> DataFrame)."""
+        found = 0
+        for step_name, frame in errors.items():
+            if frame is None or frame.empty:
+                continue
+            found += len(frame)
+            checks = frame["Check"].astype(str).value_counts() if "Check" in frame.columns else {step_name: len(frame)}
+            for check, count in checks.items():
+                self.issue_counts[check] = self.issue_counts.get(check, 0) + int(count)
+        self._done[name] = seconds
+        self._step = None
+        self.emit("step_finished", step=name, seconds=round(seconds, 6), issues=found,
+                  rows_per_second=round(self._rows / seconds) if self._rows and seconds > 0 else None,
+                  issue_counts=dict(self.issue_counts), eta_seconds=self.eta_seconds())
+
+    def finish(self, status, **data):
+        """End the run as ``finished``, ``failed`` or ``cancelled``; emitted as ``run_<status>``."""
+        self.status = status
+        self.finished_at = time.monotonic()
+        self.emit(f"run_{status}", **data)
+
+
+class ProgressRegistry:
+    """Progress of the recent runs by run UUID; finished runs are dropped after ``retention`` seconds."""
+    def __init__(self, retention=PROGRESS_RETENTION_SECONDS):
+        self.retention = retention
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def register(self, run_uuid, project_id=None):
+        progress = RunProgress(run_uuid, project_id=project_id)
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, run in self._runs.items()
+                       if run.finished_at is not None and now - run.finished_at > self.retention]
+            for key in expired:
+                del self._runs[key]
+            self._runs[run_uuid] = progress
+        return progress
+
+    def get(self, run_uuid):
+        with self._lock:
+            return self._runs.get(run_uuid)
+
+
+@contextlib.contextmanager
+def tracking(progress):
+    """Make ``progress`` the current run's for ``report_chunk`` calls in this thread."""
+    if progress is None:
+        yield
+        return
+    token = _current.set(progress)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def checkpoint():
+    """Raises ``RunCancelled`` in a cancelled run; for loops whose progress is not counted in rows of the data."""
+    progress = _current.get()
+    if progress is not None:
+        progress.check()
+
+
+def report_chunk(rows_done, rows_total):
+    """Called by steps that work in chunks; does nothing outside a tracked run, raises ``RunCancelled`` in a cancelled one."""
+    progress = _current.get()
+    if progress is not None:
+        progress.chunk(rows_done, rows_total)
+
+
+progress_runs = ProgressRegistry()
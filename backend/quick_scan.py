@@ -0,0 +1,313 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from .custom_transformers import (
+    clean_column_name,
+    ColumnNameCleaner,
+    MandatoryColumnsChecker,
+    ColumnProfiler,
+    DuplicatesFromtheData,
+    DuplicateIdentifier,
+    UniqueIDGenerator,
+    ColumnFilter,
+    IssueSaver,
+    FinalSaver
+)
+from .pipeline import create_issue_pipeline, run_pipeline
+
+# Rows checked by a quick scan; smaller data is checked in full
+QUICK_SCAN_SAMPLE_ROWS = int(os.getenv("QUICK_SCAN_SAMPLE_ROWS", "20000"))
+# 2^precision HyperLogLog registers: 14 gives a standard error of about 0.8% on distinct counts
+QUICK_SCAN_HLL_PRECISION = int(os.getenv("QUICK_SCAN_HLL_PRECISION", "14"))
+HASH_CHUNK_ROWS = 1_000_000
+Z_95 = 1.959963984540054
+
+# Fields of column-level findings that count affected cells (of the sample)
+CELL_COUNT_FIELDS = (
+    'Changes_Made', 'Characters_Removed', 'Conversion_Failures', 'Date_Conversion_Failures', 'Missing_IDs',
+    'Empty_IDs', 'Negative_Values', 'Zero_Values', 'Years_Before_Start', 'Years_After_End', 'Outliers_Detected',
+    'Duplicate_IDs',
+)
+# Checks whose sample rate says little about the data; their rate comes from distinct counts of the full data
+DISTINCT_CHECKS = (DuplicatesFromtheData, DuplicateIdentifier, UniqueIDGenerator)
+# Checks of the column names, whose findings hold for the data as a whole
+STRUCTURAL_CHECKS = (ColumnNameCleaner, MandatoryColumnsChecker, ColumnFilter)
+# Checks the fused text_cleaner step reports under
+FUSED_CHECKS = {'whitespace_case_cleaner': 'WhitespaceCaseCleaner', 'remove_unwanted_chars': 'RemoveUnwantedCharacters'}
+
+
+def wilson_interval(p, n, z=Z_95):
+    """Wilson score interval of a proportion ``p`` observed over ``n`` (possibly effective, non-integer) trials."""
+    if n <= 0:
+        return 0.0, 1.0
+    if np.isinf(n):
+        return p, p
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    # Exact at the bounds, where the closed form leaves rounding residue
+    return (0.0 if p <= 0 else max(0.0, center - half)), (1.0 if p >= 1 else min(1.0, center + half))
+
+
+def _bit_length(values):
+    """Bit length of each uint64, exact (split in 32-bit halves, which float64 holds exactly)."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Distinct count sketch over 64-bit hashes in ``2 ** precision`` one-byte registers."""
+    def __init__(self, precision=QUICK_SCAN_HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def add(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # A guard bit below the remaining bits bounds the run of leading zeros
+        rest = (hashes << np.uint64(self.precision)) | np.uint64(1 << (self.precision - 1))
+        rank = (65 - _bit_length(rest)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * np.log(m / empty)
+        return float(estimate)
+
+
+def key_sample(frame, columns, rate, precision=QUICK_SCAN_HLL_PRECISION):
+    """Hash the rows of ``columns`` once, in chunks: a HyperLogLog of them and the hashes in the lowest ``rate`` of the range.
+
+    Sampling by hash keeps every copy of a sampled key, so each sampled key's
+    multiplicity is exact however rare its copies are in a row sample.
+    """
+    sketch = HyperLogLog(precision)
+    threshold = np.uint64(rate * 2.0 ** 64) if rate < 1 else np.iinfo(np.uint64).max
+    kept = []
+    for start in range(0, len(frame), HASH_CHUNK_ROWS):
+        chunk = frame.iloc[start:start + HASH_CHUNK_ROWS][columns]
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        sketch.add(hashes)
+        kept.append(hashes[hashes <= threshold])
+    return sketch, np.concatenate(kept) if kept else np.array([], dtype=np.uint64)
+
+
+def _key_estimate(hashes, rate, members=True):
+    """Share of rows in a duplicate group (``members``, as ``duplicated(keep=False)``) or repeating an earlier row.
+
+    The sampled keys are clusters of rows, so the interval uses the ratio
+    estimator's variance over the keys at the effective sample size.
+    """
+    _, sizes = np.unique(hashes, return_counts=True)
+    total = int(sizes.sum())
+    if total == 0:
+        return 0.0, (0.0, 1.0)
+    flagged = np.where(sizes > 1, sizes if members else sizes - 1, 0)
+    p = float(flagged.sum() / total)
+    if rate >= 1:
+        return p, (p, p)
+    keys = len(sizes)
+    residuals = flagged - p * sizes
+    variance = (1 - rate) * keys / max(keys - 1, 1) * float(np.sum(residuals ** 2)) / total ** 2
+    effective = p * (1 - p) / variance if variance > 0 else total
+    return p, wilson_interval(p, effective)
+
+
+def stratified_sample(frame, size, strata=None, seed=None):
+    """Positions of a sample of about ``size`` rows, allocated to the ``strata`` groups by their share of the rows.
+
+    Every group gets at least one row; within a group rows are drawn uniformly
+    without replacement. Returns the sorted positions, the group code of each
+    sampled row, and the row count and sample count of each group.
+    """
+    rng = np.random.default_rng(seed)
+    total = len(frame)
+    if strata:
+        codes = frame.groupby(strata, dropna=False, sort=False).ngroup().to_numpy()
+    else:
+        codes = np.zeros(total, dtype=np.int64)
+    counts = np.bincount(codes, minlength=1)
+    share = size * counts / max(total, 1)
+    allocation = np.floor(share).astype(np.int64)
+    # Largest remainders take the rows left over by rounding down
+    allocation[np.argsort(allocation - share, kind='stable')[:max(size - allocation.sum(), 0)]] += 1
+    allocation = np.clip(allocation, np.minimum(counts, 1), counts)
+
+    order = np.argsort(codes, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    picked = [order[start + rng.choice(count, taken, replace=False)]
+              for start, count, taken in zip(starts, counts, allocation) if taken]
+    positions = np.sort(np.concatenate(picked)) if picked else np.array([], dtype=np.int64)
+    return positions, codes[positions], counts, allocation
+
+
+def _row_estimate(flagged, codes, population, sampled, census):
+    """Stratified estimate of the share of rows flagged, with a Wilson interval at the effective sample size."""
+    weights = population / population.sum()
+    hits = np.bincount(codes[flagged], minlength=len(population))
+    rates = np.divide(hits, sampled, out=np.zeros(len(population)), where=sampled > 0)
+    p = float(np.sum(weights * rates))
+    fpc = 1 - np.divide(sampled, population, out=np.ones(len(population)), where=population > 0)
+    variance = float(np.sum(np.divide(weights ** 2 * fpc * rates * (1 - rates), sampled,
+                                      out=np.zeros(len(population)), where=sampled > 0)))
+    if census:
+        return p, (p, p)
+    effective = p * (1 - p) / variance if variance > 0 else sampled.sum()
+    return p, wilson_interval(p, effective)
+
+
+def _estimate(step, check, column, method, found, rate, interval, rows, unit='rows'):
+    return {
+        'step': step,
+        'check': check,
+        'column': column,
+        'method': method,
+        'unit': unit,
+        'found_in_sample': int(found),
+        'estimated_rate': round(rate, 6),
+        'rate_low': round(interval[0], 6),
+        'rate_high': round(interval[1], 6),
+        'estimated_count': int(round(rate * rows)),
+    }
+
+
+def _finding(step, check, column, found):
+    return {'step': step, 'check': check, 'column': column, 'method': 'finding', 'unit': None, 'found_in_sample': found}
+
+
+def quick_scan(frame, configs=None, sample_size=QUICK_SCAN_SAMPLE_ROWS, strata=None, seed=None):
+    """Run the configured checks on a sample of ``frame`` and estimate how often each finds an issue.
+
+    The sample is stratified by the ``strata`` columns (cleaned names), or
+    uniform without them. Each check gets an estimated rate with a 95% Wilson
+    interval: the share of rows flagged (stratum-weighted), or of cells for
+    the checks that count per column. Duplicate checks are estimated from a
+    sample of keys instead, drawn by hashing their columns over all rows (as
+    loaded, before cleaning): the share of rows in a duplicate group, as the
+    checks flag them, or of repeated IDs for the generated ID check. Data no
+    larger than ``sample_size`` is checked in full.
+    """
+    configs = {**(configs or {}), 'export': None}
+    rows = len(frame)
+    raw_names = {clean_column_name(col): col for col in frame.columns}
+    strata = list(strata or [])
+    unknown = [col for col in strata if col not in raw_names]
+    if unknown:
+        raise ValueError(f"Unknown strata columns: {unknown}")
+    timings = {}
+
+    start = time.perf_counter()
+    census = rows <= sample_size
+    if census:
+        positions = np.arange(rows)
+        codes, population, sampled = np.zeros(rows, dtype=np.int64), np.array([rows]), np.array([rows])
+    else:
+        positions, codes, population, sampled = stratified_sample(
+            frame, sample_size, [raw_names[col] for col in strata], seed)
+    sample = frame.iloc[positions].reset_index(drop=True)
+    timings['sample'] = time.perf_counter() - start
+
+    pipeline = create_issue_pipeline(configs=configs)
+    result = run_pipeline(pipeline, sample)
+    timings.update(result['timings'])
+    sample_rows = len(sample)
+    cell_method = 'exact' if census else 'sample'
+
+    estimates = []
+    for name, step in pipeline.steps:
+        if name in result['skipped']:
+            continue
+        if isinstance(step, DISTINCT_CHECKS) and not census:
+            if isinstance(step, DuplicatesFromtheData):
+                columns = list(frame.columns)
+            elif isinstance(step, DuplicateIdentifier):
+                columns = step.columns
+            else:
+                columns = step.columns_to_concat if step.id_column else []
+            if not columns or any(col not in raw_names and col not in frame.columns for col in columns):
+                continue
+            start = time.perf_counter()
+            sketch, hashes = key_sample(frame, [raw_names.get(col, col) for col in columns], sample_size / rows)
+            timings[f"{name}_keys"] = time.perf_counter() - start
+            # The row checks flag every copy; the generated ID check counts the copies after the first
+            members = not isinstance(step, UniqueIDGenerator)
+            rate, interval = _key_estimate(hashes, sample_size / rows, members)
+            errors = result['errors'].get(name)
+            if members:
+                found = 0 if errors is None else len(errors)
+            else:
+                found = 0 if errors is None else int(errors['Duplicate_IDs'].sum())
+            estimate = _estimate(name, type(step).__name__, None, 'key_sample', found, rate, interval, rows,
+                                 unit='rows' if members else 'Duplicate_IDs')
+            estimate['keys_sampled'] = int(len(np.unique(hashes)))
+            estimate['distinct_keys'] = int(round(min(sketch.count(), rows)))
+            estimates.append(estimate)
+
+    for name, errors in result['errors'].items():
+        if any(estimate['step'] == name and estimate['method'] == 'key_sample' for estimate in estimates):
+            continue
+        check = str(errors['Check'].iloc[0]) if 'Check' in errors.columns else name
+        if 'Row_Index' in errors.columns:
+            by_column = errors.groupby('Column', sort=False) if 'Column' in errors.columns else [(None, errors)]
+            for column, group in by_column:
+                flagged = np.unique(group['Row_Index'].to_numpy(dtype=np.int64))
+                rate, interval = _row_estimate(flagged, codes, population, sampled, census)
+                estimates.append(_estimate(name, check, column, cell_method, len(flagged), rate, interval, rows))
+            continue
+        for record in errors.to_dict(orient='records'):
+            column = record.get('Column')
+            counted = [field for field in CELL_COUNT_FIELDS if pd.notna(record.get(field, np.nan))]
+            for field in counted:
+                rate = float(record[field]) / max(sample_rows, 1)
+                interval = (rate, rate) if census else wilson_interval(rate, sample_rows)
+                estimates.append(_estimate(name, check, column, cell_method, record[field], rate, interval, rows,
+                                           unit=field))
+            if not counted and 'Frequency' in record:
+                rate = float(record['Frequency'])
+                interval = (rate, rate) if census else wilson_interval(rate, sample_rows)
+                estimates.append(_estimate(name, check, column, cell_method, round(rate * sample_rows), rate,
+                                           interval, rows, unit='Most_Common_Value'))
+            elif not counted:
+                estimates.append(_finding(name, check, column, 1))
+
+    # Checks that found nothing in the sample still bound how often they could fail
+    nothing = (0.0, 0.0) if census else wilson_interval(0.0, sample_rows)
+    reported = {estimate['step'] for estimate in estimates}
+    for name, step in pipeline.steps:
+        if name in result['skipped'] or isinstance(step, (ColumnProfiler, IssueSaver, FinalSaver)):
+            continue
+        for step_name in getattr(step, 'step_names', (name,)):
+            if step_name not in reported:
+                check = FUSED_CHECKS.get(step_name, type(step).__name__)
+                if isinstance(step, STRUCTURAL_CHECKS):
+                    estimates.append(_finding(step_name, check, None, 0))
+                else:
+                    estimates.append(_estimate(step_name, check, None, cell_method, 0, 0.0, nothing, rows))
+
+    return {
+        'rows': rows,
+        'sample_rows': sample_rows,
+        'exact': bool(census),
+        'strata': strata,
+        'stratum_count': int(len(population)),
+        'seed': seed,
+        'confidence': 0.95,
+        'estimates': estimates,
+        'stopped_by': result['stopped_by'],
+        'timings': {name: round(seconds, 6) for name, seconds in timings.items()},
+    }
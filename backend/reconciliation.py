@@ -0,0 +1,266 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .artifacts import atomic_path
+from .runs import ISSUE_SCHEMA, ISSUE_ROW_GROUP_SIZE
+from .spill import DEFAULT_CHUNK_ROWS, PartitionSpill, iter_chunks
+
+RECONCILE_PARTITIONS = int(os.getenv("RECONCILE_PARTITIONS", "64"))
+RECONCILE_CHUNK_ROWS = int(os.getenv("RECONCILE_CHUNK_ROWS", str(DEFAULT_CHUNK_ROWS)))
+RECONCILE_SPILL_DIR = os.getenv("RECONCILE_SPILL_DIR") or None
+
+# Column mapping for the shipped policy_schedule.csv / premium_schedule.csv
+DEFAULT_RECONCILE_CONFIG = {
+    'key': 'policy_number',
+    'policy': {
+        'start_date': 'start_date',
+        'end_date': 'end_date',
+        'dayfirst': True,
+        'amounts': {'premium': 'premiums', 'commission': 'commission'},
+    },
+    'premium': {
+        'date': 'date_of_premium_payment',
+        'dayfirst': False,
+        'amounts': {'premium': 'amount', 'commission': 'commission'},
+    },
+    'tolerance': {'absolute': 0.01, 'relative': 0.0},
+}
+
+CHECKS = ('AmountMismatch', 'PaymentOutsideCoverage', 'PolicyWithoutPayment', 'PremiumWithoutPolicy')
+
+
+def reconcile_config(overrides=None):
+    """Defaults merged with ``overrides`` one level deep (per section)."""
+    config = json.loads(json.dumps(DEFAULT_RECONCILE_CONFIG))
+    for section, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(config.get(section), dict):
+            config[section].update(value)
+        else:
+            config[section] = value
+    return config
+
+
+def _dates(series, dayfirst):
+    return pd.to_datetime(series, dayfirst=dayfirst, errors='coerce')
+
+
+def _amounts(series):
+    return pd.to_numeric(series, errors='coerce').astype('float64')
+
+
+def _prepare(chunk, config, side, offset):
+    """Cast one chunk of a side to the fixed spill layout: key, row, dates, one float column per amount."""
+    side_config = config[side]
+    frame = pd.DataFrame({
+        'key': chunk[config['key']].astype('string').str.strip().astype(object),
+        'row': np.arange(offset, offset + len(chunk), dtype='int64'),
+    })
+    if side == 'policy':
+        frame['start'] = _dates(chunk[side_config['start_date']], side_config['dayfirst']).to_numpy()
+        frame['end'] = _dates(chunk[side_config['end_date']], side_config['dayfirst']).to_numpy()
+    else:
+        frame['date'] = _dates(chunk[side_config['date']], side_config['dayfirst']).to_numpy()
+    for field, column in side_config['amounts'].items():
+        frame[f"amount_{field}"] = _amounts(chunk[column]).to_numpy()
+    return frame
+
+
+def _side_columns(config, side):
+    side_config = config[side]
+    dates = [side_config['start_date'], side_config['end_date']] if side == 'policy' else [side_config['date']]
+    return [config['key']] + dates + list(side_config['amounts'].values())
+
+
+def _spill(path, config, side, spill, chunk_rows):
+    offset = 0
+    for chunk in iter_chunks(path, _side_columns(config, side), chunk_rows):
+        spill.write(_prepare(chunk, config, side, offset))
+        offset += len(chunk)
+    spill.close()
+    return offset
+
+
+class _IssueGroups:
+    """Issue rows spilled per (check, column) and assembled into one issue file in that order.
+
+    Groups come out contiguous and sorted, so the row group statistics of the
+    final file prune filters on check and column like :func:`runs.write_issues`
+    files, without holding all issues in memory.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self._writers = {}
+        self.counts = {}
+
+    def write(self, check, column, frame):
+        if len(frame) == 0:
+            return
+        key_frame = pd.DataFrame({'check': check, 'column': column or '', 'row_key': frame['row_key'], 'signature': frame['signature']})
+        table = pa.Table.from_pandas(pd.DataFrame({
+            'check': check,
+            'column': column,
+            'row_index': frame['row_index'].astype('int64'),
+            'row_key': frame['row_key'].astype('uint64'),
+            'issue_key': pd.util.hash_pandas_object(key_frame, index=False).to_numpy(),
+            'details': frame['details'],
+        }), schema=ISSUE_SCHEMA, preserve_index=False)
+        group = (check, column or '')
+        writer = self._writers.get(group)
+        if writer is None:
+            path = os.path.join(self.directory, f"issues-{len(self._writers):03d}.parquet")
+            writer = self._writers[group] = (path, pq.ParquetWriter(path, ISSUE_SCHEMA))
+        writer[1].write_table(table)
+        self.counts[check] = self.counts.get(check, 0) + len(frame)
+
+    def assemble(self, path):
+        with atomic_path(path) as tmp_path:
+            with pq.ParquetWriter(tmp_path, ISSUE_SCHEMA) as out:
+                for group in sorted(self._writers):
+                    group_path, writer = self._writers[group]
+                    writer.close()
+                    group_file = pq.ParquetFile(group_path)
+                    for batch in group_file.iter_batches(batch_size=ISSUE_ROW_GROUP_SIZE):
+                        out.write_table(pa.Table.from_batches([batch], ISSUE_SCHEMA), row_group_size=ISSUE_ROW_GROUP_SIZE)
+                if not self._writers:
+                    out.write_table(ISSUE_SCHEMA.empty_table())
+        return path
+
+
+def _details(frame):
+    if len(frame) == 0:
+        return pd.Series([], dtype=object)
+    lines = frame.to_json(orient='records', lines=True, date_format='iso').splitlines()
+    return pd.Series(lines, index=frame.index, dtype=object)
+
+
+def _key_hashes(keys):
+    return pd.util.hash_pandas_object(keys.reset_index(drop=True), index=False).to_numpy()
+
+
+def _issue_frame(rows, row_column, signature, detail_columns, renames=None):
+    details = rows[detail_columns].rename(columns=renames or {})
+    return pd.DataFrame({
+        'row_index': rows[row_column].to_numpy(),
+        'row_key': _key_hashes(rows['key']),
+        'signature': signature.astype(str).to_numpy(),
+        'details': _details(details).to_numpy(),
+    })
+
+
+def _reconcile_partition(policies, premiums, fields, tolerance, issues):
+    """Match one partition's premiums to policy periods and record what does not reconcile."""
+    premiums = premiums.reset_index(drop=True)
+    policies = policies.reset_index(drop=True)
+    premium_amounts = [f"amount_{field}" for field in fields]
+
+    known = premiums['key'].isin(policies['key'])
+    orphans = premiums[~known]
+    issues.write('PremiumWithoutPolicy', None, _issue_frame(
+        orphans, 'row', orphans['row'], ['key', 'date'] + premium_amounts, {'key': 'policy_number'}))
+
+    # Interval join: each payment goes to the period of its policy with the latest start on or before it
+    candidates = premiums[known & premiums['date'].notna()].sort_values('date', kind='stable')
+    periods = policies[policies['start'].notna()].sort_values('start', kind='stable')
+    periods = periods[['key', 'start', 'end', 'row'] + premium_amounts].rename(
+        columns={'row': 'policy_row', **{col: f"expected_{col[7:]}" for col in premium_amounts}})
+    matched = pd.merge_asof(candidates, periods, left_on='date', right_on='start', by='key', direction='backward')
+    covered = matched['policy_row'].notna() & (matched['end'].isna() | (matched['date'] <= matched['end']))
+
+    outside = pd.concat([matched[~covered], premiums[known & premiums['date'].isna()]], ignore_index=True)
+    issues.write('PaymentOutsideCoverage', None, _issue_frame(
+        outside, 'row', outside['row'], ['key', 'date'] + premium_amounts, {'key': 'policy_number'}))
+
+    matched = matched[covered].astype({'policy_row': 'int64'})
+    paid = matched.groupby('policy_row')[premium_amounts].sum()
+    unpaid = policies[~policies['row'].isin(paid.index)]
+    issues.write('PolicyWithoutPayment', None, _issue_frame(
+        unpaid, 'row', unpaid['start'], ['key', 'start', 'end'] + premium_amounts,
+        {'key': 'policy_number', **{col: f"expected_{col[7:]}" for col in premium_amounts}}))
+
+    paid_policies = policies.set_index('row').loc[paid.index]
+    payments = matched.groupby('policy_row').size()
+    for field in fields:
+        expected = paid_policies[f"amount_{field}"]
+        actual = paid[f"amount_{field}"]
+        difference = actual - expected
+        limit = tolerance.get('absolute', 0.0) + tolerance.get('relative', 0.0) * expected.abs()
+        mismatch = expected.notna() & (difference.abs() > limit)
+        if not mismatch.any():
+            continue
+        rows = pd.DataFrame({
+            'row': paid.index[mismatch],
+            'key': paid_policies['key'][mismatch].to_numpy(),
+            'start': paid_policies['start'][mismatch].to_numpy(),
+            'end': paid_policies['end'][mismatch].to_numpy(),
+            'expected': expected[mismatch].to_numpy(),
+            'actual': actual[mismatch].to_numpy(),
+            'difference': difference[mismatch].to_numpy(),
+            'payments': payments[mismatch].to_numpy(),
+        })
+        issues.write('AmountMismatch', field, _issue_frame(
+            rows, 'row', rows['start'], ['key', 'start', 'end', 'expected', 'actual', 'difference', 'payments'],
+            {'key': 'policy_number'}))
+    return len(matched)
+
+
+def reconcile(policy_path, premium_path, output_dir, config=None, partitions=RECONCILE_PARTITIONS,
+              chunk_rows=RECONCILE_CHUNK_ROWS, spill_dir=RECONCILE_SPILL_DIR):
+    """Reconcile a premium schedule against a policy schedule, streaming both files.
+
+    Both files are read in chunks and hash-partitioned on the key to disk;
+    each partition pair is then joined on its own: payments are matched to the
+    policy period covering their date (an as-of interval join), and payments
+    without a policy, payments outside every period, periods without a payment
+    and period totals that differ beyond the tolerance are written as issues
+    to ``output_dir/issues.parquet`` (``row_index`` is the row in the premium
+    file for payment issues and in the policy file for period issues).
+    Memory is bounded by one partition, not by the inputs.
+    """
+    config = reconcile_config(config)
+    fields = [field for field in config['policy']['amounts'] if field in config['premium']['amounts']]
+    timings = {}
+    work_dir = tempfile.mkdtemp(prefix='reconcile-', dir=spill_dir)
+    try:
+        start = time.perf_counter()
+        with PartitionSpill('key', partitions, os.path.join(work_dir, 'policy')) as policy_spill, \
+                PartitionSpill('key', partitions, os.path.join(work_dir, 'premium')) as premium_spill:
+            policy_rows = _spill(policy_path, config, 'policy', policy_spill, chunk_rows)
+            premium_rows = _spill(premium_path, config, 'premium', premium_spill, chunk_rows)
+            timings['partition'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            issues_dir = os.path.join(work_dir, 'issues')
+            os.makedirs(issues_dir)
+            issues = _IssueGroups(issues_dir)
+            matched = 0
+            for partition in range(partitions):
+                matched += _reconcile_partition(policy_spill.read(partition), premium_spill.read(partition),
+                                                fields, config['tolerance'], issues)
+            timings['join'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        issues_path = issues.assemble(os.path.join(output_dir, 'issues.parquet'))
+        timings['write'] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    summary = {
+        'policy_rows': policy_rows,
+        'premium_rows': premium_rows,
+        'matched_payments': matched,
+        'partitions': partitions,
+        'issue_counts': {check: issues.counts.get(check, 0) for check in CHECKS},
+        'total_issues': sum(issues.counts.values()),
+        'config': config,
+        'step_timings': {name: round(seconds, 6) for name, seconds in timings.items()},
+    }
+    with atomic_path(os.path.join(output_dir, 'reconciliation.json')) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, default=str)
+    return {**summary, 'issues_path': issues_path}
@@ -0,0 +1,349 @@
+import hashlib
+import io
+import json
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from .artifacts import atomic_path
+
+# Normalized issue table written for every run
+ISSUE_SCHEMA = pa.schema([
+    ('check', pa.string()),
+    ('column', pa.string()),
+    ('row_index', pa.int64()),    # null for column-level issues
+    ('row_key', pa.uint64()),     # hash of the row's key columns; null for column-level issues
+    ('issue_key', pa.uint64()),   # identifies "the same issue" across runs
+    ('details', pa.string()),     # JSON object with the check's diagnostic fields
+])
+
+# Issue files are sorted by these columns, so row group statistics prune filters on them
+ISSUE_SORT_COLUMNS = ('check', 'column', 'row_index')
+ISSUE_ROW_GROUP_SIZE = 64 * 1024
+
+_BOOKKEEPING_COLUMNS = {'Row_Index', 'Check', 'Column'}
+
+# Detail fields that tell apart different findings of one check on the same row
+# (the rule broken, the coverage issue, the segment judged, ...)
+_ROW_IDENTITY_COLUMNS = ('Rule', 'Issue', 'Group', 'Method', 'Expected_Values')
+
+
+def dataset_fingerprint(X):
+    """SHA-256 over column names, dtypes and a vectorized hash of every row."""
+    digest = hashlib.sha256()
+    for col, dtype in X.dtypes.items():
+        digest.update(f"{col}\x00{dtype}\x01".encode())
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def row_keys(X, key_columns=None):
+    """uint64 hash per row of ``key_columns`` (all columns when None), indexed like ``X``."""
+    key_columns = [col for col in (key_columns or []) if col in X.columns] or list(X.columns)
+    return pd.util.hash_pandas_object(X[key_columns], index=False)
+
+
+def _details_json(frame):
+    if frame.empty or len(frame.columns) == 0:
+        return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+    # to_json serializes the whole frame in C, avoiding a json.dumps call per issue
+    lines = frame.to_json(orient='records', lines=True, date_format='iso', default_handler=str).splitlines()
+    return pd.Series(lines, index=frame.index, dtype=object)
+
+
+def normalize_issues(errors, keys, data_columns=()):
+    """Flatten each step's ``errors`` DataFrame into one issue table (see ISSUE_SCHEMA).
+
+    Row-level issues (frames with ``Row_Index``) keep only their diagnostic
+    columns, not the copied data row, and are keyed by the row's hash in
+    ``keys`` and their identity fields (e.g. the rule broken). Column-level issues are keyed by check, column and the kind of
+    finding, so their counts can change while the issue still "persists".
+    """
+    data_columns = set(data_columns)
+    frames = []
+    for step_name, frame in errors.items():
+        if frame is None or frame.empty:
+            continue
+        frame = frame.reset_index(drop=True)
+        check = frame['Check'].astype(str) if 'Check' in frame.columns else pd.Series(step_name, index=frame.index)
+        column = frame['Column'].astype(str) if 'Column' in frame.columns else pd.Series(None, index=frame.index, dtype=object)
+        detail_columns = [col for col in frame.columns if col not in _BOOKKEEPING_COLUMNS]
+
+        if 'Row_Index' in frame.columns:
+            row_index = frame['Row_Index'].astype('int64')
+            detail_columns = [col for col in detail_columns if col not in data_columns]
+            row_key = pd.Series(keys.reindex(row_index.to_numpy()).to_numpy(), index=frame.index).astype('UInt64')
+            signature = pd.Series('', index=frame.index)
+            for col in _ROW_IDENTITY_COLUMNS:
+                if col in frame.columns:
+                    signature = signature + f'{col}=' + frame[col].astype(str) + '|'
+        else:
+            row_index = pd.Series(pd.NA, index=frame.index, dtype='Int64')
+            row_key = pd.Series(pd.NA, index=frame.index, dtype='UInt64')
+            signature = pd.Series('|'.join(sorted(map(str, detail_columns))), index=frame.index)
+
+        frames.append(pd.DataFrame({
+            'check': check,
+            'column': column,
+            'row_index': row_index.astype('Int64'),
+            'row_key': row_key,
+            'signature': signature,
+            'details': _details_json(frame[detail_columns]),
+        }))
+
+    if not frames:
+        return ISSUE_SCHEMA.empty_table().to_pandas()
+    issues = pd.concat(frames, ignore_index=True)
+    key_frame = pd.DataFrame({
+        'check': issues['check'],
+        'column': issues['column'].fillna(''),
+        'row_key': issues['row_key'].fillna(0).astype('uint64'),
+        'signature': issues['signature'],
+    })
+    issues['issue_key'] = pd.util.hash_pandas_object(key_frame, index=False).to_numpy()
+    return issues[ISSUE_SCHEMA.names]
+
+
+def issue_counts(issues):
+    return {check: int(count) for check, count in issues['check'].value_counts().items()}
+
+
+def _sort_order(issues):
+    """Positions that sort ``issues`` by check, column and row index, or None if already sorted.
+
+    Check and column have few distinct values, so together with the row index
+    they pack into one int64 key. Issues arrive grouped per check and mostly in
+    row order, which the stable (run-merging) sort handles in near-linear time.
+    """
+    if len(issues) < 2:
+        return None
+    checks = pd.factorize(issues['check'], sort=True)[0].astype('int64')
+    columns = pd.factorize(issues['column'], sort=True)[0].astype('int64') + 1  # nulls (-1) first
+    rows = issues['row_index'].to_numpy(dtype='float64', na_value=np.nan)
+    row_span = int(np.nanmax(rows)) + 2 if not np.isnan(rows).all() else 1
+    rows = np.where(np.isnan(rows), row_span - 1, rows).astype('int64')  # nulls last
+    column_span = int(columns.max()) + 1
+    if (int(checks.max()) + 1) * column_span * row_span >= np.iinfo('int64').max:
+        order = np.lexsort((rows, columns, checks))
+    else:
+        key = (checks * column_span + columns) * row_span + rows
+        if (key[1:] >= key[:-1]).all():
+            return None
+        order = np.argsort(key, kind='stable')
+    return order
+
+
+def write_issues(issues, path):
+    """Write the issue table as Parquet, atomically.
+
+    Rows are sorted by check, column and row index and written in small row
+    groups, so each group's min/max statistics cover a narrow key range and
+    :func:`query_issues` can skip groups that cannot match a filter.
+    """
+    table = pa.Table.from_pandas(issues, schema=ISSUE_SCHEMA, preserve_index=False)
+    order = _sort_order(issues)
+    if order is not None:
+        table = table.take(pa.array(order))
+    with atomic_path(path) as tmp_path:
+        pq.write_table(table, tmp_path, row_group_size=ISSUE_ROW_GROUP_SIZE)
+    return path
+
+
+def _issue_keys(path):
+    """Read just the check (dictionary-encoded) and issue_key columns of an issue file."""
+    table = pq.read_table(path, columns=['check', 'issue_key'], read_dictionary=['check'])
+    checks = table.column('check').combine_chunks()
+    return checks.dictionary.to_pylist(), checks.indices.to_numpy(zero_copy_only=False), table.column('issue_key').to_numpy()
+
+
+def _occurrence_keys(keys):
+    """``keys`` combined with their occurrence ordinal, so repeated keys stay distinct."""
+    keys = pd.Series(keys)
+    ordinal = keys.groupby(keys.to_numpy(), sort=False).cumcount()
+    return pd.util.hash_pandas_object(pd.DataFrame({'key': keys, 'ordinal': ordinal}), index=False).to_numpy()
+
+
+def _per_check(names, codes, mask):
+    counts = np.bincount(codes[mask], minlength=len(names))
+    return {name: int(count) for name, count in zip(names, counts) if count}
+
+
+def _row_group_starts(parquet_file):
+    return np.cumsum([0] + [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)])
+
+
+def _take(parquet_file, starts, positions, columns=None):
+    """Rows at file ``positions`` (in the given order), reading only the row groups that hold them."""
+    groups = np.searchsorted(starts, positions, side='right') - 1
+    tables, order = [], []
+    for group in np.unique(groups):
+        in_group = groups == group
+        table = parquet_file.read_row_group(int(group), columns=columns)
+        tables.append(table.take(pa.array(positions[in_group] - starts[group])))
+        order.append(np.flatnonzero(in_group))
+    if not tables:
+        return parquet_file.schema_arrow.empty_table().select(columns or parquet_file.schema_arrow.names)
+    return pa.concat_tables(tables).take(pa.array(np.argsort(np.concatenate(order), kind='stable')))
+
+
+def _sample(path, mask, limit):
+    """The first ``limit`` rows of ``path`` where ``mask`` is set."""
+    positions = np.flatnonzero(mask)[:limit]
+    if len(positions) == 0:
+        return []
+    parquet_file = pq.ParquetFile(path)
+    return _take(parquet_file, _row_group_starts(parquet_file), positions).to_pylist()
+
+
+def issue_filter(checks=None, columns=None, row_min=None, row_max=None):
+    """Dataset expression selecting issues by check, column and row index range (None matches everything)."""
+    conditions = []
+    if checks:
+        conditions.append(ds.field('check').isin(list(checks)))
+    if columns:
+        conditions.append(ds.field('column').isin(list(columns)))
+    if row_min is not None:
+        conditions.append(ds.field('row_index') >= row_min)
+    if row_max is not None:
+        conditions.append(ds.field('row_index') <= row_max)
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _candidate_row_groups(path, expression):
+    """Row groups whose statistics say they may hold rows matching ``expression``."""
+    fragment = next(iter(ds.dataset(path, format='parquet').get_fragments()))
+    if expression is None:
+        return [row_group.id for row_group in fragment.row_groups]
+    return [piece.row_groups[0].id for piece in fragment.split_by_row_group(expression)]
+
+
+def _scan(parquet_file, starts, groups, expression, columns=None, from_position=0):
+    """Yield matching rows of the candidate ``groups`` with their file position in ``_pos``."""
+    for group in groups:
+        if starts[group + 1] <= from_position:
+            continue
+        table = parquet_file.read_row_group(group, columns=columns)
+        table = table.append_column('_pos', pa.array(np.arange(starts[group], starts[group + 1]), pa.int64()))
+        condition = expression
+        if from_position > starts[group]:
+            after = ds.field('_pos') >= from_position
+            condition = after if condition is None else condition & after
+        if condition is not None:
+            table = table.filter(condition)
+        if table.num_rows:
+            yield table
+
+
+def query_issues(path, expression=None, sort=None, limit=100, position=0, offset=0):
+    """One page of the issues in ``path`` matching ``expression``.
+
+    Without ``sort`` rows come in file order (check, column, row index) and
+    pagination is a keyset on the file position: a page reads only the candidate
+    row groups from ``position`` on and stops once it has ``limit`` rows.
+    ``sort`` is a list of ``(column, 'ascending'|'descending')``; then only the
+    sort keys of the matching rows are read and sorted, the page is cut at
+    ``offset`` and just its rows are fetched.
+
+    Returns ``(table, next)`` where ``next`` is the position (or offset) of the
+    next page, or None on the last page.
+    """
+    parquet_file = pq.ParquetFile(path)
+    starts = _row_group_starts(parquet_file)
+    groups = _candidate_row_groups(path, expression)
+
+    if not sort:
+        pieces, found = [], 0
+        for table in _scan(parquet_file, starts, groups, expression, from_position=position):
+            pieces.append(table)
+            found += table.num_rows
+            if found > limit:
+                break
+        if not pieces:
+            return ISSUE_SCHEMA.empty_table(), None
+        page = pa.concat_tables(pieces).slice(0, limit + 1)
+        next_position = page.column('_pos')[limit].as_py() if page.num_rows > limit else None
+        return page.slice(0, limit).drop_columns(['_pos']), next_position
+
+    # The sort keys are also the only columns a filter can reference
+    keys = list(_scan(parquet_file, starts, groups, expression, columns=list(ISSUE_SORT_COLUMNS)))
+    if not keys:
+        return ISSUE_SCHEMA.empty_table(), None
+    keys = pa.concat_tables(keys).sort_by(list(sort) + [('_pos', 'ascending')])
+    window = keys.column('_pos').to_numpy()[offset:offset + limit + 1]
+    page = _take(parquet_file, starts, window[:limit])
+    return page, (offset + limit if len(window) > limit else None)
+
+
+def issue_facets(path):
+    """Issue count per (check, column), from the two dictionary-encoded columns only."""
+    table = pq.read_table(path, columns=['check', 'column'])
+    counts = table.group_by(['check', 'column']).aggregate([('check', 'count')]).sort_by([('check', 'ascending'), ('column', 'ascending')])
+    return [
+        {'check': row['check'], 'column': row['column'], 'issues': row['check_count']}
+        for row in counts.to_pylist()
+    ]
+
+
+def iter_ndjson(table, batch_size=1000):
+    """Serialize ``table`` as newline-delimited JSON, one chunk per batch.
+
+    ``details`` already holds a JSON object, so it is spliced in as-is instead of
+    being decoded and encoded again.
+    """
+    for batch in table.to_batches(max_chunksize=batch_size):
+        lines = []
+        for row in batch.to_pylist():
+            details = row.pop('details', None)
+            lines.append(f"{json.dumps(row)[:-1]}, \"details\": {details or 'null'}}}\n")
+        yield ''.join(lines).encode()
+
+
+def iter_arrow_ipc(table, batch_size=64 * 1024):
+    """Serialize ``table`` in the Arrow IPC streaming format, one chunk per record batch."""
+    buffer = io.BytesIO()
+    with pa.ipc.new_stream(buffer, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=batch_size):
+            writer.write_batch(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    # End-of-stream marker
+    yield buffer.getvalue()
+
+
+def compare_issue_files(base_path, head_path, sample_size=100):
+    """Diff two runs' issue tables into new, resolved and persisting issues.
+
+    Only ``check`` and ``issue_key`` are read for the diff; membership is tested
+    with pandas' hash-table ``isin`` on the uint64 keys (a hash join), so the
+    cost is linear in the number of issues. Keys are compared as multisets:
+    the n-th occurrence of a key only matches an n-th occurrence, so when a
+    duplicated row loses a copy one issue is resolved and the rest persist.
+    Samples of new/resolved issues are then read from the row groups that
+    contain them.
+    """
+    base_names, base_codes, base_keys = _issue_keys(base_path)
+    head_names, head_codes, head_keys = _issue_keys(head_path)
+    base_keys, head_keys = _occurrence_keys(base_keys), _occurrence_keys(head_keys)
+    in_base = pd.Series(head_keys).isin(base_keys).to_numpy()
+    in_head = pd.Series(base_keys).isin(head_keys).to_numpy()
+
+    return {
+        'counts': {
+            'new': int((~in_base).sum()),
+            'resolved': int((~in_head).sum()),
+            'persisting': int(in_base.sum()),
+        },
+        'by_check': {
+            'new': _per_check(head_names, head_codes, ~in_base),
+            'resolved': _per_check(base_names, base_codes, ~in_head),
+            'persisting': _per_check(head_names, head_codes, in_base),
+        },
+        'new': _sample(head_path, ~in_base, sample_size),
+        'resolved': _sample(base_path, ~in_head, sample_size),
+    }
+
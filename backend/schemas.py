@@ -26,6 +26,13 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class UserSummary(BaseModel):
+    id: int
+    username: str
+    
+    class Config:
+        from_attributes = True
+
 # Project schemas
 class ProjectBase(BaseModel):
     name: str
@@ -67,6 +74,25 @@ class Log(LogBase):
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
     created_at: datetime
+    user: Optional[UserSummary] = None
+    
+    class Config:
+        from_attributes = True
+
+# Run schemas
+class Run(BaseModel):
+    id: int
+    run_uuid: str
+    project_id: int
+    user_id: int
+    dataset_fingerprint: Optional[str] = None
+    row_count: Optional[int] = None
+    column_count: Optional[int] = None
+    config: Optional[dict] = None
+    step_timings: Optional[dict] = None
+    issue_counts: Optional[dict] = None
+    total_issues: int
+    created_at: datetime
     
     class Config:
         from_attributes = True
@@ -79,6 +105,20 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
 
+# Resumable upload schemas
+class UploadInitiate(BaseModel):
+    filename: str
+    total_size: int
+    part_size: Optional[int] = None
+
+class UploadComplete(BaseModel):
+    checksum: Optional[str] = None
+
+# Database table source
+class SqlSourceConnect(BaseModel):
+    url: str
+    table: str
+
 # Response schemas
 class MessageResponse(BaseModel):
     message: str
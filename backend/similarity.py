@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from .progress import checkpoint
+
+# Mersenne prime for the MinHash permutations; a * gram + b stays below 2**64
+MERSENNE_PRIME = (1 << 31) - 1
+DEFAULT_MAX_LENGTH = 48
+SIGNATURE_CHUNK_ROWS = 100_000
+KERNEL_CHUNK_PAIRS = 200_000
+
+
+def normalize_strings(values):
+    """Upper-case ASCII with accents folded and every run of other characters as one space.
+
+    ``EUCEBIA__DUBE_3`` and ``eucebia dube-3`` both become ``EUCEBIA DUBE 3``.
+    """
+    text = pd.Series(values, dtype='string').fillna('')
+    text = text.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+    return text.str.upper().str.replace(r'[^A-Z0-9]+', ' ', regex=True).str.strip()
+
+
+def char_matrix(strings, max_length=DEFAULT_MAX_LENGTH):
+    """ASCII strings as a zero-padded (n, max_length) uint8 matrix and their (truncated) lengths."""
+    strings = np.asarray(strings, dtype=object)
+    lengths = np.minimum(pd.Series(strings, dtype='string').str.len().to_numpy(dtype='int64'), max_length)
+    matrix = np.array(strings, dtype=f'S{max_length}').view(np.uint8).reshape(len(strings), max_length)
+    return matrix, lengths
+
+
+def minhash_signatures(matrix, lengths, num_perm=32, seed=0):
+    """MinHash signature (n, num_perm) over the character 3-grams of each row of ``matrix``.
+
+    Rows are padded with a space on both sides, so short strings and word
+    boundaries get grams too. Each gram is its three bytes packed in 24 bits.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    n, width = matrix.shape
+    signatures = np.empty((n, num_perm), dtype=np.uint64)
+    for start in range(0, n, SIGNATURE_CHUNK_ROWS):
+        checkpoint()
+        rows = matrix[start:start + SIGNATURE_CHUNK_ROWS]
+        padded = np.full((len(rows), width + 2), ord(' '), dtype=np.uint64)
+        padded[:, 1:-1] = rows
+        row_lengths = lengths[start:start + SIGNATURE_CHUNK_ROWS]
+        padded[np.arange(len(rows)), row_lengths + 1] = ord(' ')
+        grams = (padded[:, :-2] << np.uint64(16)) | (padded[:, 1:-1] << np.uint64(8)) | padded[:, 2:]
+        # A string of length l has l grams ("␣ab", ..., "yz␣"), at least one
+        valid = np.arange(width) < np.maximum(row_lengths, 1)[:, None]
+        for k in range(num_perm):
+            hashed = (a[k] * grams + b[k]) % np.uint64(MERSENNE_PRIME)
+            hashed[~valid] = MERSENNE_PRIME
+            signatures[start:start + len(rows), k] = hashed.min(axis=1)
+    return signatures
+
+
+def lsh_candidate_pairs(signatures, bands, blocks=None, window=20):
+    """Pairs (i < j) of rows sharing at least one LSH band (and their block, when given).
+
+    Rows are sorted by band key and each row is paired with the following
+    ``window`` rows of the same key, so a huge bucket costs O(size * window)
+    instead of O(size ** 2).
+    """
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    pairs = np.empty(0, dtype=np.int64)
+    for band in range(bands):
+        checkpoint()
+        found = [pairs]
+        key = np.zeros(n, dtype=np.uint64) if blocks is None else blocks.astype(np.uint64)
+        for column in range(band * rows_per_band, (band + 1) * rows_per_band):
+            key = key * np.uint64(0x9E3779B97F4A7C15) + signatures[:, column]
+        order = np.argsort(key, kind='stable')
+        sorted_key = key[order]
+        for distance in range(1, min(window, n - 1) + 1):
+            same = np.flatnonzero(sorted_key[distance:] == sorted_key[:-distance])
+            if len(same) == 0:
+                break
+            left, right = order[same], order[same + distance]
+            found.append(np.minimum(left, right).astype(np.int64) * n + np.maximum(left, right))
+        # Deduplicate per band, so memory follows distinct pairs rather than bands x pairs
+        pairs = np.unique(np.concatenate(found))
+    return pairs // n, pairs % n
+
+
+def levenshtein_similarity(matrix, lengths, left, right):
+    """1 - edit distance / longer length for each pair of rows, computed for all pairs at once.
+
+    The dynamic programme runs over character positions (at most
+    ``max_length`` squared steps), each step vectorized across the pairs.
+    """
+    similarity = np.empty(len(left), dtype='float64')
+    for start in range(0, len(left), KERNEL_CHUNK_PAIRS):
+        checkpoint()
+        a = matrix[left[start:start + KERNEL_CHUNK_PAIRS]]
+        b = matrix[right[start:start + KERNEL_CHUNK_PAIRS]]
+        len_a = lengths[left[start:start + KERNEL_CHUNK_PAIRS]]
+        len_b = lengths[right[start:start + KERNEL_CHUNK_PAIRS]]
+        width_a, width_b = int(len_a.max(initial=0)), int(len_b.max(initial=0))
+        pairs = np.arange(len(a))
+        previous = np.broadcast_to(np.arange(width_b + 1, dtype=np.int32), (len(a), width_b + 1)).copy()
+        distance = previous[pairs, len_b].copy()  # for empty left strings
+        for i in range(1, width_a + 1):
+            current = np.empty_like(previous)
+            current[:, 0] = i
+            substitution = previous[:, :-1] + (a[:, i - 1:i] != b[:, :width_b])
+            deletion = previous[:, 1:] + 1
+            best = np.minimum(substitution, deletion)
+            for j in range(1, width_b + 1):
+                current[:, j] = np.minimum(best[:, j - 1], current[:, j - 1] + 1)
+            done = len_a == i
+            distance[done] = current[done, len_b[done]]
+            previous = current
+        longer = np.maximum(np.maximum(len_a, len_b), 1)
+        similarity[start:start + len(a)] = 1.0 - distance / longer
+    return similarity
+
+
+def connected_components(n, left, right):
+    """Component label (smallest member) per node of the undirected graph given by edges left-right."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        # Hook both endpoints and their current roots onto the smaller label
+        for nodes in (left, right, labels[left], labels[right]):
+            np.minimum.at(updated, nodes, low)
+        while True:  # pointer jumping until every node points at a root
+            jumped = updated[updated]
+            if (jumped == updated).all():
+                break
+            updated = jumped
+        if (updated == labels).all():
+            return labels
+        labels = updated
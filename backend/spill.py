@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+
+def iter_chunks(path, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield ``path`` as DataFrames of at most ``chunk_rows`` rows without loading the whole file.
+
+    CSV is read as strings (typing is left to the caller, so every chunk comes
+    out the same); Parquet keeps its stored types. Excel has no streaming
+    reader and is read whole, then sliced.
+    """
+    if path.endswith('.csv'):
+        include = list(columns) if columns else None
+        read_options = pa_csv.ReadOptions(block_size=64 * 1024 * 1024, encoding='utf-8')
+        convert_options = pa_csv.ConvertOptions(include_columns=include, strings_can_be_null=True,
+                                                column_types={col: pa.string() for col in include or []})
+        with pa_csv.open_csv(path, read_options=read_options, convert_options=convert_options) as reader:
+            for batch in reader:
+                frame = batch.to_pandas()
+                for start in range(0, len(frame), chunk_rows):
+                    yield frame.iloc[start:start + chunk_rows]
+    elif path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=list(columns) if columns else None):
+            yield batch.to_pandas()
+    elif path.endswith('.xlsx'):
+        frame = pd.read_excel(path, usecols=list(columns) if columns else None)
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+    else:
+        raise ValueError("Unsupported file format.")
+
+
+class PartitionSpill:
+    """Hash-partition DataFrame chunks on a key into on-disk Parquet partitions.
+
+    Rows with equal keys always land in the same partition, so two datasets
+    spilled with the same ``partitions`` can be joined one partition pair at a
+    time with memory bounded by the largest partition instead of the inputs.
+    Every chunk must have the same columns and dtypes.
+    """
+    def __init__(self, key, partitions, directory=None):
+        self.key = key
+        self.partitions = partitions
+        self.directory = directory or tempfile.mkdtemp(prefix='spill-')
+        os.makedirs(self.directory, exist_ok=True)
+        self._writers = {}
+        self._schema = None
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+    def partition_of(self, keys):
+        return (pd.util.hash_pandas_object(keys, index=False).to_numpy() % self.partitions).astype('int64')
+
+    def write(self, frame):
+        if len(frame) == 0:
+            return
+        table = pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        self._schema = table.schema
+        parts = self.partition_of(frame[self.key])
+        order = parts.argsort(kind='stable')
+        bounds = parts[order].searchsorted(range(self.partitions + 1))
+        table = table.take(pa.array(order))
+        for partition in range(self.partitions):
+            start, end = bounds[partition], bounds[partition + 1]
+            if start == end:
+                continue
+            writer = self._writers.get(partition)
+            if writer is None:
+                path = os.path.join(self.directory, f"part-{partition:05d}.parquet")
+                writer = self._writers[partition] = pq.ParquetWriter(path, self._schema, compression='lz4')
+            writer.write_table(table.slice(start, end - start))
+        self.rows += len(frame)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def read(self, partition):
+        """Rows of one partition, or an empty frame (with the spilled columns, if any)."""
+        path = os.path.join(self.directory, f"part-{partition:05d}.parquet")
+        if not os.path.exists(path):
+            return self._schema.empty_table().to_pandas() if self._schema is not None else pd.DataFrame()
+        return pq.read_table(path).to_pandas()
+
+    def cleanup(self):
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
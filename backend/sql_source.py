@@ -0,0 +1,646 @@
+import datetime
+import os
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import MetaData, Table, and_, case, create_engine, extract, false, func, literal, literal_column, or_, select, true, union_all
+from sqlalchemy import types as sqltypes
+from .custom_transformers import (
+    ColumnNameCleaner,
+    MandatoryColumnsChecker,
+    TextCleaner,
+    NumericConverter,
+    DateConverter,
+    ColumnProfiler,
+    MissingValuesDetector,
+    DuplicatesFromtheData,
+    DuplicateIdentifier,
+    FuzzyDuplicateDetector,
+    IDValidator,
+    NegativeZeroChecker,
+    YearFilter,
+    StartEndYearComparator,
+    CoveragePeriodChecker,
+    ConstantValueDetector,
+    OutlierDetector,
+    CategoryValidator,
+    UniqueIDGenerator,
+    ColumnFilter,
+    IssueSaver,
+    FinalSaver
+)
+from .database import engine_options
+from .pipeline import Pipeline, run_pipeline
+from .progress import checkpoint
+from .runs import row_keys
+
+# Rows per round trip of the server-side cursor, and per Arrow batch
+SQL_SOURCE_BATCH_ROWS = int(os.getenv("SQL_SOURCE_BATCH_ROWS", "65536"))
+
+# Steps that only look at column names; they run first, on an empty frame with the table's columns
+LEADING_STEPS = (ColumnNameCleaner, MandatoryColumnsChecker)
+
+# How each kind of database column is read; 'other' columns are read as text and never pushed down
+ARROW_TYPES = {
+    'int': pa.int64(),
+    'float': pa.float64(),
+    'bool': pa.bool_(),
+    'datetime': pa.timestamp('us'),
+    'str': pa.string(),
+    'other': pa.string(),
+}
+NUMERIC_KINDS = ('int', 'float')
+COMPARABLE_KINDS = ('int', 'float', 'bool', 'datetime', 'str')
+
+
+def _kind(sql_type):
+    if isinstance(sql_type, sqltypes.Boolean):
+        return 'bool'
+    if isinstance(sql_type, sqltypes.Integer):
+        return 'int'
+    if isinstance(sql_type, sqltypes.Numeric):
+        return 'float'
+    if isinstance(sql_type, (sqltypes.DateTime, sqltypes.Date)):
+        return 'datetime'
+    if isinstance(sql_type, sqltypes.String):
+        return 'str'
+    return 'other'
+
+
+def _convert(value, kind):
+    if value is None:
+        return None
+    if kind == 'float':
+        return float(value)
+    if kind == 'int':
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{value!r} is not an integer")
+        return int(value)
+    if kind == 'bool':
+        return bool(value)
+    if kind == 'datetime':
+        return value if isinstance(value, datetime.datetime) else datetime.datetime.combine(value, datetime.time())
+    return value if isinstance(value, str) else str(value)
+
+
+def _arrow_array(values, kind, name):
+    try:
+        return pa.array(values, ARROW_TYPES[kind])
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        pass
+    # Decimals, dates, and SQLite values stored against the declared type
+    try:
+        return pa.array([_convert(value, kind) for value in values], ARROW_TYPES[kind])
+    except (ValueError, TypeError, OverflowError, pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"Column '{name}' holds a value that is not {kind}: {e}")
+
+
+def _to_pandas(table, kinds, has_nulls):
+    """Arrow table to pandas as a read of the whole column would give it (ints with nulls as floats)."""
+    frame = table.to_pandas(coerce_temporal_nanoseconds=True)
+    for col in frame.columns:
+        if has_nulls.get(col):
+            if kinds[col] == 'int':
+                frame[col] = frame[col].astype('float64')
+            elif kinds[col] == 'bool':
+                frame[col] = frame[col].astype(object)
+    return frame
+
+
+class SqlSource:
+    """One table of a SQLite or PostgreSQL database, read as the dataset or checked where it lives.
+
+    Rows are numbered in primary key order (rowid on SQLite tables without
+    one, every column otherwise). ``read_frame`` returns them in that order,
+    and issues found in the database carry the same row indexes.
+    """
+    def __init__(self, url, table, batch_rows=SQL_SOURCE_BATCH_ROWS):
+        self.url = url
+        self.table_name = table
+        self.batch_rows = batch_rows
+        self.engine = create_engine(url, **engine_options(url))
+        try:
+            self.table = Table(table, MetaData(), autoload_with=self.engine)
+        except Exception:
+            self.engine.dispose()
+            raise
+        self.kinds = {col.name: _kind(col.type) for col in self.table.columns}
+        self.dialect = self.engine.dialect.name
+
+    @property
+    def columns(self):
+        return [col.name for col in self.table.columns]
+
+    def schema(self):
+        return [{'name': col.name, 'dtype': str(col.type), 'kind': self.kinds[col.name]} for col in self.table.columns]
+
+    def order_by(self):
+        keys = list(self.table.primary_key.columns)
+        if keys:
+            return keys
+        if self.dialect == 'sqlite':
+            return [literal_column('rowid')]
+        return list(self.table.columns)
+
+    def is_nan(self, expression):
+        """NaN test for float columns; SQLite stores NaN as NULL, so only PostgreSQL has any."""
+        if self.dialect == 'postgresql':
+            return expression == literal(float('nan'))
+        return false()
+
+    def execute(self, statement):
+        with self.engine.connect() as conn:
+            return conn.execute(statement).all()
+
+    def row_count(self):
+        return self.execute(select(func.count()).select_from(self.table))[0][0]
+
+    def arrow_schema(self, columns):
+        return pa.schema([(col, ARROW_TYPES[self.kinds[col]]) for col in columns])
+
+    def iter_batches(self, columns=None, limit=None):
+        """Yield the rows of ``columns`` as Arrow record batches, fetched from a server-side cursor."""
+        columns = self.columns if columns is None else list(columns)
+        if not columns:
+            return
+        schema = self.arrow_schema(columns)
+        statement = select(*[self.table.c[col] for col in columns]).order_by(*self.order_by())
+        if limit is not None:
+            statement = statement.limit(limit)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=self.batch_rows).execute(statement)
+            for rows in result.partitions():
+                checkpoint()
+                values = list(zip(*rows))
+                yield pa.RecordBatch.from_arrays(
+                    [_arrow_array(list(column_values), self.kinds[col], col) for col, column_values in zip(columns, values)],
+                    schema=schema)
+
+    def read_frame(self, columns=None, limit=None):
+        """The table (or ``columns`` of it) as a pandas frame, built from Arrow batches."""
+        columns = self.columns if columns is None else list(columns)
+        table = pa.Table.from_batches(list(self.iter_batches(columns, limit)), schema=self.arrow_schema(columns))
+        return _to_pandas(table, self.kinds, {col: table.column(col).null_count > 0 for col in columns})
+
+    def dispose(self):
+        self.engine.dispose()
+
+
+class _Pushdown:
+    """One run of a pipeline over a source: what the transforms change, what ran in SQL, what pandas still needs.
+
+    A check is pushed down when it has a SQL translation and every column it
+    reads reaches it as stored: text cleaning always changes a column, the
+    numeric and date conversions only change columns not already of their
+    type. Everything else runs on pandas over just the columns it reads.
+    """
+    def __init__(self, source, names):
+        self.source = source
+        self.names = names  # cleaned column name -> column name in the database
+        self.kinds = {col: source.kinds[raw] for col, raw in names.items()}
+        self.row = '__row__'
+        while self.row in names:
+            self.row += '_'
+        self.count = f"{self.row}count"
+        self.changed = set()
+        self.errors = {}
+        self.timings = {}
+        self.pushed_down = []
+        self.pandas_steps = []
+        self.pulled = set()
+        self.unions = set()  # steps whose SQL and pandas parts flag rows of the same kind
+        self.column_order = {}  # step name -> its columns, the order its findings are listed in
+
+    def native(self, col, kinds=COMPARABLE_KINDS + ('other',)):
+        """Whether ``col`` reaches the checks as stored, and is of one of ``kinds``."""
+        return col in self.names and col not in self.changed and self.kinds[col] in kinds
+
+    def column(self, col):
+        return self.source.table.c[self.names[col]]
+
+    def missing(self, expression, col):
+        if self.kinds[col] == 'float':
+            return or_(expression.is_(None), self.source.is_nan(expression))
+        return expression.is_(None)
+
+    def numbered(self, columns, **windows):
+        """Subquery of ``columns`` under their cleaned names, each row's position and the ``windows``."""
+        position = func.row_number().over(order_by=self.source.order_by()) - 1
+        return select(*[self.column(col).label(col) for col in columns], position.label(self.row),
+                      *[expression.label(label) for label, expression in windows.items()]).subquery()
+
+    def positions(self, columns, where, **windows):
+        """Positions of the rows ``where(numbered)`` selects; only these come back from the database."""
+        numbered = self.numbered(columns, **windows)
+        statement = select(numbered.c[self.row]).where(where(numbered)).order_by(numbered.c[self.row])
+        return np.asarray([row[0] for row in self.source.execute(statement)], dtype='int64')
+
+    def push(self, name, errors):
+        if name not in self.pushed_down:
+            self.pushed_down.append(name)
+        if errors is not None and not errors.empty:
+            if name in self.errors:
+                errors = pd.concat([self.errors[name], errors], ignore_index=True)
+            self.errors[name] = errors
+
+    def to_pandas(self, name, step, columns):
+        self.pandas_steps.append((name, step))
+        self.pulled.update(col for col in columns if col in self.names)
+
+
+def _with_params(step, **params):
+    """A copy of ``step`` with some parameters replaced; shared objects such as the profile stay shared."""
+    return type(step)(**{**step.get_params(), **params})
+
+
+def _row_errors(positions, check, **extra):
+    if len(positions) == 0:
+        return None
+    errors = pd.DataFrame({'Row_Index': positions})
+    errors['Check'] = check
+    for key, value in extra.items():
+        errors[key] = value
+    return errors
+
+
+def _text_cleaner(ctx, name, step):
+    columns = [col for col in step.columns if col in ctx.names]
+    ctx.changed.update(columns)
+    if columns:
+        ctx.to_pandas(name, step, columns)
+
+
+def _numeric_converter(ctx, name, step):
+    # to_numeric leaves integer and float columns as they are
+    columns = [col for col in step.columns if col in ctx.names and not ctx.native(col, NUMERIC_KINDS)]
+    ctx.changed.update(columns)
+    if columns:
+        ctx.to_pandas(name, _with_params(step, columns=columns), columns)
+
+
+def _date_converter(ctx, name, step):
+    columns = [col for col in step.columns if col in ctx.names and not ctx.native(col, ('datetime',))]
+    ctx.changed.update(columns)
+    if columns:
+        ctx.to_pandas(name, _with_params(step, columns=columns), columns)
+
+
+def _column_profiler(ctx, name, step):
+    # Profiles the pulled columns for the checks that run on pandas; its columns are narrowed once those are known
+    ctx.pandas_steps.append((name, step))
+
+
+def _missing_values_detector(ctx, name, step):
+    columns = step.columns if step.columns else list(ctx.names)
+    if any(col not in ctx.names for col in columns):
+        # pandas fails on the missing column, as it does on the loaded data
+        ctx.to_pandas(name, step, columns)
+        return
+    native = [col for col in columns if ctx.native(col)]
+    changed = [col for col in columns if col not in native]
+    ctx.unions.add(name)
+    if changed:
+        ctx.to_pandas(name, _with_params(step, columns=changed), changed)
+    if native:
+        positions = ctx.positions(native, lambda t: or_(*[ctx.missing(t.c[col], col) for col in native]))
+        ctx.push(name, _row_errors(positions, 'MissingValuesDetector'))
+
+
+def _duplicate_rows(ctx, name, step, columns, check, **extra):
+    if all(ctx.native(col, COMPARABLE_KINDS) for col in columns):
+        # Each row's group size as a window, so the duplicates come back without a join; NULLs group together as in pandas
+        group_size = func.count().over(partition_by=[ctx.column(col) for col in columns])
+        positions = ctx.positions(columns, lambda t: t.c[ctx.count] > 1, **{ctx.count: group_size})
+        ctx.push(name, _row_errors(positions, check, **extra))
+    else:
+        ctx.to_pandas(name, step, list(ctx.names) if isinstance(step, DuplicatesFromtheData) else columns)
+
+
+def _duplicates_from_data(ctx, name, step):
+    _duplicate_rows(ctx, name, step, list(ctx.names), 'DuplicatesFromtheData')
+
+
+def _duplicate_identifier(ctx, name, step):
+    if not step.columns:
+        return
+    _duplicate_rows(ctx, name, step, step.columns, 'DuplicateIdentifier', Key_Columns=str(step.columns))
+
+
+def _id_validator(ctx, name, step):
+    col = step.id_column
+    if not col or col not in ctx.names:
+        return
+    if not ctx.native(col, NUMERIC_KINDS + ('datetime',)):
+        # Blank text IDs are judged by Python's strip, which SQL cannot match exactly
+        ctx.to_pandas(name, step, [col])
+        return
+    # Numbers and timestamps are never blank, so only missing IDs are counted
+    missing_ids = ctx.source.execute(select(func.sum(case((ctx.missing(ctx.column(col), col), 1), else_=0))))[0][0] or 0
+    issues = [{'Column': col, 'Missing_IDs': missing_ids, 'Check': 'IDValidator'}] if missing_ids > 0 else []
+    ctx.push(name, pd.DataFrame(issues) if issues else None)
+
+
+def _negative_zero_checker(ctx, name, step):
+    columns = [col for col in step.columns if col in ctx.names]
+    native = [col for col in columns if ctx.native(col, NUMERIC_KINDS)]
+    # Converted columns, and booleans (numeric to pandas), run on pandas; text and dates are skipped as there
+    changed = [col for col in columns if col in ctx.changed or ctx.native(col, ('bool',))]
+    ctx.column_order[name] = step.columns
+    if changed:
+        ctx.to_pandas(name, _with_params(step, columns=changed), changed)
+    if not native:
+        return
+    counts = []
+    for col in native:
+        counts += [func.sum(case((ctx.column(col) < 0, 1), else_=0)), func.sum(case((ctx.column(col) == 0, 1), else_=0))]
+    result = ctx.source.execute(select(*counts))[0]
+    issues = []
+    for i, col in enumerate(native):
+        negative_count, zero_count = result[2 * i] or 0, result[2 * i + 1] or 0
+        if negative_count > 0 or zero_count > 0:
+            issues.append({'Column': col, 'Negative_Values': negative_count, 'Zero_Values': zero_count,
+                           'Check': 'NegativeZeroChecker'})
+    ctx.push(name, pd.DataFrame(issues) if issues else None)
+
+
+def _year_filter(ctx, name, step):
+    col = step.date_column
+    if not col or col not in ctx.names:
+        return
+    if col in ctx.changed:
+        ctx.to_pandas(name, step, [col])
+        return
+    if not ctx.native(col, ('datetime',)):
+        return
+    year = extract('year', ctx.column(col))
+    counts = [
+        func.sum(case((year < step.start_year, 1), else_=0)) if step.start_year is not None else literal(0),
+        func.sum(case((year > step.end_year, 1), else_=0)) if step.end_year is not None else literal(0),
+    ]
+    before_start, after_end = [count or 0 for count in ctx.source.execute(select(*counts))[0]]
+    issues = []
+    if step.start_year is not None and before_start > 0:
+        issues.append({'Column': col, 'Years_Before_Start': before_start, 'Start_Year': step.start_year, 'Check': 'YearFilter'})
+    if step.end_year is not None and after_end > 0:
+        issues.append({'Column': col, 'Years_After_End': after_end, 'End_Year': step.end_year, 'Check': 'YearFilter'})
+    ctx.push(name, pd.DataFrame(issues) if issues else None)
+
+
+def _start_end_year_comparator(ctx, name, step):
+    start, end = step.start_year_column, step.end_year_column
+    if not start or not end or start not in ctx.names or end not in ctx.names:
+        return
+    numeric = ctx.native(start, NUMERIC_KINDS) and ctx.native(end, NUMERIC_KINDS)
+    # SQLite compares dates as their stored text, which only orders them like pandas within one type
+    dates = (ctx.native(start, ('datetime',)) and ctx.native(end, ('datetime',))
+             and type(ctx.column(start).type) is type(ctx.column(end).type))
+    if not (numeric or dates):
+        ctx.to_pandas(name, step, [start, end])
+        return
+    positions = ctx.positions([start, end], lambda t: t.c[start] > t.c[end])
+    ctx.push(name, _row_errors(positions, 'StartEndYearComparator'))
+
+
+def _constant_value_detector(ctx, name, step):
+    columns = list(ctx.names) if step.columns is None else [col for col in step.columns if col in ctx.names]
+    native = [col for col in columns if ctx.native(col, NUMERIC_KINDS)]
+    changed = [col for col in columns if col in ctx.changed or ctx.native(col, ('bool',))]
+    ctx.column_order[name] = columns
+    if changed:
+        ctx.to_pandas(name, _with_params(step, columns=changed), changed)
+    if not native:
+        return
+    row_count = ctx.source.row_count()
+    issues = []
+    for col in native:
+        numbered = ctx.numbered([col])
+        value = numbered.c[col]
+        # Ties go to the value seen first, like the profile's counter
+        statement = (select(value, func.count()).where(and_(value.is_not(None), ~ctx.source.is_nan(value)))
+                     .group_by(value).order_by(func.count().desc(), func.min(numbered.c[ctx.row])).limit(1))
+        top = ctx.source.execute(statement)
+        if not top or row_count == 0:
+            continue
+        most_common, count = top[0]
+        frequency = count / row_count
+        if frequency >= step.threshold:
+            if ctx.kinds[col] == 'int' and ctx.source.execute(select(func.count() - func.count(ctx.column(col))))[0][0]:
+                # pandas holds an integer column with nulls as floats
+                most_common = float(most_common)
+            issues.append({'Column': col, 'Most_Common_Value': most_common, 'Frequency': frequency,
+                           'Check': 'ConstantValueDetector'})
+    ctx.push(name, pd.DataFrame(issues) if issues else None)
+
+
+def _category_validator(ctx, name, step):
+    changed = {}
+    ctx.column_order[name] = list(step.column_expected_values)
+    for col, expected_values in step.column_expected_values.items():
+        if col not in ctx.names:
+            continue
+        allows_missing = any(value is None or (isinstance(value, float) and np.isnan(value)) for value in expected_values)
+        expected = [value for value in expected_values
+                    if value is not None and not (isinstance(value, float) and np.isnan(value))]
+        kind = ctx.kinds[col]
+        if kind == 'str':
+            comparable = all(isinstance(value, str) for value in expected)
+        elif kind == 'bool':
+            comparable = all(isinstance(value, bool) for value in expected)
+        elif kind in NUMERIC_KINDS:
+            comparable = all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in expected)
+        else:
+            comparable = False
+        if not comparable or not ctx.native(col):
+            changed[col] = expected_values
+            continue
+
+        def invalid(numbered, col=col, expected=expected, allows_missing=allows_missing):
+            value = numbered.c[col]
+            keep = and_(value.is_not(None), ~ctx.source.is_nan(value)) if allows_missing else true()
+            if not expected:
+                return keep
+            # Anti-join against the expected values: rows without a match are invalid, NULLs included
+            rows = [select(literal(item).label('value')) for item in expected]
+            allowed = (union_all(*rows) if len(rows) > 1 else rows[0]).subquery()
+            unmatched = ~select(allowed.c.value).where(allowed.c.value == value).exists()
+            return and_(keep, unmatched)
+
+        positions = ctx.positions([col], invalid)
+        ctx.push(name, _row_errors(positions, 'CategoryValidator', Column=col, Expected_Values=str(expected_values)))
+    if changed:
+        ctx.to_pandas(name, _with_params(step, column_expected_values=changed), list(changed))
+
+
+def _pandas_only(columns):
+    """Handler of a check without a SQL translation: it runs on pandas over ``columns(step)``."""
+    def handler(ctx, name, step):
+        ctx.to_pandas(name, step, columns(step))
+    return handler
+
+
+SQL_STEPS = {
+    TextCleaner: _text_cleaner,
+    NumericConverter: _numeric_converter,
+    DateConverter: _date_converter,
+    ColumnProfiler: _column_profiler,
+    MissingValuesDetector: _missing_values_detector,
+    DuplicatesFromtheData: _duplicates_from_data,
+    DuplicateIdentifier: _duplicate_identifier,
+    IDValidator: _id_validator,
+    NegativeZeroChecker: _negative_zero_checker,
+    YearFilter: _year_filter,
+    StartEndYearComparator: _start_end_year_comparator,
+    ConstantValueDetector: _constant_value_detector,
+    CategoryValidator: _category_validator,
+    FuzzyDuplicateDetector: _pandas_only(lambda step: step.columns + step.block_columns),
+    CoveragePeriodChecker: _pandas_only(lambda step: [step.key_column, step.start_column, step.end_column]),
+    OutlierDetector: _pandas_only(lambda step: step.columns + step.group_by),
+    UniqueIDGenerator: _pandas_only(lambda step: step.columns_to_concat if step.id_column else []),
+}
+
+
+def _merge(ctx, name, frames):
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if len(frames) == 1:
+        return frames[0]
+    if name in ctx.unions:
+        positions = np.unique(np.concatenate([frame['Row_Index'].to_numpy(dtype='int64') for frame in frames]))
+        return _row_errors(positions, frames[0]['Check'].iloc[0])
+    merged = pd.concat(frames, ignore_index=True)
+    order = ctx.column_order.get(name)
+    if order and 'Column' in merged.columns:
+        rank = {col: i for i, col in enumerate(order)}
+        merged = merged.iloc[np.argsort(merged['Column'].map(rank).to_numpy(), kind='stable')].reset_index(drop=True)
+    return merged
+
+
+def _key_frame(ctx, checked, positions, key_columns):
+    """Values of ``key_columns`` at ``positions``, as the loaded data would hold them after the checks."""
+    frame = {}
+    stored = [col for col in key_columns if checked is None or col not in checked.columns]
+    if stored:
+        raw = [ctx.names[col] for col in stored]
+        kept, has_nulls, offset = [], dict.fromkeys(raw, False), 0
+        # One streamed pass; only the flagged rows are kept
+        for batch in ctx.source.iter_batches(raw):
+            lo, hi = np.searchsorted(positions, [offset, offset + batch.num_rows])
+            if hi > lo:
+                kept.append(batch.take(pa.array(positions[lo:hi] - offset)))
+            for col, array in zip(raw, batch.columns):
+                has_nulls[col] = has_nulls[col] or array.null_count > 0
+            offset += batch.num_rows
+        table = pa.Table.from_batches(kept, schema=ctx.source.arrow_schema(raw))
+        values = _to_pandas(table, ctx.source.kinds, has_nulls)
+        for col, raw_col in zip(stored, raw):
+            frame[col] = values[raw_col].to_numpy()
+    for col in key_columns:
+        if col not in frame:
+            frame[col] = checked[col].iloc[positions].to_numpy()
+    return pd.DataFrame({col: frame[col] for col in key_columns}, index=positions)
+
+
+def run_pipeline_sql(pipeline, source, key_columns=None):
+    """Run ``pipeline`` on a database source like ``pipeline.run_pipeline`` runs it on the loaded table.
+
+    Checks on columns the transforms leave as stored run in the database:
+    null counts and missing rows, duplicate rows and keys (grouped as window
+    counts), ranges (negative/zero, years, start after end), the most common
+    value, and category membership as an anti-join. Only the positions of
+    the rows they flag come back. Transforms and the remaining checks run on
+    pandas over just the columns they read, pulled in Arrow batches. The
+    issues match those of the loaded table, row indexes and row keys
+    included; ``keys`` holds the key hash of every flagged row.
+
+    The cleaned data is never assembled, so an export is refused.
+    """
+    steps = pipeline.steps
+    if any(isinstance(step, FinalSaver) for _, step in steps):
+        raise ValueError("Exporting the cleaned data needs every row; load the source and run the checks in memory.")
+    lead = 0
+    while lead < len(steps) and isinstance(steps[lead][1], LEADING_STEPS):
+        lead += 1
+
+    empty = pd.DataFrame(columns=source.columns)
+    result = run_pipeline(pipeline[:lead], empty)
+    columns = list(result['output'].columns)
+    row_count = source.row_count()
+    if result['stopped_by'] is not None:
+        result['skipped'] += [name for name, _ in steps[lead:] if name != 'issue_saver']
+        return {**result, 'output': None, 'keys': pd.Series([], dtype='uint64'), 'columns': columns,
+                'row_count': row_count, 'pushed_down': [], 'pulled_columns': []}
+
+    ctx = _Pushdown(source, dict(zip(columns, source.columns)))
+    output_columns = list(columns)
+    for name, step in steps[lead:]:
+        if isinstance(step, (IssueSaver, ColumnFilter)):
+            continue
+        if type(step) not in SQL_STEPS:
+            # A check without a translation reads whatever it likes; give it everything
+            ctx.to_pandas(name, step, columns)
+            continue
+        checkpoint()
+        start = time.perf_counter()
+        SQL_STEPS[type(step)](ctx, name, step)
+        ctx.timings[name] = time.perf_counter() - start
+        if isinstance(step, UniqueIDGenerator) and step.id_column and step.columns_to_concat \
+                and step.id_column not in output_columns:
+            output_columns.append(step.id_column)
+
+    checked = None
+    pandas_result = {'errors': {}, 'timings': {}, 'data_columns': set()}
+    pandas_steps = []
+    for name, step in ctx.pandas_steps:
+        if isinstance(step, ColumnProfiler):
+            if not any(other is not step and getattr(other, 'profile', None) is step.profile
+                       for _, other in ctx.pandas_steps):
+                continue
+            step = _with_params(step, columns=[col for col in step.columns if col in ctx.pulled])
+        pandas_steps.append((name, step))
+    if ctx.pulled:
+        start = time.perf_counter()
+        pulled = [col for col in columns if col in ctx.pulled]
+        checked = source.read_frame([ctx.names[col] for col in pulled])
+        checked.columns = pulled
+        ctx.timings['sql_read'] = time.perf_counter() - start
+        pandas_result = run_pipeline(Pipeline(pandas_steps), checked)
+        checked = pandas_result['output']
+
+    # Column metadata of the output: the filter only reports configured columns the data lacks
+    filtered = run_pipeline(Pipeline([(name, step) for name, step in steps[lead:] if isinstance(step, ColumnFilter)]),
+                            pd.DataFrame(columns=output_columns))
+    output_columns = list(filtered['output'].columns)
+
+    order = []
+    for name, step in steps:
+        order += list(getattr(step, 'step_names', (name,)))
+    errors = dict(result['errors'])
+    found = {**ctx.errors, **pandas_result['errors'], **filtered['errors']}
+    for name in sorted(found, key=lambda name: order.index(name) if name in order else len(order)):
+        errors[name] = _merge(ctx, name, [ctx.errors.get(name), pandas_result['errors'].get(name),
+                                           filtered['errors'].get(name)])
+
+    start = time.perf_counter()
+    flagged = [frame['Row_Index'].to_numpy(dtype='int64') for frame in errors.values() if 'Row_Index' in frame.columns]
+    positions = np.unique(np.concatenate(flagged)) if flagged else np.array([], dtype='int64')
+    key_columns = [col for col in (key_columns or []) if col in output_columns] or output_columns
+    keys = row_keys(_key_frame(ctx, checked, positions, key_columns), key_columns) if len(positions) else \
+        pd.Series([], dtype='uint64')
+    timings = {**result['timings'], **ctx.timings}
+    for name, seconds in pandas_result['timings'].items():
+        timings[name] = timings.get(name, 0) + seconds
+    timings['sql_row_keys'] = time.perf_counter() - start
+
+    return {
+        'output': None,
+        'keys': keys,
+        'columns': output_columns,
+        'row_count': row_count,
+        'errors': errors,
+        'timings': timings,
+        'data_columns': result['data_columns'] | pandas_result['data_columns'] | set(output_columns),
+        'stopped_by': None,
+        'skipped': [],
+        'pushed_down': ctx.pushed_down,
+        'pulled_columns': sorted(ctx.pulled),
+    }
@@ -0,0 +1,80 @@
+from collections import Counter
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+from .models import User, Project, Log, StatCounter
+
+COUNTERS = ("total_users", "active_users", "total_projects", "total_logs")
+
+
+def increment_counters(connection, deltas):
+    """Apply counter deltas inside the caller's transaction."""
+    for name, delta in deltas.items():
+        if delta:
+            connection.execute(
+                update(StatCounter).where(StatCounter.name == name).values(value=StatCounter.value + delta)
+            )
+
+
+def refresh_counters(db: Session):
+    """Recompute every counter with full-table counts. Only needed once, to backfill."""
+    values = {
+        "total_users": db.query(User).count(),
+        "active_users": db.query(User).filter(User.is_active == True).count(),
+        "total_projects": db.query(Project).count(),
+        "total_logs": db.query(Log).count(),
+    }
+    for name, value in values.items():
+        db.merge(StatCounter(name=name, value=value))
+    db.commit()
+    return values
+
+
+def ensure_counters(db: Session):
+    """Backfill the counters table if it is missing any counter."""
+    existing = {counter.name for counter in db.query(StatCounter).all()}
+    if not set(COUNTERS) <= existing:
+        refresh_counters(db)
+
+
+def read_counters(db: Session):
+    values = {counter.name: counter.value for counter in db.query(StatCounter).all()}
+    return {name: values.get(name, 0) for name in COUNTERS}
+
+
+@event.listens_for(User.is_active, "set", active_history=True)
+def _load_previous_activity(target, value, oldvalue, initiator):
+    # active_history loads the old value of an expired user before it is replaced,
+    # so the flush below can tell a deactivation from a no-op
+    return value
+
+
+@event.listens_for(Session, "after_flush")
+def _track_counter_changes(session, flush_context):
+    # new/dirty/deleted still describe what this flush wrote
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, User):
+            deltas["total_users"] += 1
+            if obj.is_active is not False:
+                deltas["active_users"] += 1
+        elif isinstance(obj, Project):
+            deltas["total_projects"] += 1
+        elif isinstance(obj, Log):
+            deltas["total_logs"] += 1
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            deltas["total_users"] -= 1
+            if obj.is_active:
+                deltas["active_users"] -= 1
+        elif isinstance(obj, Project):
+            deltas["total_projects"] -= 1
+        elif isinstance(obj, Log):
+            deltas["total_logs"] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            history = inspect(obj).attrs.is_active.history
+            if history.has_changes():
+                was_active = bool(history.deleted[0]) if history.deleted else False
+                deltas["active_users"] += int(bool(obj.is_active)) - int(was_active)
+    if deltas:
+        increment_counters(session.connection(), deltas)
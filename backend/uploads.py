@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+MIN_PART_SIZE = 256 * 1024
+MAX_PART_SIZE = 64 * 1024 * 1024
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.parquet')
+# Sessions without a new part for this long are abandoned and removed in the background
+UPLOAD_SESSION_MAX_AGE_HOURS = float(os.getenv("UPLOAD_SESSION_MAX_AGE_HOURS", "24"))
+UPLOAD_SESSION_CLEANUP_INTERVAL_SECONDS = float(os.getenv("UPLOAD_SESSION_CLEANUP_INTERVAL_SECONDS", "600"))
+
+_UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ResumableUploadStore:
+    """Disk-backed store for resumable, multi-part uploads.
+
+    Each upload gets its own directory holding a manifest and one file per
+    part. Parts are checksummed (SHA-256) as they arrive, so completing an
+    upload verifies integrity from the recorded part digests instead of
+    re-reading the assembled file. A background thread removes sessions
+    that received no part for ``max_age`` seconds.
+    """
+    def __init__(self, root, max_age=UPLOAD_SESSION_MAX_AGE_HOURS * 3600,
+                 cleanup_interval=UPLOAD_SESSION_CLEANUP_INTERVAL_SECONDS):
+        self.root = root
+        self.max_age = max_age
+        self.cleanup_interval = cleanup_interval
+        self._thread = None
+        self._stopping = threading.Event()
+        self.removed = 0
+
+    def _session_dir(self, upload_id):
+        if not _UPLOAD_ID.match(upload_id or ''):
+            raise FileNotFoundError(f"Unknown upload '{upload_id}'.")
+        path = os.path.join(self.root, upload_id)
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Unknown upload '{upload_id}'.")
+        return path
+
+    def _part_path(self, session_dir, part_number):
+        return os.path.join(session_dir, f"part-{part_number:05d}")
+
+    def _load_manifest(self, session_dir):
+        with open(os.path.join(session_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def initiate(self, filename, total_size, part_size=None):
+        """Start an upload and return its manifest (upload_id, part_size, part_count)."""
+        filename = os.path.basename(filename or '')
+        if not filename.endswith(SUPPORTED_EXTENSIONS):
+            raise ValueError("Unsupported file format.")
+        if total_size <= 0:
+            raise ValueError("total_size must be positive.")
+        part_size = part_size or DEFAULT_PART_SIZE
+        if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+            raise ValueError(f"part_size must be between {MIN_PART_SIZE} and {MAX_PART_SIZE} bytes.")
+
+        manifest = {
+            'upload_id': uuid.uuid4().hex,
+            'filename': filename,
+            'total_size': total_size,
+            'part_size': part_size,
+            'part_count': -(-total_size // part_size),
+            'created_at': datetime.utcnow().isoformat() + 'Z',
+        }
+        session_dir = os.path.join(self.root, manifest['upload_id'])
+        os.makedirs(session_dir)
+        with open(os.path.join(session_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        return manifest
+
+    def expected_part_size(self, manifest, part_number):
+        if part_number < manifest['part_count']:
+            return manifest['part_size']
+        return manifest['total_size'] - manifest['part_size'] * (manifest['part_count'] - 1)
+
+    def store_part(self, upload_id, part_number, content, checksum):
+        """Verify and store one part. Re-sending a part replaces it, so retries are safe."""
+        session_dir = self._session_dir(upload_id)
+        manifest = self._load_manifest(session_dir)
+        if not 1 <= part_number <= manifest['part_count']:
+            raise ValueError(f"part_number must be between 1 and {manifest['part_count']}.")
+        expected_size = self.expected_part_size(manifest, part_number)
+        if len(content) != expected_size:
+            raise ValueError(f"Part {part_number} must be {expected_size} bytes, got {len(content)}.")
+        digest = hashlib.sha256(content).hexdigest()
+        if not checksum or checksum.lower() != digest:
+            raise ValueError(f"Checksum mismatch for part {part_number}.")
+
+        part_path = self._part_path(session_dir, part_number)
+        tmp_path = f"{part_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        # Digest is written next to the part so parallel part uploads never share a file
+        with open(f"{tmp_path}.sha256", 'w', encoding='utf-8') as f:
+            f.write(digest)
+        os.replace(f"{tmp_path}.sha256", f"{part_path}.sha256")
+        os.replace(tmp_path, part_path)
+        return {'part_number': part_number, 'size': len(content), 'checksum': digest}
+
+    def _part_digests(self, session_dir, manifest):
+        digests = {}
+        for part_number in range(1, manifest['part_count'] + 1):
+            part_path = self._part_path(session_dir, part_number)
+            if os.path.exists(part_path) and os.path.exists(f"{part_path}.sha256"):
+                with open(f"{part_path}.sha256", 'r', encoding='utf-8') as f:
+                    digests[part_number] = f.read().strip()
+        return digests
+
+    def status(self, upload_id):
+        session_dir = self._session_dir(upload_id)
+        manifest = self._load_manifest(session_dir)
+        digests = self._part_digests(session_dir, manifest)
+        missing = [n for n in range(1, manifest['part_count'] + 1) if n not in digests]
+        return {
+            **manifest,
+            'received_parts': sorted(digests),
+            'missing_parts': missing,
+            'received_bytes': sum(self.expected_part_size(manifest, n) for n in digests),
+        }
+
+    def leading_part_path(self, upload_id):
+        """Path of part 1 once it has arrived, for previewing before the upload completes."""
+        session_dir = self._session_dir(upload_id)
+        part_path = self._part_path(session_dir, 1)
+        return part_path if os.path.exists(f"{part_path}.sha256") else None
+
+    def complete(self, upload_id, destination_dir, checksum=None):
+        """Assemble all parts into ``destination_dir`` and return the file path.
+
+        ``checksum`` is the SHA-256 of the concatenated binary part digests (in part
+        order). It is checked against the digests recorded at upload time, so the
+        assembled file is never re-hashed.
+        """
+        session_dir = self._session_dir(upload_id)
+        manifest = self._load_manifest(session_dir)
+        digests = self._part_digests(session_dir, manifest)
+        missing = [n for n in range(1, manifest['part_count'] + 1) if n not in digests]
+        if missing:
+            raise ValueError(f"Upload is missing parts: {missing[:20]}")
+        composite = hashlib.sha256(
+            b''.join(bytes.fromhex(digests[n]) for n in range(1, manifest['part_count'] + 1))
+        ).hexdigest()
+        if checksum and checksum.lower() != composite:
+            raise ValueError("Composite checksum mismatch.")
+
+        os.makedirs(destination_dir, exist_ok=True)
+        final_path = os.path.join(destination_dir, f"{upload_id}_{manifest['filename']}")
+        tmp_path = f"{final_path}.tmp"
+        with open(tmp_path, 'wb') as out:
+            for part_number in range(1, manifest['part_count'] + 1):
+                with open(self._part_path(session_dir, part_number), 'rb') as part:
+                    shutil.copyfileobj(part, out, 1024 * 1024)
+        os.replace(tmp_path, final_path)
+        shutil.rmtree(session_dir, ignore_errors=True)
+        return final_path, composite
+
+    def abort(self, upload_id):
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    def _last_activity(self, session_dir):
+        modified = os.stat(session_dir).st_mtime
+        for entry in os.scandir(session_dir):
+            try:
+                modified = max(modified, entry.stat().st_mtime)
+            except FileNotFoundError:
+                continue
+        return modified
+
+    def cleanup(self, now=None):
+        """Remove sessions whose last part (or creation) is older than ``max_age``."""
+        now = time.time() if now is None else now
+        if not os.path.isdir(self.root):
+            return []
+        removed = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or not _UPLOAD_ID.match(entry.name):
+                continue
+            try:
+                idle = now - self._last_activity(entry.path)
+            except FileNotFoundError:
+                continue  # completed or aborted meanwhile
+            if idle > self.max_age:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed.append(entry.name)
+        self.removed += len(removed)
+        return removed
+
+    def _run(self):
+        while not self._stopping.wait(self.cleanup_interval):
+            try:
+                self.cleanup()
+            except Exception as e:
+                print(f"Error cleaning up upload sessions: {e}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="upload-session-cleanup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
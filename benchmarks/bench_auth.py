@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: requests/sec on /me and /projects with and without the auth cache
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Run against a throwaway SQLite database with embedded claims enabled
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_auth.db")
+os.environ.setdefault("AUTH_EMBED_USER_CLAIMS", "true")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from backend import auth
+from backend.main import app
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "2000"))
+
+
+def measure(client, path, headers):
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.text
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    with TestClient(app) as client:
+        client.post("/register", json={
+            "username": "benchuser",
+            "email": "bench@example.com",
+            "full_name": "Bench User",
+            "password": "benchpass123"
+        })
+        token = client.post("/token", data={"username": "benchuser", "password": "benchpass123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"Benchmarking {REQUESTS} sequential requests per scenario...")
+        print("=" * 50)
+        ttl = auth.user_cache.ttl
+        for path in ("/me", "/projects"):
+            auth.token_cache.ttl = auth.user_cache.ttl = 0
+            auth.token_cache.clear()
+            auth.user_cache.clear()
+            auth.AUTH_EMBED_USER_CLAIMS = False
+            uncached = measure(client, path, headers)
+
+            auth.token_cache.ttl = auth.user_cache.ttl = ttl
+            cached = measure(client, path, headers)
+            print(f"{path:<10} no cache: {uncached:8.1f} req/s   cache: {cached:8.1f} req/s   ({cached / uncached:.2f}x)")
+
+            if path == "/projects":
+                auth.AUTH_EMBED_USER_CLAIMS = True
+                auth.user_cache.clear()
+                claims = measure(client, path, headers)
+                print(f"{path:<10} embedded claims: {claims:8.1f} req/s   ({claims / uncached:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FuzzyDuplicateDetector on synthetic policy numbers. A share of the
+rows are copies of other rows with one character mistyped; reports run time,
+candidate pairs compared, recall of the planted pairs and peak memory.
+"""
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from backend.custom_transformers import FuzzyDuplicateDetector
+
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+TYPO_SHARE = float(os.getenv("BENCH_TYPO_SHARE", "0.02"))
+
+FIRST_NAMES = ['JOHN', 'MARY', 'TENDAI', 'RUTENDO', 'FARAI', 'CHIPO', 'TATENDA', 'NYASHA', 'KUDZAI',
+               'TAFADZWA', 'EUCEBIA', 'RACHAEL', 'SIPHO', 'THANDO', 'BLESSING']
+LAST_NAMES = ['DUBE', 'MOYO', 'NCUBE', 'SIBANDA', 'NDLOVU', 'RAMUSHU', 'CHIKWANHA', 'MUTASA', 'MAPFUMO',
+              'GUMBO', 'SITHOLE', 'ZULU']
+
+
+def policy_numbers(rng):
+    typos = int(ROWS * TYPO_SHARE)
+    unique = ROWS - typos
+    first = np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), unique)]
+    last = np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), unique)]
+    base = pd.Series(first) + '__' + pd.Series(last) + '_' + pd.Series(np.arange(unique)).astype(str)
+    sources = rng.choice(unique, typos, replace=False)
+    positions = rng.integers(0, 4, typos)
+    mistyped = [value[:i] + 'Q' + value[i + 1:] for value, i in zip(base.to_numpy()[sources], positions)]
+    return pd.concat([base, pd.Series(mistyped)], ignore_index=True), sources, unique
+
+
+def main():
+    rng = np.random.default_rng(0)
+    values, sources, unique = policy_numbers(rng)
+    frame = pd.DataFrame({'policy_number': values})
+
+    detector = FuzzyDuplicateDetector(columns=['policy_number'])
+    start = time.perf_counter()
+    detector.fit_transform(frame)
+    elapsed = time.perf_counter() - start
+
+    flagged = np.zeros(len(frame), dtype=bool)
+    if not detector.errors.empty:
+        flagged[detector.errors['Row_Index'].to_numpy()] = True
+    copies = np.arange(unique, len(frame))
+    recall = (flagged[sources] & flagged[copies]).mean() if len(copies) else 1.0
+
+    print(f"{len(frame):,} rows in {elapsed:.1f}s: {detector.stats}")
+    print(f"Flagged rows: {flagged.sum():,}, recall of planted typos: {recall:.3f}")
+    print(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
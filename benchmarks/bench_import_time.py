@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start of the API. Imports backend.main in fresh interpreters,
+reports the median wall time and, from ``python -X importtime``, the slowest
+top-level imports and whether data libraries were loaded at startup.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = int(os.getenv("BENCH_RUNS", "5"))
+MODULE = os.getenv("BENCH_MODULE", "backend.main")
+# Loaded on first use by the endpoints that need them, never at startup
+DEFERRED = ("pandas", "numpy", "pyarrow", "sklearn", "scipy")
+
+
+def cold_import_seconds(statement):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def import_times():
+    """(module, cumulative microseconds, depth) for every import of MODULE."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(cumulative), (len(name) - len(name.lstrip())) // 2))
+    return rows
+
+
+def main():
+    interpreter = statistics.median(cold_import_seconds("pass") for _ in range(RUNS))
+    startup = statistics.median(cold_import_seconds(f"import {MODULE}") for _ in range(RUNS))
+    print(f"import {MODULE}: {startup * 1000:.0f} ms median of {RUNS} "
+          f"({(startup - interpreter) * 1000:.0f} ms over a bare interpreter)")
+
+    rows = import_times()
+    top_level = sorted((row for row in rows if row[2] == 1), key=lambda row: row[1], reverse=True)
+    print("Slowest imports:")
+    for name, cumulative, _ in top_level[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    loaded = sorted({name for name, _, _ in rows if name.split(".")[0] in DEFERRED and "." not in name})
+    print(f"Data libraries loaded at startup: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
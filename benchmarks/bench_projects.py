@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests/sec for /projects under concurrency, async session vs. the
+previous blocking-session handler.
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_projects.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Fail fast instead of waiting 30s when the blocking handler exhausts the pool
+os.environ.setdefault("DB_POOL_TIMEOUT", "2")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from backend.auth import get_active_principal
+from backend.database import get_db
+from backend.main import app
+from backend.models import Project, User
+from backend.schemas import Project as ProjectSchema
+
+DURATION_SECONDS = float(os.getenv("BENCH_SECONDS", "10"))
+CONCURRENCY_LEVELS = [int(n) for n in os.getenv("BENCH_CONCURRENCY", "8,16,64").split(",")]
+PROJECTS = int(os.getenv("BENCH_PROJECTS", "50"))
+
+
+# The handler as it was before the async session: blocking queries on the event loop
+@app.get("/bench/projects-blocking", response_model=List[ProjectSchema])
+async def get_projects_blocking(current_user: User = Depends(get_active_principal), db: Session = Depends(get_db)):
+    return db.query(Project).filter(Project.owner_id == current_user.id).all()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def measure(client, path, headers, concurrency):
+    """Return (requests/sec, failed requests) over DURATION_SECONDS with ``concurrency`` workers."""
+    completed = failures = 0
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def worker():
+        nonlocal completed, failures
+        while time.perf_counter() < deadline:
+            try:
+                response = await client.get(path, headers=headers)
+                failures += response.status_code != 200
+            except httpx.HTTPError:
+                failures += 1
+            completed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return (completed - failures) / (time.perf_counter() - start), failures
+
+
+async def run(base_url):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60,
+                                 limits=httpx.Limits(max_connections=max(CONCURRENCY_LEVELS))) as client:
+        await client.post("/register", json={
+            "username": "benchuser",
+            "email": "bench@example.com",
+            "full_name": "Bench User",
+            "password": "benchpass123"
+        })
+        token = (await client.post("/token", data={"username": "benchuser", "password": "benchpass123"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for n in range(PROJECTS):
+            await client.post("/projects", json={"name": f"project-{n}", "description": "bench"}, headers=headers)
+
+        print(f"{DURATION_SECONDS:.0f}s per run, {PROJECTS} projects per response")
+        print("=" * 70)
+        await client.get("/projects", headers=headers)  # warm up
+        for concurrency in CONCURRENCY_LEVELS:
+            blocking, blocking_failed = await measure(client, "/bench/projects-blocking", headers, concurrency)
+            async_session, async_failed = await measure(client, "/projects", headers, concurrency)
+            print(f"concurrency {concurrency:>3}: blocking {blocking:7.1f} req/s ({blocking_failed} failed)   "
+                  f"async {async_session:7.1f} req/s ({async_failed} failed)")
+
+
+def main():
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{port}"))
+    finally:
+        server.should_exit = True
+        thread.join(5)
+
+
+if __name__ == "__main__":
+    main()
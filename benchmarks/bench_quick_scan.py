@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: quick scan against the full check run on the sample policies repeated to BENCH_ROWS rows.
+Reports both run times and, per check, the full run's rate next to the scan's estimate and interval.
+"""
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.main import read_data_file
+from backend.pipeline import create_issue_pipeline, run_pipeline
+from backend.quick_scan import quick_scan
+
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+SAMPLE_ROWS = int(os.getenv("BENCH_SAMPLE_ROWS", "20000"))
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+CONFIG = {
+    "text_columns": ["policy_number", "premium_frequency", "line_of_business"],
+    "numeric_columns": ["premiums", "commission", "reinsurance_premium"],
+    "date_columns": ["start_date", "end_date"],
+    "id_column": "policy_number",
+    "duplicate_key_columns": ["policy_number", "start_date"],
+    "start_end_year": {"start_year_column": "start_date", "end_year_column": "end_date"},
+    "outlier_detection": {"columns": ["premiums"], "method": "iqr", "threshold": 1.5},
+    "category_validation": {"line_of_business": ["HEALTH", "LIFE"]},
+}
+
+
+def main():
+    policies = read_data_file(os.path.join(BACKEND_DIR, "policy_schedule.csv"))
+    frame = pd.concat([policies] * (ROWS // len(policies) + 1), ignore_index=True).iloc[:ROWS]
+
+    start = time.perf_counter()
+    scan = quick_scan(frame, CONFIG, sample_size=SAMPLE_ROWS, strata=["line_of_business"], seed=0)
+    scan_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    full = run_pipeline(create_issue_pipeline(CONFIG), frame.copy())
+    full_seconds = time.perf_counter() - start
+
+    print(f"{len(frame):,} rows: quick scan of {scan['sample_rows']:,} rows in {scan_seconds:.2f}s, "
+          f"full run in {full_seconds:.2f}s")
+    for estimate in scan["estimates"]:
+        if estimate["method"] == "finding":
+            continue
+        errors = full["errors"].get(estimate["step"])
+        actual = ""
+        if errors is not None and estimate["unit"] == "rows" and "Row_Index" in errors.columns:
+            if estimate["column"] is not None:
+                errors = errors[errors["Column"] == estimate["column"]]
+            actual = f"full {errors['Row_Index'].nunique() / len(frame):.4f}"
+        elif errors is not None and estimate["unit"] in errors.columns:
+            counts = errors.set_index("Column")[estimate["unit"]] if "Column" in errors.columns else errors[estimate["unit"]]
+            actual = f"full {counts.get(estimate['column'], counts.iloc[0]) / len(frame):.4f}"
+        print(f"  {estimate['step']:<28} {str(estimate['column'] or ''):<20} {estimate['unit']:<24} "
+              f"{estimate['method']:<11} {estimate['estimated_rate']:.4f} "
+              f"[{estimate['rate_low']:.4f}, {estimate['rate_high']:.4f}] {actual}")
+    print(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming reconciliation of a policy schedule against a premium
+schedule. Generates both files on disk in chunks, then reports throughput and
+peak memory of reconcile(), which should stay flat as BENCH_ROWS grows.
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from backend.reconciliation import reconcile
+
+ROWS = int(os.getenv("BENCH_ROWS", "2000000"))
+PARTITIONS = int(os.getenv("BENCH_PARTITIONS", "64"))
+CHUNK_ROWS = 500_000
+
+
+def write_schedules(directory):
+    """Monthly policy periods and one payment per period, with a few of each kind of issue."""
+    rng = np.random.default_rng(0)
+    policy_path = os.path.join(directory, "policy_schedule.csv")
+    premium_path = os.path.join(directory, "premium_schedule.csv")
+    for start in range(0, ROWS, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, ROWS - start)
+        rows = np.arange(start, start + n)
+        month = pd.to_datetime("2022-01-01") + pd.to_timedelta((rows % 12) * 31, unit="D")
+        month = month.to_period("M").to_timestamp()
+        policy_number = pd.Series(rows // 12).map("POLICY_{}".format)
+        premium = rng.uniform(100, 5000, n).round(2)
+        pd.DataFrame({
+            "policy_number": policy_number,
+            "premiums": premium,
+            "start_date": month.strftime("%d/%m/%Y"),
+            "end_date": (month + pd.offsets.MonthEnd(0)).strftime("%d/%m/%Y"),
+            "commission": 0.0,
+        }).to_csv(policy_path, mode="a", header=start == 0, index=False)
+        paid = premium + np.where(rows % 1000 == 0, 10.0, 0.0)  # amount mismatches
+        keep = rows % 997 != 0  # periods without payment
+        pd.DataFrame({
+            "policy_number": policy_number.where(rows % 1009 != 0, "UNKNOWN"),  # payments without policy
+            "date_of_premium_payment": month.strftime("%Y-%m-%d"),
+            "amount": paid,
+            "commission": 0.0,
+        })[keep].to_csv(premium_path, mode="a", header=start == 0, index=False)
+    return policy_path, premium_path
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        policy_path, premium_path = write_schedules(directory)
+        print(f"Generated {ROWS:,} policy periods in {time.perf_counter() - start:.1f}s "
+              f"({(os.path.getsize(policy_path) + os.path.getsize(premium_path)) / 1e6:.0f} MB)")
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        output_dir = os.path.join(directory, "out")
+        start = time.perf_counter()
+        result = reconcile(policy_path, premium_path, output_dir, partitions=PARTITIONS)
+        elapsed = time.perf_counter() - start
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Reconciled in {elapsed:.1f}s ({(result['policy_rows'] + result['premium_rows']) / elapsed:,.0f} rows/s), "
+          f"partitions={PARTITIONS}")
+    print(f"Step timings: {result['step_timings']}")
+    print(f"Issues: {result['issue_counts']}")
+    print(f"Peak RSS: {peak_rss / 1024:.0f} MB (after generating the input: {baseline_rss / 1024:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent register/login/project operations against a local SQLite file.
+Reports throughput and latency percentiles per operation.
+"""
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Throwaway database; cheap bcrypt so the test measures the database rather than hashing
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/load_test.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import requests
+import uvicorn
+from backend.main import app
+
+USERS = int(os.getenv("LOAD_TEST_USERS", "50"))
+CONCURRENCY = int(os.getenv("LOAD_TEST_CONCURRENCY", "16"))
+PROJECTS_PER_USER = int(os.getenv("LOAD_TEST_PROJECTS_PER_USER", "5"))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def user_session(base_url, index, timings, errors):
+    """One user's workload: register, log in, create projects, list and update them."""
+    session = requests.Session()
+
+    def timed(operation, method, path, **kwargs):
+        start = time.perf_counter()
+        response = session.request(method, base_url + path, **kwargs)
+        timings.setdefault(operation, []).append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors.append(f"{operation}: {response.status_code} {response.text[:100]}")
+        return response
+
+    username = f"load{index}"
+    timed("register", "POST", "/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "full_name": "Load Test",
+        "password": "loadtest123"
+    })
+    response = timed("login", "POST", "/token", data={"username": username, "password": "loadtest123"})
+    if response.status_code != 200:
+        return
+    session.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    for n in range(PROJECTS_PER_USER):
+        project = timed("create_project", "POST", "/projects", json={"name": f"{username}-{n}", "description": "load test"})
+        timed("list_projects", "GET", "/projects")
+        if project.status_code == 200:
+            timed("update_project", "PUT", f"/projects/{project.json()['id']}", json={"description": "updated"})
+
+
+def main():
+    port = free_port()
+    server, thread = start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+    timings, errors = {}, []
+
+    print(f"Database: {os.environ['DATABASE_URL']}")
+    print(f"{USERS} users, {CONCURRENCY} concurrent, {PROJECTS_PER_USER} projects each")
+    print("=" * 70)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(CONCURRENCY) as pool:
+        for future in [pool.submit(user_session, base_url, i, timings, errors) for i in range(USERS)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    total = 0
+    print(f"{'operation':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for operation, values in timings.items():
+        values = np.array(values) * 1000
+        total += len(values)
+        print(f"{operation:<16}{len(values):>8}{np.percentile(values, 50):>10.1f}"
+              f"{np.percentile(values, 95):>10.1f}{np.percentile(values, 99):>10.1f}")
+    all_values = np.concatenate([np.array(v) for v in timings.values()]) * 1000
+    print("=" * 70)
+    print(f"Throughput: {total / elapsed:.1f} req/s over {elapsed:.1f}s, p99 {np.percentile(all_values, 99):.1f} ms")
+    print(f"Errors: {len(errors)}")
+    for error in errors[:10]:
+        print(f"  {error}")
+
+    server.should_exit = True
+    thread.join(5)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import {
     Typography,
     Button,
     CircularProgress,
+    LinearProgress,
     Paper,
     CssBaseline,
     Alert,
@@ -51,6 +52,11 @@ const initialTransformers = [
     { transformer_name: 'column_filter', config: { columns_to_keep: [] } },
 ];
 
+const UPLOAD_CHUNKED_THRESHOLD = 32 * 1024 * 1024;
+const UPLOAD_PART_SIZE = 8 * 1024 * 1024;
+const UPLOAD_CONCURRENCY = 4;
+const UPLOAD_MAX_ATTEMPTS = 3;
+
 function App() {
     // Auth state
     const [token, setToken] = useState(localStorage.getItem('token'));
@@ -74,8 +80,15 @@ function App() {
     const [issuesReady, setIssuesReady] = useState(false);
     const [summaryReady, setSummaryReady] = useState(false);
     const [summary, setSummary] = useState(null);
+    // Artifact URLs of the last run, so downloads never pick up another run's files
+    const [downloads, setDownloads] = useState(null);
+    // First page of the last run's issues, streamed as NDJSON
+    const [issuePage, setIssuePage] = useState([]);
     const [selectedProject, setSelectedProject] = useState(null);
     const [anchorEl, setAnchorEl] = useState(null);
+    const [ingestionStatus, setIngestionStatus] = useState('idle');
+    // Latest progress event of the running checks, and the URL that cancels them
+    const [runProgress, setRunProgress] = useState(null);
 
     // Auth functions
     const handleLogin = async (token) => {
@@ -126,15 +139,63 @@ function App() {
         setMessage('');
     };
 
+    const sha256Hex = async (buffer) => {
+        const digest = await crypto.subtle.digest('SHA-256', buffer);
+        return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+    };
+
+    // Large files go through the resumable API: parts are sent concurrently with their
+    // checksums, and only the parts the server reports missing are retried.
+    const uploadInParts = async (selectedFile) => {
+        const base = 'http://localhost:8000/uploads';
+        const { data: upload } = await axios.post(base, {
+            filename: selectedFile.name,
+            total_size: selectedFile.size,
+            part_size: UPLOAD_PART_SIZE,
+        });
+        const digests = {};
+        const sendPart = async (partNumber) => {
+            const start = (partNumber - 1) * upload.part_size;
+            const buffer = await selectedFile.slice(start, start + upload.part_size).arrayBuffer();
+            const checksum = await sha256Hex(buffer);
+            await axios.put(`${base}/${upload.upload_id}/parts/${partNumber}`, buffer, {
+                headers: { 'Content-Type': 'application/octet-stream', 'X-Content-SHA256': checksum },
+            });
+            digests[partNumber] = checksum;
+        };
+        let missing = Array.from({ length: upload.part_count }, (_, i) => i + 1);
+        for (let attempt = 0; missing.length && attempt < UPLOAD_MAX_ATTEMPTS; attempt++) {
+            const queue = [...missing];
+            const worker = async () => {
+                while (queue.length) {
+                    await sendPart(queue.shift()).catch(() => {});
+                }
+            };
+            await Promise.all(Array.from({ length: UPLOAD_CONCURRENCY }, worker));
+            const { data: status } = await axios.get(`${base}/${upload.upload_id}`);
+            missing = status.missing_parts;
+        }
+        if (missing.length) {
+            throw new Error(`${missing.length} parts could not be uploaded`);
+        }
+        const partDigests = new Uint8Array(upload.part_count * 32);
+        for (let n = 1; n <= upload.part_count; n++) {
+            partDigests.set(digests[n].match(/.{2}/g).map((h) => parseInt(h, 16)), (n - 1) * 32);
+        }
+        return axios.post(`${base}/${upload.upload_id}/complete`, { checksum: await sha256Hex(partDigests) });
+    };
+
     const uploadFile = async () => {
         if (!file) return;
         const formData = new FormData();
         formData.append('file', file);
         setLoading(true);
         try {
-            const response = await axios.post('http://localhost:8000/upload', formData, {
-                headers: { 'Content-Type': 'multipart/form-data' },
-            });
+            const response = file.size > UPLOAD_CHUNKED_THRESHOLD
+                ? await uploadInParts(file)
+                : await axios.post('http://localhost:8000/upload', formData, {
+                    headers: { 'Content-Type': 'multipart/form-data' },
+                });
             setColumns(response.data.columns || []);
             setPreview(response.data.preview || []);
             setIssuesReady(false);
@@ -142,6 +203,8 @@ function App() {
             setSummary(null);
             setMessage(response.data.message || 'File uploaded successfully.');
             setSnackbarOpen(true);
+            setIngestionStatus(response.data.ingestion || 'ready');
+            waitForIngestion(response.data.ingestion_id).catch(() => setIngestionStatus('failed'));
         } catch (error) {
             setMessage(`File upload failed: ${error.response?.data?.detail || error.message}`);
             setSnackbarOpen(true);
@@ -150,42 +213,121 @@ function App() {
         }
     };
 
+    // The upload response is built from the file head; poll until the full file is parsed
+    const waitForIngestion = async (ingestionId) => {
+        for (;;) {
+            const response = await axios.get('http://localhost:8000/upload/status');
+            if (response.data.ingestion_id !== ingestionId) return;
+            setIngestionStatus(response.data.status);
+            if (response.data.status === 'failed') {
+                setMessage(`File ingestion failed: ${response.data.error}`);
+                setSnackbarOpen(true);
+                return;
+            }
+            if (response.data.status !== 'loading') return;
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+        }
+    };
+
     const handleConfigChange = (index, configKey, value) => {
         const newTransformers = [...transformers];
         newTransformers[index].config[configKey] = value;
         setTransformers(newTransformers);
     };
 
+    const showRunResult = async (result) => {
+        setDownloads({ issues: result.download, 'issues-summary': result.summary_download });
+        setIssuesReady(true);
+        // Try to immediately fetch summary JSON for the dashboard
+        try {
+            const res = await axios.get(`http://localhost:8000${result.summary_download}`, { responseType: 'blob' });
+            const text = await res.data.text();
+            const json = JSON.parse(text);
+            setSummary(json);
+            setSummaryReady(true);
+        } catch (_) {
+            setSummary(null);
+            setSummaryReady(false);
+        }
+        try {
+            const res = await axios.get(`http://localhost:8000/issues/${result.run_uuid}?limit=50`, { responseType: 'text' });
+            setIssuePage(res.data.split('\n').filter(Boolean).map((line) => JSON.parse(line)));
+        } catch (_) {
+            setIssuePage([]);
+        }
+        setMessage(result.message || 'Issue detection complete.');
+        setSnackbarOpen(true);
+    };
+
+    // Follow a background run's server-sent events until it finishes, fails or is cancelled
+    const followRun = (run) => new Promise((resolve, reject) => {
+        const source = new EventSource(`http://localhost:8000${run.events}`);
+        const update = (event) => {
+            const data = JSON.parse(event.data);
+            // A new step starts without the previous step's row counts
+            setRunProgress((previous) => ({
+                ...(data.event === 'step_started' ? { issue_counts: previous?.issue_counts } : previous),
+                ...data,
+                cancel: run.cancel,
+            }));
+            return data;
+        };
+        ['run_started', 'step_started', 'progress', 'step_finished'].forEach((name) => source.addEventListener(name, update));
+        source.addEventListener('run_finished', (event) => {
+            source.close();
+            resolve(update(event).response);
+        });
+        source.addEventListener('run_failed', (event) => {
+            source.close();
+            reject(new Error(update(event).error));
+        });
+        source.addEventListener('run_cancelled', (event) => {
+            source.close();
+            update(event);
+            reject(new Error('cancelled'));
+        });
+        // EventSource reconnects by itself after network errors; give up only once it stops
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                reject(new Error('Lost the connection to the run.'));
+            }
+        };
+    });
+
     const runDataChecks = async () => {
         setLoading(true);
+        setRunProgress(null);
         try {
-            const response = await axios.post('http://localhost:8000/identify-issues');
-            setIssuesReady(true);
-            // Try to immediately fetch summary JSON for the dashboard
-            try {
-                const res = await axios.get('http://localhost:8000/download-issues-summary', { responseType: 'blob' });
-                const text = await res.data.text();
-                const json = JSON.parse(text);
-                setSummary(json);
-                setSummaryReady(true);
-            } catch (_) {
-                setSummary(null);
-                setSummaryReady(false);
-            }
-            setMessage(response.data.message || 'Issue detection complete.');
-            setSnackbarOpen(true);
+            const response = await axios.post('http://localhost:8000/identify-issues?background=true');
+            setRunProgress({ event: 'pending', cancel: response.data.cancel });
+            const result = await followRun(response.data);
+            await showRunResult(result);
         } catch (error) {
-            setMessage(`Issue detection failed: ${error.response?.data?.detail || error.message}`);
+            if (error.message === 'cancelled') {
+                setMessage('Issue detection cancelled.');
+            } else {
+                setMessage(`Issue detection failed: ${error.response?.data?.detail || error.message}`);
+            }
             setSnackbarOpen(true);
         } finally {
             setLoading(false);
+            setRunProgress(null);
+        }
+    };
+
+    const cancelDataChecks = async () => {
+        try {
+            await axios.post(`http://localhost:8000${runProgress.cancel}`);
+        } catch (error) {
+            setMessage(`Cancel failed: ${error.response?.data?.detail || error.message}`);
+            setSnackbarOpen(true);
         }
     };
 
     const downloadFile = async (type) => {
         try {
-            const endpoint = type === 'issues' ? 'download-issues' : 'download-issues-summary';
-            const response = await axios.get(`http://localhost:8000/${endpoint}`, { responseType: 'blob' });
+            const endpoint = downloads?.[type] || (type === 'issues' ? '/download-issues' : '/download-issues-summary');
+            const response = await axios.get(`http://localhost:8000${endpoint}`, { responseType: 'blob' });
             const url = window.URL.createObjectURL(new Blob([response.data]));
             const link = document.createElement('a');
             link.href = url;
@@ -459,12 +601,33 @@ function App() {
                                 <Button
                                     variant="contained"
                                     onClick={runDataChecks}
-                                    disabled={loading || !columns.length}
-                                    startIcon={loading ? <CircularProgress size={20} /> : <Settings />}
+                                    disabled={loading || !columns.length || ingestionStatus === 'loading'}
+                                    startIcon={loading || ingestionStatus === 'loading' ? <CircularProgress size={20} /> : <Settings />}
                                     size="large"
                                 >
-                                    {columns.length ? 'Run Checks' : 'Upload data first'}
+                                    {!columns.length ? 'Upload data first' : ingestionStatus === 'loading' ? 'Loading full file...' : 'Run Checks'}
                                 </Button>
+                                {runProgress && (
+                                    <Box mt={3} sx={{ maxWidth: 480, mx: 'auto', textAlign: 'left' }}>
+                                        <LinearProgress
+                                            variant={runProgress.index ? 'determinate' : 'indeterminate'}
+                                            value={runProgress.index ? 100 * (runProgress.index - 1) / runProgress.total : 0}
+                                        />
+                                        <Typography variant="body2" color="text.secondary" sx={{ mt: 1 }}>
+                                            {runProgress.step ? `${runProgress.step}${runProgress.index ? ` (${runProgress.index}/${runProgress.total})` : ''}` : 'Starting checks...'}
+                                            {runProgress.rows_total ? ` — ${runProgress.rows_done.toLocaleString()} of ${runProgress.rows_total.toLocaleString()} rows` : ''}
+                                            {runProgress.eta_seconds != null ? ` — about ${Math.ceil(runProgress.eta_seconds)}s left` : ''}
+                                        </Typography>
+                                        {runProgress.issue_counts && (
+                                            <Typography variant="body2" color="text.secondary">
+                                                Issues so far: {Object.entries(runProgress.issue_counts).map(([check, count]) => `${check} ${count}`).join(', ') || 'none'}
+                                            </Typography>
+                                        )}
+                                        <Button size="small" color="error" onClick={cancelDataChecks} disabled={!runProgress.cancel} sx={{ mt: 1 }}>
+                                            Cancel
+                                        </Button>
+                                    </Box>
+                                )}
                             </Box>
 
                             {summaryReady && summary && (
@@ -535,6 +698,34 @@ function App() {
                                             </Box>
                                         </Box>
                                     )}
+                                    {/* First page of issues */}
+                                    {!!issuePage.length && (
+                                        <Box mt={3}>
+                                            <Typography variant="subtitle1" sx={{ mb: 1, fontWeight: 'bold' }}>First Issues</Typography>
+                                            <Box sx={{ maxHeight: 320, overflow: 'auto' }}>
+                                                <table style={{ width: '100%', borderCollapse: 'collapse' }}>
+                                                    <thead>
+                                                        <tr>
+                                                            <th style={{ textAlign: 'left', padding: '8px', borderBottom: '1px solid #eee' }}>Check</th>
+                                                            <th style={{ textAlign: 'left', padding: '8px', borderBottom: '1px solid #eee' }}>Column</th>
+                                                            <th style={{ textAlign: 'right', padding: '8px', borderBottom: '1px solid #eee', width: 120 }}>Row</th>
+                                                            <th style={{ textAlign: 'left', padding: '8px', borderBottom: '1px solid #eee' }}>Details</th>
+                                                        </tr>
+                                                    </thead>
+                                                    <tbody>
+                                                        {issuePage.map((issue, idx) => (
+                                                            <tr key={idx}>
+                                                                <td style={{ padding: '8px', borderBottom: '1px solid #f3f4f6' }}>{issue.check}</td>
+                                                                <td style={{ padding: '8px', borderBottom: '1px solid #f3f4f6' }}>{issue.column}</td>
+                                                                <td style={{ padding: '8px', borderBottom: '1px solid #f3f4f6', textAlign: 'right' }}>{issue.row_index ?? ''}</td>
+                                                                <td style={{ padding: '8px', borderBottom: '1px solid #f3f4f6', wordBreak: 'break-all' }}>{JSON.stringify(issue.details)}</td>
+                                                            </tr>
+                                                        ))}
+                                                    </tbody>
+                                                </table>
+                                            </Box>
+                                        </Box>
+                                    )}
                                 </Box>
                             )}
 
@@ -17,7 +17,8 @@ import {
     CircularProgress,
     Tabs,
     Tab,
-    TablePagination
+    TablePagination,
+    Button
 } from '@mui/material';
 import {
     People as PeopleIcon,
@@ -36,6 +37,8 @@ export default function AdminDashboard({ token }) {
     const [error, setError] = useState('');
     const [page, setPage] = useState(0);
     const [rowsPerPage, setRowsPerPage] = useState(10);
+    const [logsCursor, setLogsCursor] = useState(null);
+    const [loadingLogs, setLoadingLogs] = useState(false);
 
     const fetchData = async () => {
         try {
@@ -53,6 +56,7 @@ export default function AdminDashboard({ token }) {
             setStats(statsRes.data);
             setUsers(usersRes.data);
             setLogs(logsRes.data);
+            setLogsCursor(logsRes.headers['x-next-cursor'] || null);
         } catch (err) {
             setError('Failed to load admin data');
         } finally {
@@ -60,6 +64,22 @@ export default function AdminDashboard({ token }) {
         }
     };
 
+    const loadMoreLogs = async () => {
+        setLoadingLogs(true);
+        try {
+            const res = await axios.get('http://localhost:8000/admin/logs', {
+                headers: { Authorization: `Bearer ${token}` },
+                params: { cursor: logsCursor }
+            });
+            setLogs((prev) => [...prev, ...res.data]);
+            setLogsCursor(res.headers['x-next-cursor'] || null);
+        } catch (err) {
+            setError('Failed to load more logs');
+        } finally {
+            setLoadingLogs(false);
+        }
+    };
+
     useEffect(() => {
         fetchData();
     }, [token]);
@@ -256,6 +276,13 @@ export default function AdminDashboard({ token }) {
                         onPageChange={handleChangePage}
                         onRowsPerPageChange={handleChangeRowsPerPage}
                     />
+                    {logsCursor && (
+                        <Box sx={{ display: 'flex', justifyContent: 'center', pb: 2 }}>
+                            <Button onClick={loadMoreLogs} disabled={loadingLogs}>
+                                {loadingLogs ? 'Loading...' : 'Load more'}
+                            </Button>
+                        </Box>
+                    )}
                 </TableContainer>
             )}
         </Box>
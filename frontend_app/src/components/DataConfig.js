@@ -117,6 +117,26 @@ const DataConfig = ({ columns = [], onConfigUpdate, onRunChecks }) => {
     }
   };
 
+  const suggestFromProfile = async () => {
+    setLoading(true);
+    try {
+      const response = await axios.get('http://localhost:8000/profile');
+      const profiles = Object.values(response.data.columns || {});
+      const byType = (type) => profiles.filter(p => p.suggested_type === type).map(p => p.column);
+      setConfig(prev => ({
+        ...prev,
+        numeric_columns: byType('numeric'),
+        date_columns: byType('date'),
+        text_columns: byType('text')
+      }));
+      setMessage(`Suggested column types from a profile of ${response.data.row_count} rows.`);
+    } catch (error) {
+      setMessage(`Error: ${error.response?.data?.detail || error.message}`);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const toggleCheckExpansion = (checkName) => {
     setExpandedChecks(prev => ({
       ...prev,
@@ -289,6 +309,28 @@ const DataConfig = ({ columns = [], onConfigUpdate, onRunChecks }) => {
                   </Box>
                 );
               
+              case 'constant_value_columns':
+                return (
+                  <Box key={field} sx={{ mb: 2 }}>
+                    {renderColumnMultiSelect('Constant Value Columns (default: numeric columns)', field, config[field] || [])}
+                  </Box>
+                );
+              
+              case 'fail_fast':
+                return (
+                  <Box key={field} sx={{ mb: 2 }}>
+                    <FormControlLabel
+                      control={
+                        <Switch
+                          checked={config[field] ?? true}
+                          onChange={(e) => handleConfigChange(field, e.target.checked)}
+                        />
+                      }
+                      label="Stop the run when mandatory columns are missing"
+                    />
+                  </Box>
+                );
+              
               case 'year_filter':
                 return (
                   <Card key={field} sx={{ mb: 2 }}>
@@ -365,6 +407,166 @@ const DataConfig = ({ columns = [], onConfigUpdate, onRunChecks }) => {
                   </Card>
                 );
               
+              case 'fuzzy_duplicates':
+                return (
+                  <Card key={field} sx={{ mb: 2 }}>
+                    <CardContent>
+                      <Typography variant="h6" gutterBottom>Fuzzy Duplicates</Typography>
+                      <Grid container spacing={2}>
+                        <Grid item xs={12} md={4}>
+                          <FormControl fullWidth>
+                            <InputLabel>Columns</InputLabel>
+                            <Select
+                              multiple
+                              value={config[field]?.columns || []}
+                              onChange={(e) => handleNestedConfigChange(field, 'columns', e.target.value)}
+                              renderValue={(selected) => (
+                                <Box sx={{ display: 'flex', flexWrap: 'wrap', gap: 0.5 }}>
+                                  {selected.map((col) => (
+                                    <Chip key={col} label={col} size="small" />
+                                  ))}
+                                </Box>
+                              )}
+                            >
+                              {columns.map((col) => (
+                                <MenuItem key={col} value={col}>
+                                  {col}
+                                </MenuItem>
+                              ))}
+                            </Select>
+                          </FormControl>
+                        </Grid>
+                        <Grid item xs={12} md={4}>
+                          <FormControl fullWidth>
+                            <InputLabel>Block By</InputLabel>
+                            <Select
+                              multiple
+                              value={config[field]?.block_columns || []}
+                              onChange={(e) => handleNestedConfigChange(field, 'block_columns', e.target.value)}
+                              renderValue={(selected) => (
+                                <Box sx={{ display: 'flex', flexWrap: 'wrap', gap: 0.5 }}>
+                                  {selected.map((col) => (
+                                    <Chip key={col} label={col} size="small" />
+                                  ))}
+                                </Box>
+                              )}
+                            >
+                              {columns.map((col) => (
+                                <MenuItem key={col} value={col}>
+                                  {col}
+                                </MenuItem>
+                              ))}
+                            </Select>
+                          </FormControl>
+                        </Grid>
+                        <Grid item xs={12} md={2}>
+                          <TextField
+                            fullWidth
+                            label="Similarity"
+                            value={config[field]?.threshold ?? 0.85}
+                            onChange={(e) => handleNestedConfigChange(field, 'threshold', parseFloat(e.target.value) || 0)}
+                            type="number"
+                            inputProps={{ min: 0, max: 1, step: 0.05 }}
+                            size="small"
+                          />
+                        </Grid>
+                        <Grid item xs={12} md={2}>
+                          <FormControlLabel
+                            control={
+                              <Switch
+                                checked={config[field]?.match_digits ?? true}
+                                onChange={(e) => handleNestedConfigChange(field, 'match_digits', e.target.checked)}
+                              />
+                            }
+                            label="Digits must match"
+                          />
+                        </Grid>
+                      </Grid>
+                    </CardContent>
+                  </Card>
+                );
+              
+              case 'coverage_periods':
+                return (
+                  <Card key={field} sx={{ mb: 2 }}>
+                    <CardContent>
+                      <Typography variant="h6" gutterBottom>Coverage Periods</Typography>
+                      <Grid container spacing={2}>
+                        <Grid item xs={12} md={4}>
+                          <FormControl fullWidth>
+                            <InputLabel>Key Column</InputLabel>
+                            <Select
+                              value={config[field]?.key_column || ''}
+                              onChange={(e) => handleNestedConfigChange(field, 'key_column', e.target.value)}
+                            >
+                              <MenuItem value="">None</MenuItem>
+                              {columns.map((col) => (
+                                <MenuItem key={col} value={col}>
+                                  {col}
+                                </MenuItem>
+                              ))}
+                            </Select>
+                          </FormControl>
+                        </Grid>
+                        <Grid item xs={12} md={4}>
+                          <FormControl fullWidth>
+                            <InputLabel>Start Column</InputLabel>
+                            <Select
+                              value={config[field]?.start_column || ''}
+                              onChange={(e) => handleNestedConfigChange(field, 'start_column', e.target.value)}
+                            >
+                              <MenuItem value="">None</MenuItem>
+                              {columns.map((col) => (
+                                <MenuItem key={col} value={col}>
+                                  {col}
+                                </MenuItem>
+                              ))}
+                            </Select>
+                          </FormControl>
+                        </Grid>
+                        <Grid item xs={12} md={4}>
+                          <FormControl fullWidth>
+                            <InputLabel>End Column</InputLabel>
+                            <Select
+                              value={config[field]?.end_column || ''}
+                              onChange={(e) => handleNestedConfigChange(field, 'end_column', e.target.value)}
+                            >
+                              <MenuItem value="">None</MenuItem>
+                              {columns.map((col) => (
+                                <MenuItem key={col} value={col}>
+                                  {col}
+                                </MenuItem>
+                              ))}
+                            </Select>
+                          </FormControl>
+                        </Grid>
+                        <Grid item xs={12} md={4}>
+                          <TextField
+                            fullWidth
+                            label="Allowed Gap (days)"
+                            value={config[field]?.max_gap_days ?? 0}
+                            onChange={(e) => handleNestedConfigChange(field, 'max_gap_days', parseInt(e.target.value, 10) || 0)}
+                            type="number"
+                            inputProps={{ min: 0 }}
+                            size="small"
+                          />
+                        </Grid>
+                        <Grid item xs={12} md={4}>
+                          <FormControlLabel
+                            control={
+                              <Switch
+                                checked={!!config[field]?.dayfirst}
+                                onChange={(e) => handleNestedConfigChange(field, 'dayfirst', e.target.checked)}
+                              />
+                            }
+                            label="Day-first dates"
+                          />
+                        </Grid>
+                      </Grid>
+                    </CardContent>
+                  </Card>
+                );
+              
               case 'outlier_detection':
                 return (
                   <Card key={field} sx={{ mb: 2 }}>
@@ -383,12 +585,36 @@ const DataConfig = ({ columns = [], onConfigUpdate, onRunChecks }) => {
                             >
                               <MenuItem value="iqr">IQR</MenuItem>
                               <MenuItem value="zscore">Z-Score</MenuItem>
+                              <MenuItem value="mad">Median/MAD</MenuItem>
                             </Select>
                           </FormControl>
                         </Grid>
                         <Grid item xs={12} md={3}>
                           {renderNumberField('Threshold', 'threshold', config[field]?.threshold, 0.1, 5, 0.1)}
                         </Grid>
+                        <Grid item xs={12} md={6}>
+                          <FormControl fullWidth>
+                            <InputLabel>Group By</InputLabel>
+                            <Select
+                              multiple
+                              value={config[field]?.group_by || []}
+                              onChange={(e) => handleNestedConfigChange(field, 'group_by', e.target.value)}
+                              renderValue={(selected) => (
+                                <Box sx={{ display: 'flex', flexWrap: 'wrap', gap: 0.5 }}>
+                                  {selected.map((col) => (
+                                    <Chip key={col} label={col} size="small" />
+                                  ))}
+                                </Box>
+                              )}
+                            >
+                              {columns.map((col) => (
+                                <MenuItem key={col} value={col}>
+                                  {col}
+                                </MenuItem>
+                              ))}
+                            </Select>
+                          </FormControl>
+                        </Grid>
                       </Grid>
                     </CardContent>
                   </Card>
@@ -527,6 +753,16 @@ const DataConfig = ({ columns = [], onConfigUpdate, onRunChecks }) => {
               >
                 Reset to Defaults
               </Button>
+
+              <Button
+                variant="outlined"
+                startIcon={<Info />}
+                onClick={suggestFromProfile}
+                disabled={loading || !columns.length}
+                fullWidth
+              >
+                Suggest Column Types
+              </Button>
               
               <Divider />
               
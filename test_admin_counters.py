@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Dashboard counters: the counters maintained on every write match full counts after creating, deactivating,
+reactivating and deleting users and projects and after batched audit log writes, and the audit log pages by
+(created_at, id) so rows with the same timestamp are returned exactly once
+"""
+import os
+import tempfile
+from datetime import datetime
+
+# Throwaway database and cheap hashing; must be set before the backend is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_admin_counters.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from fastapi.testclient import TestClient
+from backend.audit import AuditLogWriter, audit_writer
+from backend.database import SessionLocal
+from backend.main import app
+from backend.models import Log, Project, User
+from backend.stats import read_counters
+
+
+def full_counts(db):
+    return {
+        "total_users": db.query(User).count(),
+        "active_users": db.query(User).filter(User.is_active == True).count(),
+        "total_projects": db.query(Project).count(),
+        "total_logs": db.query(Log).count(),
+    }
+
+
+def assert_counters():
+    audit_writer.flush()
+    db = SessionLocal()
+    try:
+        assert read_counters(db) == full_counts(db)
+    finally:
+        db.close()
+
+
+def new_user(db, name, **fields):
+    user = User(username=name, email=f"{name}@example.com", hashed_password="x", **fields)
+    db.add(user)
+    return user
+
+
+def test_counters_follow_writes():
+    with TestClient(app):
+        assert_counters()
+        db = SessionLocal()
+        try:
+            users = [new_user(db, f"counted_{i}") for i in range(4)]
+            new_user(db, "counted_inactive", is_active=False)
+            db.commit()
+            assert_counters()
+
+            owner_id = users[0].id
+            project = Project(name="Counted", owner_id=owner_id)
+            db.add(project)
+            users[1].is_active = False
+            users[2].is_active = False
+            db.commit()
+            assert_counters()
+
+            # Reactivated, and a change that is not about activity
+            users[1].is_active = True
+            users[3].full_name = "Renamed"
+            db.commit()
+            assert_counters()
+
+            db.delete(project)
+            db.delete(users[2])  # inactive
+            db.delete(users[3])  # active
+            db.commit()
+            assert_counters()
+        finally:
+            db.close()
+
+        # Batched audit inserts bump the counter in the same transaction
+        writer = AuditLogWriter(batch_size=3, flush_interval=60)
+        for i in range(7):
+            writer.enqueue({"user_id": owner_id, "action": "counted", "details": {"i": i},
+                            "created_at": datetime.utcnow()})
+        writer.stop()
+        assert writer.written == 7
+        assert_counters()
+
+
+def test_log_pages_break_timestamp_ties():
+    with TestClient(app) as client:
+        token = client.post("/token", data={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        same_time = datetime(2024, 1, 1, 12, 0, 0)
+        writer = AuditLogWriter(flush_interval=60)
+        for i in range(7):
+            writer.enqueue({"user_id": 1, "action": "tied", "details": {"i": i}, "created_at": same_time})
+        writer.stop()
+
+        ids, cursor = [], None
+        while True:
+            params = {"action": "tied", "limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/admin/logs", params=params, headers=headers)
+            assert response.status_code == 200, response.text
+            ids += [log["id"] for log in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        # Newest first; with equal timestamps the id decides, and no row is skipped or repeated
+        assert len(ids) == 7 and ids == sorted(set(ids), reverse=True)
+
+        for bad in ("not-base64!", "bm8tc2VwYXJhdG9y", "eHx5"):
+            response = client.get("/admin/logs", params={"cursor": bad}, headers=headers)
+            assert response.status_code == 400 and response.json()["detail"] == "Invalid cursor"
+        expected = read_stats()
+        assert client.get("/admin/stats", headers=headers).json() == expected
+
+
+def read_stats():
+    audit_writer.flush()
+    db = SessionLocal()
+    try:
+        return full_counts(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_counters_follow_writes()
+    test_log_pages_break_timestamp_ties()
+    print("✅ counters stay exact and logs page by (created_at, id)")
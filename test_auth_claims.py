@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Embedded token claims: revoking them (deactivating or demoting a user) is stored on the user, so tokens
+issued before are refused by every worker and after a restart, not only by the process that made the change
+"""
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Throwaway database and cheap hashing; must be set before the backend is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_auth_claims.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from backend import auth
+from backend.database import engine
+from backend.main import app
+
+
+def token_for(user_id, username, is_admin=True):
+    user = auth.User(id=user_id, username=username, is_active=True, is_admin=is_admin)
+    token = auth.create_access_token(auth.token_claims_for(user), timedelta(minutes=30))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_revoked_claims_are_shared_and_persisted():
+    embed = auth.AUTH_EMBED_USER_CLAIMS
+    auth.AUTH_EMBED_USER_CLAIMS = True
+    try:
+        with TestClient(app) as client:
+            client.post("/register", json={"username": "claims_admin", "email": "claims_admin@example.com",
+                                           "full_name": "Claims", "password": "claims123"})
+            client.post("/register", json={"username": "claims_other", "email": "claims_other@example.com",
+                                           "full_name": "Claims", "password": "claims123"})
+            with engine.begin() as connection:
+                connection.execute(text("UPDATE users SET is_admin = 1 WHERE username = 'claims_admin'"))
+                admin_id, = connection.execute(text("SELECT id FROM users WHERE username = 'claims_admin'")).one()
+                other_id, = connection.execute(text("SELECT id FROM users WHERE username = 'claims_other'")).one()
+            headers = token_for(admin_id, "claims_admin")
+            assert client.get("/admin/users", headers=headers).status_code == 200
+
+            # Demoted by another worker: only the database knows
+            with engine.begin() as connection:
+                connection.execute(text("UPDATE users SET is_admin = 0, claims_revoked_at = :now WHERE id = :id"),
+                                   {"now": datetime.utcnow(), "id": admin_id})
+            auth.claim_revocations._loaded_at = float("-inf")  # the refresh interval has passed
+            assert client.get("/admin/users", headers=headers).status_code == 403
+            # A restarted process loads the revocation again
+            restarted = auth.ClaimRevocations(60, 1800)
+            auth.claim_revocations, previous = restarted, auth.claim_revocations
+            try:
+                assert client.get("/admin/users", headers=headers).status_code == 403
+                assert admin_id in restarted._revoked
+            finally:
+                auth.claim_revocations = previous
+
+            # Changed through the ORM: stored on the row and refused here right away
+            with engine.begin() as connection:
+                connection.execute(text("UPDATE users SET is_admin = 1 WHERE id = :id"), {"id": admin_id})
+            # Tokens issued within the second of a revocation are not trusted (iat has whole seconds)
+            time.sleep(1.1)
+            fresh = token_for(admin_id, "claims_admin")
+            assert client.get("/admin/users", headers=fresh).status_code == 200
+            victim = token_for(other_id, "claims_other", is_admin=False)
+            response = client.put(f"/admin/users/{other_id}", json={"is_active": False}, headers=fresh)
+            assert response.status_code == 200, response.text
+            with engine.begin() as connection:
+                revoked, = connection.execute(text("SELECT claims_revoked_at FROM users WHERE id = :id"),
+                                              {"id": other_id}).one()
+            assert revoked is not None
+            assert client.get("/projects", headers=victim).status_code == 400
+
+            # Revocations older than the token lifetime are pruned on reload
+            pruning = auth.ClaimRevocations(0, 1800)
+            pruning.revoke(12345, at=1.0)
+            auth.claim_revocations, previous = pruning, auth.claim_revocations
+            try:
+                assert client.get("/admin/users", headers=fresh).status_code == 200
+                assert 12345 not in pruning._revoked
+            finally:
+                auth.claim_revocations = previous
+    finally:
+        auth.AUTH_EMBED_USER_CLAIMS = embed
+
+
+if __name__ == "__main__":
+    test_revoked_claims_are_shared_and_persisted()
+    print("✅ revoked token claims are refused across workers and restarts")
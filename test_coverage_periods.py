@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Coverage periods: overlaps (including a period inside an earlier one), gaps beyond max_gap_days and
+duplicate periods are found per key, timestamps are compared at their own resolution, unusable periods
+are skipped, and spilling the sweep to disk gives the same issues
+"""
+import pandas as pd
+from backend.custom_transformers import CoveragePeriodChecker
+
+PERIODS = pd.DataFrame([
+    # A: B sits inside the first period, then contiguous, then a 4-day gap
+    ("A", "2023-01-01", "2023-01-31"),
+    ("A", "2023-01-15", "2023-01-20"),
+    ("A", "2023-02-01", "2023-02-28"),
+    ("A", "2023-03-05", "2023-03-31"),
+    # B: overlapping by 3 days, then a duplicate of the second period
+    ("B", "2023-01-01", "2023-01-10"),
+    ("B", "2023-01-08", "2023-01-31"),
+    ("B", "2023-01-08", "2023-01-31"),
+    # C: a 1-day gap, then unusable periods
+    ("C", "2023-01-01", "2023-01-10"),
+    ("C", "2023-01-12", "2023-01-31"),
+    ("C", None, "2023-02-10"),
+    ("C", "2023-03-10", "2023-03-01"),
+    (None, "2023-01-01", "2023-01-05"),
+], columns=["policy_number", "start_date", "end_date"])
+
+
+def check(frame, **params):
+    checker = CoveragePeriodChecker("policy_number", "start_date", "end_date", **params)
+    checker.fit_transform(frame)
+    return checker.errors
+
+
+def issues(errors):
+    return sorted(zip(errors["Row_Index"], errors["Issue"], errors["Days"]))
+
+
+def test_overlaps_gaps_and_duplicates():
+    errors = check(PERIODS)
+    assert issues(errors) == [
+        (1, "Overlap", 6),           # 15th to 20th, not up to the 31st
+        (3, "Gap", 4),
+        (5, "Overlap", 3),
+        (6, "DuplicatePeriod", 0),
+        (8, "Gap", 1),
+    ]
+    contained = errors[errors["Row_Index"] == 1].iloc[0]
+    assert contained["Previous_Row_Index"] == 0 and contained["Key"] == "A"
+    assert set(errors["Check"]) == {"CoveragePeriodChecker"}
+
+    # Gaps of up to max_gap_days days are tolerated
+    assert [row for row in issues(check(PERIODS, max_gap_days=1)) if row[1] == "Gap"] == [(3, "Gap", 4)]
+    assert not any(row[1] == "Gap" for row in issues(check(PERIODS, max_gap_days=4)))
+
+
+def test_spilled_sweep_matches():
+    frame = pd.concat([PERIODS] * 3, ignore_index=True)
+    frame["policy_number"] = frame["policy_number"] + pd.Series(frame.index // len(PERIODS)).astype(str)
+    in_memory = check(frame)
+    spilled = check(frame, spill_rows=4)
+    assert len(in_memory) == 15
+    pd.testing.assert_frame_equal(in_memory, spilled)
+
+
+def test_timestamps_keep_their_resolution():
+    frame = pd.DataFrame({
+        "policy_number": ["A", "A", "A", "B", "B"],
+        "start_date": pd.to_datetime(["2023-01-01 10:00", "2023-01-01 12:00", "2023-01-01 12:30",
+                                      "2023-01-01 10:00", "2023-01-01 11:00"]),
+        "end_date": pd.to_datetime(["2023-01-01 11:00", "2023-01-01 13:00", "2023-01-01 14:00",
+                                    "2023-01-01 11:00", "2023-01-01 12:00"]),
+    })
+    errors = check(frame)
+    # One hour apart, then half an hour of overlap; B is contiguous to the minute
+    assert [(row, issue) for row, issue, _ in issues(errors)] == [(1, "Gap"), (2, "Overlap")]
+    assert list(errors["Days"]) == [1 / 24, 1 / 48]
+
+
+if __name__ == "__main__":
+    test_overlaps_gaps_and_duplicates()
+    test_spilled_sweep_matches()
+    test_timestamps_keep_their_resolution()
+    print("✅ coverage periods are swept for overlaps, gaps and duplicates")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Fuzzy duplicates: spellings of one policy number that differ in punctuation, case or a typo are clustered,
+while numbers differing only in their digits and exact repeats of one spelling are not reported
+"""
+import pandas as pd
+from backend.custom_transformers import FuzzyDuplicateDetector
+
+
+def test_eucebia_dube_variants():
+    frame = pd.DataFrame({"policy_number": [
+        "EUCEBIA__DUBE_3",   # 0
+        "RACHAEL__RAMUSHU_4",
+        "EUCEBIA_DUBE_3",    # 2: punctuation
+        "eucebia dube-3",    # 3: case and separators
+        "EUCEBIA__DUBEE_3",  # 4: a typo
+        "EUCEBIA__DUBE_4",   # 5: another policy (digits differ)
+        "RACHAEL__RAMUSHU_4",
+        None,
+        "EUCEBIA__DUBE_3",   # 8: same spelling as row 0
+    ]}, index=range(100, 109))
+    detector = FuzzyDuplicateDetector(columns=["policy_number"])
+    output = detector.fit_transform(frame)
+    assert output is frame
+    errors = detector.errors
+
+    assert list(errors["Row_Index"]) == [100, 102, 103, 104, 108]
+    assert set(errors["Cluster"]) == {100} and set(errors["Cluster_Size"]) == {5}
+    assert set(errors["Representative"]) == {"EUCEBIA__DUBE_3"}
+    assert set(errors["Column"]) == {"policy_number"} and set(errors["Check"]) == {"FuzzyDuplicateDetector"}
+    assert detector.stats["similar_pairs"] >= 1
+
+    # Without digit blocking DUBE_4 falls into the cluster as well
+    loose = FuzzyDuplicateDetector(columns=["policy_number"], match_digits=False)
+    loose.fit_transform(frame)
+    assert 105 in set(loose.errors["Row_Index"])
+    # Nothing to report when every value is spelled one way
+    exact = FuzzyDuplicateDetector(columns=["policy_number"])
+    exact.fit_transform(frame.iloc[[0, 1, 6, 8]])
+    assert exact.errors.empty
+
+
+if __name__ == "__main__":
+    test_eucebia_dube_variants()
+    print("✅ near-duplicate policy numbers are clustered")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Password hashing pool: bcrypt runs on a bounded pool, at most `workers` at once with `max_queue` more waiting,
+further requests are refused with 503, and the hashes it makes verify (and are upgraded when the cost changes)
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+# Throwaway database and cheap hashing; must be set before the backend is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_hashing_pool.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from backend import auth
+from backend.auth import HashingPool
+
+
+def test_pool_bounds_and_stats():
+    async def scenario():
+        pool = HashingPool(workers=2, max_queue=1)
+        release = threading.Event()
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow_hash(value):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            release.wait(5)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return value * 2
+
+        tasks = [asyncio.create_task(pool.run(slow_hash, i)) for i in range(3)]
+        while pool.in_flight < 3:
+            await asyncio.sleep(0.01)
+        stats = pool.stats()
+        assert stats["in_flight"] == 3 and stats["queue_depth"] == 1
+        assert stats["average_seconds"] is None
+
+        # Two hashing and one waiting: the next request is turned away right away
+        try:
+            await pool.run(slow_hash, 99)
+            raise AssertionError("The full pool accepted more work")
+        except HTTPException as e:
+            assert e.status_code == 503 and e.headers["Retry-After"] == "1"
+
+        release.set()
+        assert await asyncio.gather(*tasks) == [0, 2, 4]
+        assert peak[0] == 2
+        stats = pool.stats()
+        assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+        assert stats["completed"] == 3 and stats["rejected"] == 1
+        assert stats["average_seconds"] >= 0.01
+
+        # A failing job still frees its slot
+        def broken(_):
+            raise ValueError("bad hash")
+        try:
+            await pool.run(broken, None)
+        except ValueError:
+            pass
+        assert pool.in_flight == 0 and pool.completed == 4
+        assert await pool.run(slow_hash, 5) == 10
+
+    asyncio.run(scenario())
+
+
+def test_hashes_verify_and_upgrade():
+    async def scenario():
+        hashed = await auth.get_password_hash_async("s3cret")
+        assert hashed.startswith(f"$2b${auth.BCRYPT_ROUNDS:02d}$")
+        assert await auth.hashing_pool.run(auth.verify_password, "s3cret", hashed)
+        assert not await auth.hashing_pool.run(auth.verify_password, "wrong", hashed)
+        assert await auth.hashing_pool.run(auth.pwd_context.verify_and_update, "s3cret", hashed) == (True, None)
+
+        # A hash made with another cost verifies and comes back rehashed at the configured cost
+        older = CryptContext(schemes=["bcrypt"], bcrypt__rounds=auth.BCRYPT_ROUNDS + 1).hash("s3cret")
+        valid, upgraded = await auth.hashing_pool.run(auth.pwd_context.verify_and_update, "s3cret", older)
+        assert valid and upgraded.startswith(f"$2b${auth.BCRYPT_ROUNDS:02d}$")
+        assert auth.verify_password("s3cret", upgraded)
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_pool_bounds_and_stats()
+    test_hashes_verify_and_upgrade()
+    print("✅ password hashing is bounded and its hashes verify")
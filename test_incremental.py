@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Incremental validation: a batch checked against the project's baseline finds the rows, keys and IDs of
+earlier batches and new category values, and the state survives being merged and reloaded
+"""
+import tempfile
+
+import pandas as pd
+from backend.incremental import Baseline
+
+CONFIG = {
+    "duplicate_key_columns": ["policy_number", "start_date"],
+    "id_column": "policy_number",
+    "category_validation": {"line_of_business": ["HEALTH", "LIFE"]},
+}
+
+
+def batch(numbers, start_date="2023-01-01", line="HEALTH", premiums=100.0):
+    return pd.DataFrame({
+        "policy_number": numbers,
+        "start_date": start_date,
+        "line_of_business": line,
+        "premiums": premiums,
+    })
+
+
+def validate(baseline, frame, config=CONFIG):
+    errors, delta = baseline.check(frame, config)
+    baseline.append(delta, config)
+    return errors
+
+
+def test_cross_batch_duplicates():
+    with tempfile.TemporaryDirectory() as root:
+        baseline = Baseline(1, root=root)
+        assert validate(baseline, batch(["P1", "P2", "P3"])) == {}
+
+        # P2 again: the same row, key and ID; P4 is new; P3 comes back with another start date
+        second = batch(["P2", "P4", "P3"], start_date=["2023-01-01", "2023-01-01", "2023-06-01"])
+        errors = validate(baseline, second)
+        assert list(errors["baseline_rows"]["Row_Index"]) == [0]
+        assert list(errors["baseline_keys"]["Row_Index"]) == [0]
+        assert errors["baseline_keys"]["Check"].iloc[0] == "DuplicateIdentifier"
+        assert list(errors["baseline_ids"]["Row_Index"]) == [0, 2]
+
+        # Dtypes differ between batches (integers vs floats) but the values are the same
+        numeric = {"duplicate_key_columns": ["policy_number"]}
+        ints = Baseline(2, root=root)
+        validate(ints, pd.DataFrame({"policy_number": [1, 2, 3]}), numeric)
+        errors = validate(ints, pd.DataFrame({"policy_number": [3.0, 4.0, None]}), numeric)
+        assert list(errors["baseline_keys"]["Row_Index"]) == [0]
+
+
+def test_outliers_mad_and_segments():
+    with tempfile.TemporaryDirectory() as root:
+        mad = {"outlier_detection": {"columns": ["premiums"], "method": "mad", "threshold": 3.5}}
+        baseline = Baseline(4, root=root)
+        validate(baseline, batch([f"P{i}" for i in range(20)], premiums=[100.0 + i for i in range(20)]), mad)
+        errors = validate(baseline, batch(["Q1", "Q2"], premiums=[105.0, 5000.0]), mad)
+        row = errors["baseline_outliers"].iloc[0]
+        assert row["Method"] == "mad" and row["Outliers_Detected"] == 1 and row["Baseline_Rows"] == 20
+
+        # Judged per line of business: 900 is usual for LIFE but not for HEALTH; MOTOR is too small to judge
+        grouped = {"outlier_detection": {"columns": ["premiums"], "method": "mad", "threshold": 3.5,
+                                         "group_by": ["line_of_business"], "min_group_size": 10}}
+        segments = Baseline(5, root=root)
+        first = pd.concat([
+            batch([f"H{i}" for i in range(15)], premiums=[100.0 + i for i in range(15)]),
+            batch([f"L{i}" for i in range(15)], line="LIFE", premiums=[900.0 + i for i in range(15)]),
+        ], ignore_index=True)
+        assert validate(segments, first, grouped) == {}
+        second = batch(["H99", "L99", "M1"], line=["HEALTH", "LIFE", "MOTOR"], premiums=[900.0, 905.0, 1e6])
+        errors = validate(segments, second, grouped)["baseline_outliers"]
+        assert list(errors["Row_Index"]) == [0] and errors["Group"].iloc[0] == "HEALTH"
+        assert errors["Baseline_Rows"].iloc[0] == 30
+        # The segments' state was stored and reloaded
+        assert set(segments.load()["outliers"]["premiums"]["groups"]) == {"HEALTH", "LIFE", "MOTOR"}
+        errors = validate(segments, batch(["H100"], premiums=5000.0), grouped)
+        assert list(errors["baseline_outliers"]["Group"]) == ["HEALTH"]
+
+
+def test_segments_merge_and_categories():
+    with tempfile.TemporaryDirectory() as root:
+        baseline = Baseline(3, root=root)
+        for i in range(12):
+            validate(baseline, batch([f"P{i}"]))
+        summary = baseline.summary()
+        assert summary["row_count"] == 12 and len(summary["batches"]) == 12
+        # More than BASELINE_MAX_SEGMENTS segments were merged
+        assert all(segments <= 8 for segments in summary["indexes"].values())
+        errors = validate(baseline, batch(["P0", "P11", "P99"], line=["HEALTH", "MOTOR", "MOTOR"]))
+        assert list(errors["baseline_ids"]["Row_Index"]) == [0, 1]
+        assert errors["baseline_categories"]["New_Values"].iloc[0] == ["MOTOR"]
+        # Known from now on
+        assert "baseline_categories" not in validate(baseline, batch(["P100"], line="MOTOR"))
+
+        baseline.ensure_compatible(CONFIG)
+        try:
+            baseline.ensure_compatible({**CONFIG, "id_column": "start_date"})
+            raise AssertionError("A changed configuration was accepted")
+        except ValueError:
+            pass
+        baseline.reset()
+        assert baseline.summary() is None
+
+
+if __name__ == "__main__":
+    test_cross_batch_duplicates()
+    test_outliers_mad_and_segments()
+    test_segments_merge_and_categories()
+    print("✅ batches are validated against the baseline")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+MAD outliers: when more than half of the values are equal (a fixed premium) the MAD is 0, and the scaled mean
+absolute deviation bounds the values instead, so only the real outlier is flagged on every path
+"""
+import tempfile
+
+import numpy as np
+import pandas as pd
+from backend.custom_transformers import ColumnProfiler, OutlierDetector
+from backend.incremental import Baseline
+from backend.pipeline import Pipeline, create_issue_pipeline, run_pipeline
+from backend.polars_engine import run_pipeline_polars
+from backend.profiler import DataProfile
+
+# 15 fixed premiums and five others, of which only 150 is far off
+PREMIUMS = [100.0] * 15 + [99.9, 100.5, 101.0, 99.0, 150.0]
+
+
+def test_zero_mad_falls_back_to_mean_deviation():
+    frame = pd.DataFrame({"premiums": PREMIUMS, "line_of_business": "HEALTH"})
+
+    detector = OutlierDetector(columns=["premiums"], method="mad", threshold=3.5)
+    detector.fit_transform(frame)
+    assert detector.errors["Outliers_Detected"].tolist() == [1]
+
+    # Bounds from the shared profile path
+    profile = DataProfile()
+    profiled = OutlierDetector(columns=["premiums"], method="mad", threshold=3.5, profile=profile)
+    run_pipeline(Pipeline([("column_profiler", ColumnProfiler(profile=profile, columns=["premiums"])),
+                           ("outlier_detector", profiled)]), frame)
+    assert profiled.errors["Outliers_Detected"].tolist() == [1]
+
+    grouped = OutlierDetector(columns=["premiums"], method="mad", threshold=3.5, group_by=["line_of_business"])
+    grouped.fit_transform(frame)
+    assert grouped.errors["Row_Index"].tolist() == [19]
+    lower, upper = grouped.errors[["Lower_Bound", "Upper_Bound"]].iloc[0]
+    assert lower < 99.0 and 101.0 < upper < 150.0
+
+    # All values equal: nothing to flag
+    constant = OutlierDetector(columns=["premiums"], method="mad")
+    constant.fit_transform(pd.DataFrame({"premiums": [100.0] * 10}))
+    assert constant.errors.empty
+
+    # A nonzero MAD keeps the usual bounds
+    spread = OutlierDetector.robust_spread(pd.Series([2.0, 0.0]), pd.Series([5.0, 3.0]))
+    assert np.allclose(spread, [2.0 * OutlierDetector.MAD_SCALE, 3.0 * OutlierDetector.MEAN_AD_SCALE])
+
+
+def test_zero_mad_on_polars_and_baseline():
+    config = {"numeric_columns": ["premiums"], "outlier_detection": {"columns": ["premiums"], "method": "mad",
+                                                                      "threshold": 3.5}}
+    frame = pd.DataFrame({"premiums": PREMIUMS})
+    result = run_pipeline_polars(create_issue_pipeline(config), frame)
+    assert result["errors"]["outlier_detector"]["Outliers_Detected"].tolist() == [1]
+
+    with tempfile.TemporaryDirectory() as root:
+        baseline = Baseline(1, root=root)
+        errors, delta = baseline.check(frame.iloc[:15], config)
+        baseline.append(delta, config)
+        errors, _ = baseline.check(frame.iloc[15:].reset_index(drop=True), config)
+        assert errors["baseline_outliers"]["Outliers_Detected"].tolist() == [1]
+
+
+if __name__ == "__main__":
+    test_zero_mad_falls_back_to_mean_deviation()
+    test_zero_mad_on_polars_and_baseline()
+    print("✅ a MAD of 0 no longer flags every value off the median")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Check planning: steps without configuration are skipped with a reason, the two text hygiene steps are fused
+into one pass, the profiler covers only what its consumers read, and a missing mandatory column is predicted
+to stop a fail-fast run where the run then actually stops
+"""
+import pandas as pd
+from backend.pipeline import create_issue_pipeline, run_pipeline
+from backend.planner import compile_plan
+
+CONFIG = {
+    "mandatory_columns": ["policy_number", "start_date"],
+    "text_columns": ["policy_number", "line_of_business"],
+    "numeric_columns": ["premiums"],
+    "id_column": "policy_number",
+    "duplicate_key_columns": ["policy_number"],
+}
+
+
+def test_skip_fuse_and_profile():
+    plan = compile_plan(CONFIG, columns=["Policy Number", "Start Date", "Line of Business", "Premiums"], rows=1000)
+    names = [step["name"] for step in plan["steps"]]
+    skipped = {step["name"]: step["reason"] for step in plan["skipped"]}
+
+    assert skipped["fuzzy_duplicate_detector"] == "no fuzzy_duplicates.columns configured"
+    assert skipped["final_saver"] == "no export.format configured"
+    assert not set(skipped) & set(names)
+    # One text pass instead of two
+    text_cleaner = next(step for step in plan["steps"] if step["name"] == "text_cleaner")
+    assert text_cleaner["merges"] == ["whitespace_case_cleaner", "remove_unwanted_chars"]
+    assert "whitespace_case_cleaner" not in names and "remove_unwanted_chars" not in names
+    # Structure first; the profiler reads the union of its consumers' columns
+    assert names[:3] == ["column_name_cleaner", "mandatory_columns_checker", "text_cleaner"]
+    profiler = next(step for step in plan["steps"] if step["name"] == "column_profiler")
+    assert set(profiler["columns"]) == {"policy_number", "line_of_business", "premiums"}
+    assert "id_validator" in profiler["consumers"] and "duplicate_identifier" not in profiler["consumers"]
+    # Column names are matched after cleaning, so nothing is missing
+    assert plan["expected_stop"] is None
+    assert all(step["missing_columns"] == [] for step in plan["steps"] if "missing_columns" in step)
+    assert plan["estimated_seconds"] > 0
+
+    # Without a check that reads it, the profiler is dropped too
+    bare = compile_plan({"duplicate_key_columns": ["policy_number"]})
+    assert "column_profiler" in {step["name"] for step in bare["skipped"]}
+    assert bare["estimated_seconds"] is None
+
+
+def test_expected_stop():
+    frame = pd.DataFrame({"policy_number": ["P1", "P1"], "line_of_business": ["HEALTH", "LIFE"], "premiums": ["100", "-5"]})
+    plan = compile_plan(CONFIG, columns=list(frame.columns), rows=len(frame))
+    assert plan["fatal_steps"] == ["mandatory_columns_checker"]
+    assert plan["expected_stop"] == "mandatory_columns_checker"
+    mandatory = next(step for step in plan["steps"] if step["name"] == "mandatory_columns_checker")
+    assert mandatory["missing_columns"] == ["start_date"]
+
+    result = run_pipeline(create_issue_pipeline(CONFIG, plan=plan), frame)
+    assert result["stopped_by"] == plan["expected_stop"]
+    assert list(result["timings"]) == ["column_name_cleaner", "mandatory_columns_checker", "issue_saver"]
+    assert "duplicate_identifier" in result["skipped"]
+
+    # Without fail_fast nothing is fatal and every check runs
+    relaxed = compile_plan({**CONFIG, "fail_fast": False}, columns=list(frame.columns), rows=len(frame))
+    assert relaxed["fatal_steps"] == [] and relaxed["expected_stop"] is None
+    result = run_pipeline(create_issue_pipeline({**CONFIG, "fail_fast": False}, plan=relaxed), frame)
+    assert result["stopped_by"] is None and "duplicate_identifier" in result["errors"]
+
+
+if __name__ == "__main__":
+    test_skip_fuse_and_profile()
+    test_expected_stop()
+    print("✅ plans skip, fuse and predict where a run stops")
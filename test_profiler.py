@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Column profiles: quantile sketches are exact up to their capacity and close beyond it, and a profile only
+answers for the frame of the run that fitted it
+"""
+import numpy as np
+import pandas as pd
+from backend.custom_transformers import OutlierDetector
+from backend.pipeline import Pipeline, run_pipeline
+from backend.profiler import DataProfile, QuantileSketch
+
+
+def test_quantile_sketch_exact_and_compacted():
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(mean=5, sigma=1, size=50_000)
+
+    exact = QuantileSketch(capacity=len(values))
+    for chunk in np.array_split(values, 7):
+        exact.update(chunk)
+    assert exact.weights is None
+    for q in (0.0, 0.25, 0.5, 0.75, 0.99, 1.0):
+        assert exact.quantile(q) == pd.Series(values).quantile(q)
+
+    compacted = QuantileSketch(capacity=1_000)
+    for chunk in np.array_split(values, 7):
+        compacted.update(chunk)
+    assert len(compacted.values) == 1_000 and np.isclose(compacted.weights.sum(), len(values))
+    ordered = np.sort(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        # Within half a percent of rank of the true quantile
+        rank = np.searchsorted(ordered, compacted.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.005, (q, rank)
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_profile_is_tied_to_the_run():
+    frame = pd.DataFrame({"premiums": [100.0, 110.0, 120.0, 5000.0]})
+    profile = DataProfile().fit(frame)
+    assert profile.get("premiums", frame).row_count == 4
+    # A different frame of the same length, even one reusing a freed frame's id, gets no profile
+    assert profile.get("premiums", frame.copy()) is None
+
+    # A run without the profiler step does not read the profile left by an earlier run
+    detector = OutlierDetector(columns=["premiums"], profile=profile)
+    run_pipeline(Pipeline([("outlier_detector", detector)]), frame)
+    assert profile.columns == {} and profile.get("premiums", frame) is None
+
+
+if __name__ == "__main__":
+    test_quantile_sketch_exact_and_compacted()
+    test_profile_is_tied_to_the_run()
+    print("✅ profiles are exact, bounded and tied to their run")
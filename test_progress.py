@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Run progress: steps and chunks are reported as events with an ETA, chunk events are throttled,
+cancelling stops a run at its next chunk, and background runs stream their events over SSE
+"""
+import json
+import os
+import tempfile
+import traceback
+
+# Throwaway database and uploads; must be set before the backend is imported
+_scratch = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/test_progress.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from backend.main import app, read_data_file
+from backend.pipeline import create_issue_pipeline, run_pipeline
+from backend.planner import compile_plan
+from backend.progress import RunCancelled, RunProgress, report_chunk, tracking
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+CONFIG = {
+    "text_columns": ["policy_number", "premium_frequency", "line_of_business"],
+    "numeric_columns": ["premiums", "commission"],
+    "date_columns": ["start_date", "end_date"],
+    "duplicate_key_columns": ["policy_number", "start_date"],
+    "category_validation": {"line_of_business": ["HEALTH", "LIFE"]},
+    "profile_chunk_size": 2000,
+}
+
+
+def policies(copies=1):
+    frame = read_data_file(os.path.join(BACKEND_DIR, "policy_schedule.csv"))
+    return pd.concat([frame] * copies, ignore_index=True)
+
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append(json.loads(fields["data"]))
+    return events
+
+
+def test_progress_events_and_eta():
+    frame = policies()
+    plan = compile_plan(CONFIG, columns=list(frame.columns), rows=len(frame))
+    progress = RunProgress("unit", min_interval=0.0)
+    progress.start(plan, "pandas")
+    result = run_pipeline(create_issue_pipeline(CONFIG, plan=plan), frame.copy(), progress)
+    progress.finish("finished")
+
+    names = [event["event"] for event in progress.events]
+    assert names[0] == "run_started" and names[-1] == "run_finished"
+    assert progress.events[0]["steps"] == [step["name"] for step in plan["steps"]]
+    started = [event["step"] for event in progress.events if event["event"] == "step_started"]
+    finished = [event for event in progress.events if event["event"] == "step_finished"]
+    assert started == [event["step"] for event in finished] == list(result["timings"])
+    # The profile is built 2000 rows at a time, each chunk reported
+    chunks = [event for event in progress.events if event["event"] == "progress"]
+    assert len(chunks) >= len(frame) // 2000 and chunks[-1]["rows_done"] == len(frame)
+    assert finished[-1]["eta_seconds"] == 0
+    assert sum(progress.issue_counts.values()) == sum(len(e) for e in result["errors"].values() if e is not None)
+    assert [event["id"] for event in progress.events] == list(range(1, len(progress.events) + 1))
+
+
+def test_chunk_events_are_throttled():
+    progress = RunProgress("throttled", min_interval=60.0)
+    progress.start()
+    progress.step_started("column_profiler")
+    with tracking(progress):
+        for rows in range(100, 1001, 100):
+            report_chunk(rows, 1000)
+    assert [event["event"] for event in progress.events].count("progress") == 1
+    # Outside a tracked run reporting does nothing
+    report_chunk(1, 2)
+
+
+def test_cancel_stops_at_next_chunk():
+    frame = policies()
+    progress = RunProgress("cancelled", min_interval=0.0)
+    progress.start()
+    seen = []
+
+    def cancel_after_first_chunk(rows_done, rows_total):
+        seen.append(rows_done)
+        RunProgress.chunk(progress, rows_done, rows_total)
+        progress.cancel()
+
+    progress.chunk = cancel_after_first_chunk
+    try:
+        run_pipeline(create_issue_pipeline(CONFIG), frame.copy(), progress)
+        raise AssertionError("The run was not cancelled")
+    except RunCancelled:
+        pass
+    assert seen and len(seen) < 3
+    assert "step_finished" not in [event["event"] for event in progress.events][-2:]
+
+
+def test_cancel_inside_long_steps():
+    frame = policies()
+    config = {
+        "numeric_columns": ["premiums"],
+        "fuzzy_duplicates": {"columns": ["policy_number"]},
+        "coverage_periods": {"key_column": "policy_number", "start_column": "start_date",
+                             "end_column": "end_date", "dayfirst": True},
+        "outlier_detection": {"columns": ["premiums"], "method": "mad", "group_by": ["line_of_business"]},
+    }
+    for cancelled_step in ("fuzzy_duplicate_detector", "coverage_period_checker", "outlier_detector"):
+        progress = RunProgress(cancelled_step, min_interval=0.0)
+        progress.start()
+
+        def cancel_once_started(name, step=cancelled_step):
+            RunProgress.step_started(progress, name)
+            if name == step:
+                progress.cancel()
+
+        progress.step_started = cancel_once_started
+        try:
+            run_pipeline(create_issue_pipeline(config), frame.copy(), progress)
+            raise AssertionError(f"{cancelled_step} was not cancelled")
+        except RunCancelled as e:
+            raised_in = [frame.filename for frame in traceback.extract_tb(e.__traceback__)]
+        # Stopped inside the step, not at the start of the next one
+        assert any(name.endswith(("custom_transformers.py", "similarity.py")) for name in raised_in), raised_in
+        last = progress.events[-1]
+        assert last["event"] == "step_started" and last["step"] == cancelled_step, last
+
+
+def test_failed_store_ends_the_run():
+    import backend.main as main
+
+    async def broken_store(*args):
+        raise RuntimeError("database is locked")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "policies.csv")
+        policies().to_csv(path, index=False)
+        with TestClient(app) as client:
+            with open(path, "rb") as f:
+                assert client.post("/upload", files={"file": ("policies.csv", f, "text/csv")}).status_code == 200
+            assert client.post("/configure-checks", json=CONFIG).status_code == 200
+            store, main.record_run = main.record_run, broken_store
+            try:
+                run = client.post("/identify-issues", params={"background": "true"}).json()
+            finally:
+                main.record_run = store
+            events = parse_sse(client.get(run["events"]).text)
+            assert events[-1]["event"] == "run_failed" and "database is locked" in events[-1]["error"]
+            assert main.progress_runs.get(run["run_uuid"]).finished_at is not None
+
+
+def test_background_run_streams_events():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "policies.csv")
+        policies().to_csv(path, index=False)
+        with TestClient(app) as client:
+            with open(path, "rb") as f:
+                assert client.post("/upload", files={"file": ("policies.csv", f, "text/csv")}).status_code == 200
+            assert client.post("/configure-checks", json=CONFIG).status_code == 200
+            started = client.post("/identify-issues", params={"background": "true"})
+            assert started.status_code == 202, started.text
+            run = started.json()
+            response = client.get(run["events"])
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse_sse(response.text)
+            names = [event["event"] for event in events]
+            assert names[0] == "run_started" and names[-1] == "run_finished"
+            assert "step_started" in names and "step_finished" in names
+            final = events[-1]["response"]
+            assert final["run_uuid"] == run["run_uuid"] and final["total_issues"] > 0
+            assert client.get(final["summary_download"]).status_code == 200
+
+            # Reconnecting resumes after the last event seen
+            resumed = parse_sse(client.get(run["events"], headers={"Last-Event-ID": str(events[-2]["id"])}).text)
+            assert [event["event"] for event in resumed] == ["run_finished"]
+            assert client.post(run["cancel"]).status_code == 409
+            assert client.post("/identify-issues/missing/cancel").status_code == 404
+            assert client.get("/identify-issues/missing/events").status_code == 404
+
+
+def register(client, username):
+    client.post("/register", json={"username": username, "email": f"{username}@example.com",
+                                   "full_name": "Progress", "password": "progress123"})
+    token = client.post("/token", data={"username": username, "password": "progress123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_project_runs_are_owner_only():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "policies.csv")
+        policies().to_csv(path, index=False)
+        with TestClient(app) as client:
+            owner, other = register(client, "progressowner"), register(client, "progressother")
+            project = client.post("/projects", json={"name": "progress"}, headers=owner).json()
+            with open(path, "rb") as f:
+                assert client.post("/upload", files={"file": ("policies.csv", f, "text/csv")}).status_code == 200
+            assert client.post("/configure-checks", json=CONFIG).status_code == 200
+            started = client.post("/identify-issues", params={"background": "true", "project_id": project["id"]},
+                                  headers=owner)
+            assert started.status_code == 202, started.text
+            run = started.json()
+
+            # Neither an anonymous caller nor another user can follow or stop the project's run
+            assert client.get(run["events"]).status_code == 401
+            assert client.post(run["cancel"]).status_code == 401
+            assert client.get(run["events"], headers=other).status_code == 404
+            assert client.post(run["cancel"], headers=other).status_code == 404
+            events = parse_sse(client.get(run["events"], headers=owner).text)
+            assert events[-1]["event"] == "run_finished"
+            assert client.post(run["cancel"], headers=owner).status_code == 409
+
+
+if __name__ == "__main__":
+    test_progress_events_and_eta()
+    test_chunk_events_are_throttled()
+    test_cancel_stops_at_next_chunk()
+    test_cancel_inside_long_steps()
+    test_failed_store_ends_the_run()
+    test_background_run_streams_events()
+    test_project_runs_are_owner_only()
+    print("✅ run progress is streamed and runs can be cancelled")
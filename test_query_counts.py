@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Check that list endpoints run a constant number of queries however many rows they return
+"""
+import os
+import tempfile
+
+# Throwaway database and cheap hashing; must be set before the backend is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_query_counts.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from fastapi.testclient import TestClient
+from backend.audit import audit_writer
+from backend.database import QueryCounter, async_engine
+from backend.main import app
+
+
+def login(client, username, password):
+    token = client.post("/token", data={"username": username, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def register(client, username):
+    client.post("/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "full_name": "Query Count",
+        "password": "querycount123"
+    })
+    return login(client, username, "querycount123")
+
+
+def count_queries(client, path, headers):
+    client.get(path, headers=headers)  # warm the auth cache
+    # Only the request engine; the audit writer inserts on the sync engine in the background
+    with QueryCounter(async_engine) as queries:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return queries.count, response.json()
+
+
+def test_query_counts():
+    with TestClient(app) as client:
+        admin = login(client, "admin", "admin123")
+
+        few = register(client, "fewprojects")
+        client.post("/projects", json={"name": "only"}, headers=few)
+        many = register(client, "manyprojects")
+        for n in range(20):
+            client.post("/projects", json={"name": f"project-{n}"}, headers=many)
+        few_count, _ = count_queries(client, "/projects", few)
+        many_count, projects = count_queries(client, "/projects", many)
+        assert len(projects) == 20
+        assert few_count == many_count == 1, (few_count, many_count)
+
+        users_before, _ = count_queries(client, "/admin/users", admin)
+        for n in range(10):
+            register(client, f"extra{n}")
+        users_after, users = count_queries(client, "/admin/users", admin)
+        assert len(users) >= 13
+        assert users_before == users_after == 1, (users_before, users_after)
+
+        audit_writer.flush()
+        logs_small, _ = count_queries(client, "/admin/logs?limit=2", admin)
+        logs_large, logs = count_queries(client, "/admin/logs?limit=50", admin)
+        assert len({log["user"]["username"] for log in logs}) > 1
+        # One query for the page and one for all of its users
+        assert logs_small == logs_large == 2, (logs_small, logs_large)
+        print(f"✅ /projects: {many_count} query, /admin/users: {users_after} query, /admin/logs: {logs_large} queries")
+
+
+if __name__ == "__main__":
+    test_query_counts()
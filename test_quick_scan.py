@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Quick scan: the sampled estimates of each check cover the rate of the full run, including the key sample
+estimates of the duplicate checks, and a scan can be promoted to a full run
+"""
+import os
+import tempfile
+
+# Throwaway database and uploads; must be set before the backend is imported
+_scratch = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/test_quick_scan.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from backend.main import app, read_data_file
+from backend.pipeline import create_issue_pipeline, run_pipeline
+from backend.quick_scan import HyperLogLog, quick_scan, stratified_sample, wilson_interval
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+CONFIG = {
+    "text_columns": ["policy_number", "premium_frequency", "line_of_business"],
+    "numeric_columns": ["premiums", "commission", "reinsurance_premium"],
+    "date_columns": ["start_date", "end_date"],
+    "id_column": "policy_number",
+    "duplicate_key_columns": ["policy_number", "start_date"],
+    "start_end_year": {"start_year_column": "start_date", "end_year_column": "end_date"},
+    "category_validation": {"line_of_business": ["HEALTH", "LIFE"]},
+    "constant_value_threshold": 0.9,
+}
+
+
+def policies(copies):
+    """The sample policies repeated with a distinct suffix per copy, so only the sample's own repeats are duplicates."""
+    frame = read_data_file(os.path.join(BACKEND_DIR, "policy_schedule.csv"))
+    frames = []
+    for copy in range(copies):
+        part = frame.copy()
+        part["policy_number"] = part["policy_number"] + f"_{copy}"
+        frames.append(part)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(0.0, 1000)
+    assert low == 0.0 and 0.003 < high < 0.004
+    low, high = wilson_interval(0.5, 100)
+    assert abs(low - 0.4038) < 1e-3 and abs(high - 0.5962) < 1e-3
+    assert wilson_interval(0.2, float("inf")) == (0.2, 0.2)
+
+
+def test_hyperloglog():
+    rng = np.random.default_rng(0)
+    sketch = HyperLogLog(14)
+    values = pd.Series(rng.integers(0, 300_000, 1_000_000))
+    sketch.add(pd.util.hash_pandas_object(values, index=False).to_numpy())
+    exact = values.nunique()
+    assert abs(sketch.count() - exact) < 3 * sketch.relative_error * exact, (sketch.count(), exact)
+    small = HyperLogLog(14)
+    small.add(pd.util.hash_pandas_object(pd.Series(np.arange(500)), index=False).to_numpy())
+    assert abs(small.count() - 500) < 5
+
+
+def test_stratified_sample():
+    frame = pd.DataFrame({"group": ["a"] * 9000 + ["b"] * 990 + ["c"] * 10})
+    positions, codes, counts, allocation = stratified_sample(frame, 1000, ["group"], seed=3)
+    assert list(counts) == [9000, 990, 10]
+    assert list(allocation) == [900, 99, 1]
+    assert len(np.unique(positions)) == len(positions) == 1000
+    assert (frame["group"].to_numpy()[positions] == np.array(["a", "b", "c"])[codes]).all()
+
+
+def test_quick_scan_covers_full_run():
+    frame = policies(12)
+    full = run_pipeline(create_issue_pipeline(CONFIG), frame.copy())
+    scan = quick_scan(frame, CONFIG, sample_size=4000, strata=["line_of_business"], seed=7)
+    assert not scan["exact"] and scan["sample_rows"] >= 4000 and scan["stratum_count"] > 1
+    estimates = {(e["step"], e["column"], e["unit"]): e for e in scan["estimates"]}
+
+    for step in ("missing_values_detector", "start_end_year_comparator"):
+        rate = full["errors"][step]["Row_Index"].nunique() / len(frame)
+        estimate = estimates[(step, None, "rows")]
+        assert estimate["rate_low"] <= rate <= estimate["rate_high"], (step, rate, estimate)
+    failures = full["errors"]["date_converter"].set_index("Column")["Date_Conversion_Failures"]
+    estimate = estimates[("date_converter", "start_date", "Date_Conversion_Failures")]
+    assert estimate["rate_low"] <= failures["start_date"] / len(frame) <= estimate["rate_high"], estimate
+
+    flagged = len(full["errors"]["duplicate_identifier"])
+    estimate = estimates[("duplicate_identifier", None, "rows")]
+    assert estimate["method"] == "key_sample"
+    assert estimate["rate_low"] <= flagged / len(frame) <= estimate["rate_high"], (flagged, estimate)
+    # Checks that found nothing are still listed, with an upper bound
+    assert estimates[("id_validator", None, "rows")]["rate_high"] > 0
+
+
+def test_duplicate_estimates_count_every_copy():
+    # 100k rows, each present exactly twice: the duplicate checks flag every row, not half of them
+    rng = np.random.default_rng(5)
+    keys = rng.permutation(np.repeat(np.arange(50_000), 2))
+    frame = pd.DataFrame({"policy_number": [f"P{key}" for key in keys], "premiums": keys % 97})
+    config = {"duplicate_key_columns": ["policy_number"],
+              "unique_id_generation": {"id_column": "row_id", "columns_to_concat": ["policy_number"]}}
+    full = run_pipeline(create_issue_pipeline(config), frame.copy())
+    scan = quick_scan(frame, config, sample_size=5000, seed=2)
+    estimates = {e["step"]: e for e in scan["estimates"] if e["method"] == "key_sample"}
+    for step in ("duplicates_from_data", "duplicate_identifier"):
+        rate = len(full["errors"][step]) / len(frame)
+        assert rate == 1.0
+        assert estimates[step]["rate_low"] <= rate <= estimates[step]["rate_high"], estimates[step]
+        assert estimates[step]["estimated_count"] == len(frame)
+    repeats = int(full["errors"]["unique_id_generator"]["Duplicate_IDs"].iloc[0])
+    estimate = estimates["unique_id_generator"]
+    assert estimate["unit"] == "Duplicate_IDs"
+    assert estimate["rate_low"] <= repeats / len(frame) <= estimate["rate_high"], estimate
+    assert abs(estimate["distinct_keys"] - 50_000) < 0.03 * 50_000
+
+    # A mix of single rows and groups of two and five
+    sizes = np.concatenate([np.ones(30_000, dtype=int), np.full(10_000, 2), np.full(4_000, 5)])
+    keys = rng.permutation(np.repeat(np.arange(len(sizes)), sizes))
+    frame = pd.DataFrame({"policy_number": [f"P{key}" for key in keys], "premiums": 1})
+    full = run_pipeline(create_issue_pipeline(config), frame.copy())
+    scan = quick_scan(frame, config, sample_size=8000, seed=4)
+    estimates = {e["step"]: e for e in scan["estimates"] if e["method"] == "key_sample"}
+    for step in ("duplicates_from_data", "duplicate_identifier"):
+        rate = len(full["errors"][step]) / len(frame)
+        assert estimates[step]["rate_low"] <= rate <= estimates[step]["rate_high"], (rate, estimates[step])
+
+
+def test_quick_scan_small_data_is_exact():
+    frame = policies(1)
+    scan = quick_scan(frame, CONFIG, sample_size=len(frame))
+    assert scan["exact"]
+    for estimate in scan["estimates"]:
+        if estimate["method"] != "finding":
+            assert estimate["rate_low"] == estimate["estimated_rate"] == estimate["rate_high"], estimate
+
+
+def test_quick_scan_endpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "policies.csv")
+        policies(3).to_csv(path, index=False)
+        with TestClient(app) as client:
+            with open(path, "rb") as f:
+                assert client.post("/upload", files={"file": ("policies.csv", f, "text/csv")}).status_code == 200
+            assert client.post("/configure-checks", json=CONFIG).status_code == 200
+            response = client.post("/quick-scan", params={"sample_size": 2000, "stratify_by": "line_of_business",
+                                                         "seed": 1})
+            assert response.status_code == 200, response.text
+            scan = response.json()
+            assert scan["strata"] == ["line_of_business"] and scan["estimates"]
+            assert client.post("/quick-scan", params={"stratify_by": "nope"}).status_code == 400
+
+            # Promoting runs the scan's configuration even after the checks were reconfigured
+            client.post("/configure-checks", json={"numeric_columns": ["premiums"]})
+            promoted = client.post(scan["promote"])
+            assert promoted.status_code == 200, promoted.text
+            assert "CategoryValidator" in promoted.json()["issue_counts"]
+            assert client.post("/identify-issues", params={"scan_id": "missing"}).status_code == 404
+
+
+if __name__ == "__main__":
+    test_wilson_interval()
+    test_hyperloglog()
+    test_stratified_sample()
+    test_quick_scan_covers_full_run()
+    test_duplicate_estimates_count_every_copy()
+    test_quick_scan_small_data_is_exact()
+    test_quick_scan_endpoint()
+    print("✅ quick scan estimates cover the full run")
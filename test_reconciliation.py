@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Reconciliation: payments are matched to the policy period covering their date, and payments without a policy,
+payments outside every period, periods without a payment and totals off by more than the tolerance are reported
+"""
+import json
+import os
+import tempfile
+
+import pandas as pd
+from backend.reconciliation import reconcile
+
+POLICIES = """policy_number,premiums,start_date,end_date,commission
+A,100,1/01/2023,31/01/2023,10
+A,100,1/02/2023,28/02/2023,10
+B,200,1/01/2023,31/12/2023,20
+"""
+
+PREMIUMS = """policy_number,date_of_premium_payment,amount,commission
+A,2023-01-15,100.004,10
+A,2023-02-10,60,5
+A,2023-02-20,30,5
+A,2023-05-01,50,0
+Z,2023-01-01,10,0
+"""
+
+
+def test_reconcile_issue_types():
+    with tempfile.TemporaryDirectory() as directory:
+        policy_path = os.path.join(directory, "policies.csv")
+        premium_path = os.path.join(directory, "premiums.csv")
+        with open(policy_path, "w") as f:
+            f.write(POLICIES)
+        with open(premium_path, "w") as f:
+            f.write(PREMIUMS)
+        # Small chunks and several partitions, as for files that do not fit in memory
+        summary = reconcile(policy_path, premium_path, directory, partitions=4, chunk_rows=2)
+        issues = pd.read_parquet(summary["issues_path"])
+        with open(os.path.join(directory, "reconciliation.json")) as f:
+            assert json.load(f)["total_issues"] == summary["total_issues"]
+
+    assert summary["policy_rows"] == 3 and summary["premium_rows"] == 5
+    assert summary["matched_payments"] == 3
+    assert summary["issue_counts"] == {"AmountMismatch": 1, "PaymentOutsideCoverage": 1,
+                                       "PolicyWithoutPayment": 1, "PremiumWithoutPolicy": 1}
+    by_check = {check: group for check, group in issues.groupby("check")}
+
+    # 60 + 30 paid for February's 100; the commission (5 + 5) and January (within 0.01) reconcile
+    mismatch = by_check["AmountMismatch"].iloc[0]
+    assert mismatch["column"] == "premium" and mismatch["row_index"] == 1
+    details = json.loads(mismatch["details"])
+    assert details["expected"] == 100 and details["actual"] == 90 and details["payments"] == 2
+    # May is after the last period of A; Z has no policy; B was never paid (row numbers of each file)
+    assert list(by_check["PaymentOutsideCoverage"]["row_index"]) == [3]
+    assert list(by_check["PremiumWithoutPolicy"]["row_index"]) == [4]
+    assert list(by_check["PolicyWithoutPayment"]["row_index"]) == [2]
+    assert json.loads(by_check["PolicyWithoutPayment"].iloc[0]["details"])["policy_number"] == "B"
+
+
+if __name__ == "__main__":
+    test_reconcile_issue_types()
+    print("✅ policy and premium schedules are reconciled")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Run comparison: issues of two runs are matched by row and identity (the rule broken, not just the check),
+and repeated issues are diffed as a multiset, so losing one copy of a duplicated row resolves one issue
+"""
+import json
+import os
+import tempfile
+
+import pandas as pd
+from backend.runs import compare_issue_files, normalize_issues, row_keys, write_issues
+
+
+def issues_of(frame, rules, path):
+    """Issue file of a run over ``frame``: duplicated rows and the broken ``rules``."""
+    duplicated = frame[frame.duplicated(keep=False)].copy()
+    duplicated['Row_Index'] = duplicated.index
+    duplicated['Check'] = 'DuplicateRowChecker'
+    broken = []
+    for rule in rules:
+        rows = frame[~frame.eval(rule)].copy()
+        rows['Row_Index'] = rows.index
+        rows['Rule'] = rule
+        rows['Check'] = 'CrossFieldLogicChecker'
+        broken.append(rows)
+    errors = {'duplicate_row_checker': duplicated, 'cross_field_logic_checker': pd.concat(broken, ignore_index=True)}
+    write_issues(normalize_issues(errors, row_keys(frame), frame.columns), path)
+    return path
+
+
+def test_compare_issue_files():
+    base = pd.DataFrame({'premiums': [100.0, 100.0, 100.0, -5.0], 'commission': [10.0, 10.0, 10.0, 50.0]})
+    # One copy of the duplicated row is gone; the last row now breaks a second rule
+    head = pd.DataFrame({'premiums': [100.0, 100.0, -5.0], 'commission': [10.0, 10.0, 50.0]})
+    rules = ['premiums > 0', 'commission < premiums']
+    with tempfile.TemporaryDirectory() as directory:
+        base_path = issues_of(base, rules[:1], os.path.join(directory, 'base.parquet'))
+        head_path = issues_of(head, rules, os.path.join(directory, 'head.parquet'))
+        diff = compare_issue_files(base_path, head_path)
+
+    assert diff['counts'] == {'new': 1, 'resolved': 1, 'persisting': 3}
+    assert diff['by_check']['new'] == {'CrossFieldLogicChecker': 1}
+    assert diff['by_check']['resolved'] == {'DuplicateRowChecker': 1}
+    assert diff['by_check']['persisting'] == {'DuplicateRowChecker': 2, 'CrossFieldLogicChecker': 1}
+    assert json.loads(diff['new'][0]['details'])['Rule'] == 'commission < premiums'
+
+
+if __name__ == "__main__":
+    test_compare_issue_files()
+    print("✅ run issues are compared by identity and multiplicity")
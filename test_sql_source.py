@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Differential test: checking a SQLite table in place (engine=sql) finds the same issues, with the same
+row indexes and row keys, as loading the table and checking it on pandas
+"""
+import os
+import tempfile
+
+# Throwaway database; must be set before the backend is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_sql_source.db")
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from backend.main import execute_checks, read_data_file
+from backend.sql_source import SqlSource
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+# Text cleaning and conversions: most checks read transformed columns and run on pandas
+CLEANING_CONFIG = {
+    "mandatory_columns": ["policy_number", "premiums"],
+    "text_columns": ["policy_number", "premium_frequency", "line_of_business"],
+    "numeric_columns": ["premiums", "commission", "reinsurance_premium", "reinsurance_commission"],
+    "date_columns": ["start_date", "end_date"],
+    "id_column": "policy_number",
+    "duplicate_key_columns": ["policy_number", "start_date"],
+    "year_filter": {"date_column": "end_date", "start_year": 2022, "end_year": 2023},
+    "start_end_year": {"start_year_column": "start_date", "end_year_column": "end_date"},
+    "outlier_detection": {"columns": ["premiums"], "method": "iqr", "threshold": 1.5},
+    "category_validation": {"line_of_business": ["HEALTH", "LIFE"], "reinsurance_commission": [0]},
+    "unique_id_generation": {"id_column": "row_id", "columns_to_concat": ["policy_number", "premium_frequency"]},
+    "constant_value_threshold": 0.6,
+}
+
+# Checks on columns as stored: everything but the outliers runs in the database
+STORED_CONFIG = {
+    "numeric_columns": ["premiums", "reinsurance_premium", "reinsurance_commission"],
+    "date_columns": ["end_date", "renewal_date"],
+    "id_column": "premiums",
+    "duplicate_key_columns": ["premiums", "end_date"],
+    "year_filter": {"date_column": "end_date", "start_year": 2022},
+    "start_end_year": {"start_year_column": "end_date", "end_year_column": "renewal_date"},
+    "outlier_detection": {"columns": ["premiums"], "method": "mad", "threshold": 3.5},
+    "category_validation": {"premium_frequency": ["M", "Q", None], "reinsurance_commission": [0, 1.5]},
+    "constant_value_threshold": 0.6,
+    "columns_to_keep": ["policy_number", "premiums", "end_date", "missing_column"],
+}
+
+
+def dirty_table(path):
+    """The sample policies plus rows with problems, stored in a SQLite table with typed columns."""
+    frame = read_data_file(os.path.join(BACKEND_DIR, "policy_schedule.csv"))
+    # Stored as REAL columns; the sample's stray text in them is dropped
+    for col in ("premiums", "reinsurance_commission"):
+        frame[col] = pd.to_numeric(frame[col], errors="coerce")
+    frame["end_date"] = pd.to_datetime(frame["end_date"], dayfirst=True, errors="coerce")
+    frame["renewal_date"] = frame["end_date"] + pd.to_timedelta(np.arange(len(frame)) % 40 - 3, unit="D")
+    dirty = frame.head(6).copy()
+    dirty.loc[0, "policy_number"] = "  padded\tname "
+    dirty.loc[1, "policy_number"] = None
+    dirty.loc[2, "premiums"] = np.nan
+    dirty.loc[3, "premiums"] = -12.5
+    dirty.loc[4, "end_date"] = pd.NaT
+    dirty.loc[5, "premium_frequency"] = None
+    frame = pd.concat([frame, dirty, frame.tail(2)], ignore_index=True)
+    engine = create_engine(f"sqlite:///{path}")
+    frame.to_sql("policies", engine, index=False)
+    engine.dispose()
+
+
+def run(frame, source, config, engine, directory):
+    output_dir = os.path.join(directory, engine)
+    os.makedirs(output_dir)
+    result = execute_checks(frame, {**config, "engine": engine}, output_dir, source=source)
+    issues = pd.read_parquet(result["issues_path"])
+    issues = issues.sort_values(["check", "column", "row_index", "details"], na_position="first").reset_index(drop=True)
+    return result, issues
+
+
+def check_config(name, source, config):
+    with tempfile.TemporaryDirectory() as directory:
+        pandas_result, pandas_issues = run(source.read_frame(), None, config, "pandas", directory)
+        sql_result, sql_issues = run(None, source, config, "sql", directory)
+    assert sql_result["engine"] == "sql", name
+    assert sql_result["pushed_down"], name
+    assert sql_result["row_count"] == pandas_result["row_count"], name
+    assert pandas_result["issue_counts"] == sql_result["issue_counts"], (
+        name, pandas_result["issue_counts"], sql_result["issue_counts"])
+    pd.testing.assert_frame_equal(pandas_issues, sql_issues, obj=f"{name} issues")
+    print(f"✅ {name}: {pandas_result['total_issues']} issues, identical in place; "
+          f"pushed down {', '.join(sql_result['pushed_down'])}")
+
+
+def test_sql_source():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "policies.db")
+        dirty_table(path)
+        source = SqlSource(f"sqlite:///{path}", "policies", batch_rows=1000)
+        try:
+            assert source.kinds["premiums"] == "float" and source.kinds["end_date"] == "datetime"
+            assert len(source.read_frame(limit=5)) == 5
+            check_config("cleaning config", source, CLEANING_CONFIG)
+            check_config("stored columns config", source, STORED_CONFIG)
+        finally:
+            source.dispose()
+
+
+if __name__ == "__main__":
+    test_sql_source()
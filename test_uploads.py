@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Resumable uploads: parts can arrive out of order and be re-sent, a part or composite checksum that does not
+match is refused without losing the parts already stored, and abandoned sessions are cleaned up
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+# Throwaway database and uploads; must be set before the backend is imported
+_scratch = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/test_uploads.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+
+from fastapi.testclient import TestClient
+from backend.main import UPLOAD_DIR, app
+from backend.uploads import MIN_PART_SIZE, ResumableUploadStore
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+
+def put_part(client, upload_id, number, content, checksum=None):
+    return client.put(f"/uploads/{upload_id}/parts/{number}", content=content,
+                      headers={"X-Content-SHA256": checksum or hashlib.sha256(content).hexdigest()})
+
+
+def test_resume_and_checksums():
+    with open(os.path.join(BACKEND_DIR, "policy_schedule.csv"), "rb") as f:
+        content = f.read()
+    parts = [content[i:i + MIN_PART_SIZE] for i in range(0, len(content), MIN_PART_SIZE)]
+    assert len(parts) == 3
+    with TestClient(app) as client:
+        upload = client.post("/uploads", json={"filename": "policies.csv", "total_size": len(content),
+                                               "part_size": MIN_PART_SIZE}).json()
+        upload_id = upload["upload_id"]
+        assert upload["part_count"] == 3
+
+        # Out of order, then interrupted: part 2 is still missing
+        assert put_part(client, upload_id, 3, parts[2]).status_code == 200
+        assert put_part(client, upload_id, 1, parts[0]).status_code == 200
+        status = client.get(f"/uploads/{upload_id}").json()
+        assert status["received_parts"] == [1, 3] and status["missing_parts"] == [2]
+        assert status["received_bytes"] == len(parts[0]) + len(parts[2])
+        response = client.post(f"/uploads/{upload_id}/complete")
+        assert response.status_code == 400 and "missing parts" in response.json()["detail"]
+
+        # A corrupted part is refused and leaves the session as it was
+        response = put_part(client, upload_id, 2, parts[1], checksum=hashlib.sha256(b"other").hexdigest())
+        assert response.status_code == 400 and "Checksum mismatch" in response.json()["detail"]
+        assert client.get(f"/uploads/{upload_id}").json()["missing_parts"] == [2]
+        assert put_part(client, upload_id, 2, parts[1][:-1]).status_code == 400
+
+        # Resuming: the missing part, and a retried part replacing its earlier copy
+        assert put_part(client, upload_id, 2, parts[1]).status_code == 200
+        assert put_part(client, upload_id, 1, parts[0]).status_code == 200
+        composite = hashlib.sha256(b"".join(hashlib.sha256(part).digest() for part in parts)).hexdigest()
+        response = client.post(f"/uploads/{upload_id}/complete", json={"checksum": "0" * 64})
+        assert response.status_code == 400 and "Composite checksum" in response.json()["detail"]
+        response = client.post(f"/uploads/{upload_id}/complete", json={"checksum": composite})
+        assert response.status_code == 200, response.text
+        assert response.json()["checksum"] == composite
+        with open(os.path.join(UPLOAD_DIR, f"{upload_id}_policies.csv"), "rb") as f:
+            assert f.read() == content
+        # The session is gone once completed
+        assert client.get(f"/uploads/{upload_id}").status_code == 404
+
+
+def test_abandoned_sessions_are_removed():
+    with tempfile.TemporaryDirectory() as root:
+        store = ResumableUploadStore(root, max_age=3600)
+        abandoned = store.initiate("old.csv", MIN_PART_SIZE)["upload_id"]
+        active = store.initiate("new.csv", 2 * MIN_PART_SIZE, MIN_PART_SIZE)["upload_id"]
+        store.store_part(active, 1, b"x" * MIN_PART_SIZE, hashlib.sha256(b"x" * MIN_PART_SIZE).hexdigest())
+
+        # Only the session without a part in the last hour goes
+        hours_ago = time.time() - 2 * 3600
+        for dirpath, _, filenames in os.walk(os.path.join(root, abandoned)):
+            for name in filenames + [""]:
+                os.utime(os.path.join(dirpath, name), (hours_ago, hours_ago))
+        assert store.cleanup() == [abandoned]
+        assert store.status(active)["received_parts"] == [1]
+        assert store.cleanup(now=time.time() + 2 * 3600) == [active]
+        assert store.removed == 2
+
+
+if __name__ == "__main__":
+    test_resume_and_checksums()
+    test_abandoned_sessions_are_removed()
+    print("✅ resumable uploads resume, verify checksums and expire")